@@ -0,0 +1 @@
+"""Offline benchmarks for chunking, cache I/O, encoding and search."""
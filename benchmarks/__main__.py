@@ -0,0 +1,5 @@
+"""Run the benchmark suite: python -m benchmarks --help."""
+
+from .run import main
+
+main()
@@ -0,0 +1,19 @@
+"""Benchmark command-line options, kept free of the harness's imports."""
+
+import argparse
+
+
+DEFAULT_SIZES = "1k,10k,100k"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Benchmark options, shared by ``python -m benchmarks`` and ``yt-aprtr bench``."""
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Chunk counts, e.g. 1k,10k,1M (default: {DEFAULT_SIZES})')
+    parser.add_argument('--queries', type=int, default=100, help='Queries per search stage (default: 100)')
+    parser.add_argument('--dim', type=int, default=384, help='Stub embedding dimension (default: 384)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs of repeatable stages (default: 5)')
+    parser.add_argument('-k', type=int, default=10, help='Results per query (default: 10)')
+    parser.add_argument('--batch-size', type=int, default=32, help='Encode batch size (default: 32)')
+    parser.add_argument('-o', '--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='Fail if stages regressed against this report')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Allowed p50 slowdown ratio (default: 1.25)')
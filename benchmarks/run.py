@@ -0,0 +1,343 @@
+"""Benchmark harness: synthetic transcripts, a stub encoder and JSON reports."""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.options import add_arguments
+from src.core.cache import EmbeddingCache
+from src.core.embedding import EmbeddingEngine
+from src.core.lexical import BM25Index
+from src.core.processor import TextProcessor
+from src.core.scoring import normalize_rows
+from src.core.searcher import SemanticSearcher
+
+
+SCHEMA_VERSION = 2
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+WORDS = (
+    "model data training search vector index cache latency memory thread "
+    "process network video subtitle speaker question answer language python "
+    "rails database server client query ranking token sentence embedding "
+    "transformer attention layer batch kernel compiler runtime benchmark "
+    "startup product design team company growth remote work software people "
+    "problem simple complex future history idea example reason result"
+).split()
+
+
+class HashEncoder:
+    """Deterministic offline stand-in for the sentence transformer.
+
+    Each text maps to a mix of two fixed random vectors chosen by its CRC32
+    and Adler-32 checksums, so runs need no model or network and produce
+    identical vectors on every machine.
+    """
+
+    def __init__(self, dim: int = 384, table_size: int = 4096, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.table = rng.standard_normal((table_size, dim)).astype(np.float32)
+
+    def encode(self, texts: Sequence[str], **kwargs: Any) -> np.ndarray:
+        data = [text.encode('utf-8') for text in texts]
+        size = len(self.table)
+        first = np.fromiter((zlib.crc32(d) % size for d in data), dtype=np.int64, count=len(data))
+        second = np.fromiter((zlib.adler32(d) % size for d in data), dtype=np.int64, count=len(data))
+        return self.table[first] + 0.5 * self.table[second]
+
+
+def synthetic_transcript(n_chunks: int, seed: int = 0) -> str:
+    """
+    Interview-style transcript that chunks into about ``n_chunks`` chunks.
+
+    Speaker turns hold 3-6 sentences, so each turn becomes one chunk.
+    Sentences are drawn from a fixed pool to keep generation fast at 1M
+    chunks; a numbered lead sentence keeps every chunk unique.
+    """
+    rng = np.random.default_rng(seed)
+    pool = [
+        " ".join(WORDS[j] for j in rng.integers(0, len(WORDS), rng.integers(6, 16))).capitalize() + "."
+        for _ in range(2000)
+    ]
+    counts = rng.integers(2, 6, n_chunks)
+    picks = rng.integers(0, len(pool), int(counts.sum())).tolist()
+
+    parts = ["**Transcript extracted from YouTube video**"]
+    pos = 0
+    for i, count in enumerate(counts.tolist()):
+        speaker = "DHH" if i % 2 else "Interviewer"
+        sentences = " ".join(pool[p] for p in picks[pos:pos + count])
+        pos += count
+        parts.append(f"**{speaker}:** Segment {i} begins here. {sentences}")
+    return "\n\n".join(parts)
+
+
+def synthetic_queries(n_queries: int, seed: int = 1) -> List[str]:
+    rng = np.random.default_rng(seed)
+    return [
+        " ".join(WORDS[j] for j in rng.integers(0, len(WORDS), rng.integers(2, 5)))
+        for _ in range(n_queries)
+    ]
+
+
+def parse_sizes(spec: str) -> List[int]:
+    """Parse "1k,10k,1M" into chunk counts."""
+    multipliers = {'k': 1_000, 'm': 1_000_000}
+    sizes = []
+    for part in spec.split(','):
+        part = part.strip().lower()
+        if not part:
+            continue
+        scale = multipliers.get(part[-1], 1)
+        sizes.append(int(float(part.rstrip('km')) * scale))
+    return sizes
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process high-water mark of resident memory, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(fn: Callable[[], Any], repeat: int = 1) -> Tuple[Any, List[float]]:
+    """Run ``fn`` ``repeat`` times; return the last result and each duration in seconds."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return result, durations
+
+
+def summarize(durations: List[float], items: int) -> Dict[str, Any]:
+    """
+    Latency percentiles and throughput of one stage.
+
+    ``items`` is the work done per run (chunks, queries, ...).
+    """
+    ms = np.asarray(durations) * 1000
+    total = float(np.sum(durations))
+    return {
+        'runs': len(durations),
+        'items': items,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p90_ms': float(np.percentile(ms, 90)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'mean_ms': float(ms.mean()),
+        'max_ms': float(ms.max()),
+        'throughput_per_sec': items * len(durations) / total if total > 0 else None
+    }
+
+
+def bench_size(
+    n_chunks: int,
+    workdir: Path,
+    queries: List[str],
+    dim: int = 384,
+    repeat: int = 5,
+    k: int = 10,
+    batch_size: int = 32
+) -> Dict[str, Dict[str, Any]]:
+    """Run every stage for one corpus size; returns stage name -> summary."""
+    stages: Dict[str, Dict[str, Any]] = {}
+    processor = TextProcessor()
+
+    # The chunks every later stage times are the app's own (chunk_by_tokens)
+    content = synthetic_transcript(n_chunks)
+    chunks, durations = timed(lambda: processor.chunk_by_tokens(content))
+    stages['chunk_by_tokens'] = summarize(durations, len(chunks))
+    del content
+
+    encoder = HashEncoder(dim)
+    engine = EmbeddingEngine(lambda: encoder, batch_size=batch_size)
+    texts = chunks.contents()
+    embeddings, durations = timed(lambda: normalize_rows(engine.encode(texts)))
+    stages['encode'] = summarize(durations, len(texts))
+
+    cache = EmbeddingCache(str(workdir / f"cache-{n_chunks}"), model_name="bench-stub")
+    key = f"bench-{n_chunks}"
+    _, durations = timed(lambda: cache.save_cache(key, embeddings, chunks))
+    stages['cache_save'] = summarize(durations, len(chunks))
+    _, durations = timed(lambda: cache.load_cache(key), repeat)
+    stages['cache_load'] = summarize(durations, len(chunks))
+    del embeddings, chunks
+
+    # Search over the cached (memory-mapped) entry, as a real session would
+    searcher = SemanticSearcher(cache_dir=str(cache.cache_dir), model=encoder)
+    searcher.transcript_name = key
+    searcher.embeddings, searcher.chunks = cache.load_cache(key)
+
+    per_query = [timed(lambda q=q: searcher.search_many([q], k))[1][0] for q in queries]
+    stages['search_dense'] = summarize(per_query, 1)
+    _, durations = timed(lambda: searcher.search_many(queries, k), repeat)
+    stages['search_dense_batch'] = summarize(durations, len(queries))
+
+    searcher.lexical, durations = timed(lambda: BM25Index.build(texts))
+    stages['lexical_build'] = summarize(durations, len(texts))
+    per_query = [timed(lambda q=q: searcher.search_many([q], k, mode="lexical"))[1][0] for q in queries]
+    stages['search_lexical'] = summarize(per_query, 1)
+
+    return stages
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    sizes: List[int],
+    n_queries: int = 100,
+    dim: int = 384,
+    repeat: int = 5,
+    k: int = 10,
+    batch_size: int = 32,
+    progress: Callable[[str], None] = lambda message: None
+) -> Dict[str, Any]:
+    """
+    Benchmark every stage at each corpus size.
+
+    Returns:
+        JSON-serializable report with run metadata and per-size results
+    """
+    queries = synthetic_queries(n_queries)
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="yss-bench-") as workdir:
+        for size in sizes:
+            progress(f"⏱  {size:,} chunks...")
+            # The library prints progress; keep benchmark output clean
+            with contextlib.redirect_stdout(io.StringIO()):
+                stages = bench_size(size, Path(workdir), queries, dim, repeat, k, batch_size)
+            results.append({'size': size, 'stages': stages})
+
+    # ru_maxrss only ever grows, so one high-water mark for the whole run
+    return {
+        'schema': SCHEMA_VERSION,
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'params': {
+                'sizes': sizes, 'queries': n_queries, 'dim': dim,
+                'repeat': repeat, 'k': k, 'batch_size': batch_size
+            }
+        },
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 1.25
+) -> List[Dict[str, Any]]:
+    """
+    Stages whose median latency grew by more than ``threshold`` times.
+
+    Only (size, stage) pairs present in both reports are compared.
+    """
+    base = {
+        (entry['size'], stage): summary['p50_ms']
+        for entry in baseline.get('results', [])
+        for stage, summary in entry['stages'].items()
+    }
+    regressions = []
+    for entry in current['results']:
+        for stage, summary in entry['stages'].items():
+            before = base.get((entry['size'], stage))
+            if before and summary['p50_ms'] > before * threshold:
+                regressions.append({
+                    'size': entry['size'],
+                    'stage': stage,
+                    'baseline_p50_ms': before,
+                    'current_p50_ms': summary['p50_ms'],
+                    'ratio': summary['p50_ms'] / before
+                })
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable table of a report."""
+    lines = [f"{'size':>9}  {'stage':<20} {'p50 ms':>10} {'p99 ms':>10} {'per sec':>12}"]
+    for entry in report['results']:
+        for stage, s in entry['stages'].items():
+            rate = f"{s['throughput_per_sec']:,.0f}" if s['throughput_per_sec'] else "-"
+            lines.append(
+                f"{entry['size']:>9,}  {stage:<20} {s['p50_ms']:>10.3f} {s['p99_ms']:>10.3f} {rate:>12}"
+            )
+    if report.get('peak_rss_mb') is not None:
+        lines.append(f"peak RSS of the run: {report['peak_rss_mb']:.0f} MiB")
+    return "\n".join(lines)
+
+
+def run_from_args(args: argparse.Namespace) -> int:
+    """Run the suite for parsed arguments; returns the process exit code."""
+    report = run_benchmarks(
+        parse_sizes(args.sizes),
+        n_queries=args.queries,
+        dim=args.dim,
+        repeat=args.repeat,
+        k=args.k,
+        batch_size=args.batch_size,
+        progress=lambda message: print(message, file=sys.stderr)
+    )
+    print(format_report(report), file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.threshold)
+        for r in regressions:
+            print(f"❌ {r['stage']} @ {r['size']:,}: {r['baseline_p50_ms']:.3f} → "
+                  f"{r['current_p50_ms']:.3f} ms ({r['ratio']:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✅ No regressions against {args.compare}", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chunking, cache I/O, encoding and search")
+    add_arguments(parser)
+    sys.exit(run_from_args(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
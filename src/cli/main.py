@@ -1,13 +1,80 @@
 """Main CLI interface for YouTube Semantic Search."""
 
 import argparse
+import contextlib
+import json
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from ..core.client import SearchClient
 from ..core.extractor import YouTubeExtractor
-from ..core.searcher import SemanticSearcher
+from ..core.encoders import EncoderSpec
+from ..core.searcher import SemanticSearcher, SEARCH_MODES, cache_params, search_identity
 from ..config.settings import default_config
+from ..utils import profiling
+from ..utils.helpers import format_bytes
+
+
+def create_searcher() -> SemanticSearcher:
+    """Build a searcher from the active configuration."""
+    return SemanticSearcher(
+        model_name=default_config.search.model_name,
+        cache_dir=default_config.search.cache_dir,
+        cache_max_bytes=default_config.search.cache_max_mb * 1024 * 1024,
+        embedding_dtype=default_config.search.embedding_dtype,
+        max_sentences_per_chunk=default_config.search.max_sentences_per_chunk,
+        chunk_tokens=default_config.search.chunk_tokens,
+        chunk_overlap=default_config.search.chunk_overlap,
+        near_duplicate=default_config.search.near_duplicate,
+        shard_rows=default_config.search.shard_rows,
+        shard_workers=default_config.search.shard_workers,
+        query_cache_size=default_config.search.query_cache_size,
+        batch_size=default_config.search.batch_size,
+        embed_workers=default_config.search.embed_workers,
+        encoder_backend=default_config.search.encoder_backend,
+        onnx_path=default_config.search.onnx_model_path
+    )
+
+
+def server_identity() -> Dict[str, Any]:
+    """Identity a search server built from the active configuration reports.
+    
+    Computed from the settings alone, so checking a server never opens the
+    caches an in-process searcher would.
+    """
+    search = default_config.search
+    params = cache_params(
+        search.max_sentences_per_chunk, search.chunk_tokens, search.chunk_overlap, search.near_duplicate
+    )
+    return {
+        **search_identity(
+            EncoderSpec(search.model_name, search.encoder_backend, search.onnx_model_path),
+            search.cache_dir,
+            search.embedding_dtype,
+            search.shard_rows,
+            params
+        ),
+        'ann_nlist': search.ann_nlist
+    }
+
+
+def connect_server(args) -> Optional[SearchClient]:
+    """Return a client for a running search server, or None to search in-process."""
+    if getattr(args, 'no_server', False) or not default_config.search.use_server:
+        return None
+    
+    client = SearchClient(default_config.search.server_host, default_config.search.server_port)
+    health = client.health()
+    if health is None:
+        return None
+    
+    # The server reports its encoder, cache and index settings; a server
+    # configured differently would answer from another cache or chunking
+    if health.get('identity') != server_identity():
+        print("⚠️  Search server is configured differently; searching in-process")
+        return None
+    return client
 
 
 def extract_command(args):
@@ -29,8 +96,132 @@ def extract_command(args):
         sys.exit(1)
 
 
+def ingest_command(args):
+    """Handle ingest subcommand: bulk extraction with a worker pool."""
+    from ..core.ingest import ingest
+    
+    try:
+        summary = ingest(
+            args.sources,
+            output_dir=args.output_dir,
+            language=args.language,
+            concurrency=args.jobs or default_config.extraction.ingest_concurrency,
+            retries=default_config.extraction.ingest_retries if args.retries is None else args.retries,
+            manifest_path=args.manifest,
+            searcher=create_searcher() if args.embed else None
+        )
+    except Exception as e:
+        print(f"❌ Ingest failed: {e}")
+        sys.exit(1)
+    
+    print(f"\n✅ Ingested {len(summary['completed'])} videos in {summary['elapsed']:.1f}s "
+          f"({summary['skipped']} already done, {len(summary['failed'])} failed)")
+    if summary['failed']:
+        sys.exit(1)
+
+
+def corpus_search_command(args):
+    """Handle search across every cached transcript."""
+    if not args.query:
+        print("❌ Please provide a search query")
+        sys.exit(1)
+    
+    nprobe = args.nprobe or default_config.search.ann_nprobe
+    
+    try:
+        client = connect_server(args)
+        if client:
+            results = client.search(
+                args.query, 
+                corpus=args.corpus or "", 
+                num_results=args.results,
+                ann=args.ann,
+                nprobe=nprobe,
+                mode=args.mode
+            )
+            SemanticSearcher.print_results(results)
+            return
+        
+        searcher = create_searcher()
+        searcher.load_corpus(args.corpus, ann=args.ann, nlist=default_config.search.ann_nlist)
+        results = searcher.search_corpus(args.query, args.results, nprobe, args.mode)
+        searcher.print_results(results)
+        
+    except Exception as e:
+        print(f"❌ Search failed: {e}")
+        sys.exit(1)
+
+
+def read_queries(path: str) -> list:
+    """Queries from ``path`` (``-`` for stdin), one per non-blank line."""
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        lines = Path(path).read_text(encoding='utf-8').splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def batch_search_command(args):
+    """Handle search --queries: every query in one batch, results as JSONL."""
+    corpus = bool(args.all or args.corpus)
+    # Status messages go to stderr so stdout carries nothing but JSONL
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.expand is not None:
+            print("❌ --expand cannot be combined with --queries")
+            sys.exit(1)
+        if not corpus and not args.transcript:
+            print("❌ Please provide a transcript (-t) or use --all / --corpus DIR")
+            sys.exit(1)
+        if not corpus and not Path(args.transcript).exists():
+            print(f"❌ Transcript file not found: {args.transcript}")
+            sys.exit(1)
+        
+        try:
+            queries = read_queries(args.queries)
+        except OSError as e:
+            print(f"❌ Cannot read queries: {e}")
+            sys.exit(1)
+        
+        try:
+            # Always in-process: the batch is encoded in one pass here
+            searcher = create_searcher()
+            if corpus:
+                searcher.load_corpus(args.corpus, ann=args.ann, nlist=default_config.search.ann_nlist)
+            else:
+                searcher.load_transcript(args.transcript, embed=args.mode != 'lexical')
+            
+            nprobe = args.nprobe or default_config.search.ann_nprobe
+            sink = open(args.output, 'w', encoding='utf-8') if args.output else contextlib.nullcontext(out)
+            with sink as f:
+                for index, results in searcher.search_batch(queries, args.results, args.mode, corpus, nprobe):
+                    record = searcher.result_record(index, queries[index], results)
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    f.flush()
+            print(f"✅ Searched {len(queries)} queries" + (f", results in {args.output}" if args.output else ""))
+            
+        except Exception as e:
+            print(f"❌ Search failed: {e}")
+            sys.exit(1)
+
+
 def search_command(args):
     """Handle search subcommand."""
+    if getattr(args, 'queries', None):
+        batch_search_command(args)
+        return
+    
+    if args.all or args.corpus:
+        if args.expand is not None:
+            print("❌ --expand needs a single transcript (-t)")
+            sys.exit(1)
+        corpus_search_command(args)
+        return
+    
+    if not args.transcript:
+        print("❌ Please provide a transcript (-t) or use --all / --corpus DIR")
+        sys.exit(1)
+    
     if not Path(args.transcript).exists():
         print(f"❌ Transcript file not found: {args.transcript}")
         print("Available files:")
@@ -39,31 +230,42 @@ def search_command(args):
                 print(f"  - {file}")
         sys.exit(1)
     
-    # Create searcher
-    searcher = SemanticSearcher(
-        model_name=default_config.search.model_name,
-        cache_dir=default_config.search.cache_dir
-    )
+    if args.expand is None and not args.query:
+        print("❌ Please provide a search query")
+        sys.exit(1)
     
     try:
-        searcher.load_transcript(args.transcript)
+        # Prefer a running server, which already has the model loaded
+        client = connect_server(args)
+        if client:
+            if args.expand is not None:
+                print(f"🔍 Expanding result ID {args.expand} with {args.context} chunks of context:")
+                print("=" * 70)
+                print(client.expand(args.transcript, args.expand, args.context))
+                print("=" * 70)
+            else:
+                results = client.search(
+                    args.query, args.transcript, num_results=args.results, mode=args.mode
+                )
+                SemanticSearcher.print_results(results)
+            return
         
-        # Handle expand mode
+        # Create searcher; lexical search and expand never need the model
+        searcher = create_searcher()
+        
+        # Handle expand mode: reads only the chunks around the result
         if args.expand is not None:
+            expanded_context = searcher.expand_transcript(args.transcript, args.expand, args.context)
             print(f"🔍 Expanding result ID {args.expand} with {args.context} chunks of context:")
             print("=" * 70)
-            expanded_context = searcher.get_expanded_context(args.expand, args.context)
             print(expanded_context)
             print("=" * 70)
             return
         
-        # Handle search mode
-        if not args.query:
-            print("❌ Please provide a search query")
-            sys.exit(1)
+        searcher.load_transcript(args.transcript, embed=args.mode != 'lexical')
         
         # Perform search
-        results = searcher.search(args.query, args.results)
+        results = searcher.search(args.query, args.results, args.mode)
         searcher.print_results(results)
         
     except Exception as e:
@@ -73,25 +275,33 @@ def search_command(args):
 
 def extract_and_search_command(args):
     """Handle combined extract and search."""
-    # First extract
     print("🎬 Extracting subtitles from YouTube...")
     extractor = YouTubeExtractor(args.output_dir)
     
     try:
-        _, text_file = extractor.extract_subtitles(
-            args.url,
-            args.language,
-            args.name
-        )
+        # A running server already has the model: just extract, then ask it
+        client = connect_server(args)
+        if client:
+            _, text_file = extractor.extract_subtitles(
+                args.url,
+                args.language,
+                args.name
+            )
+            print(f"\n🔍 Searching for: {args.query}")
+            results = client.search(args.query, text_file, num_results=args.results)
+            SemanticSearcher.print_results(results)
+            return
         
-        # Then search
-        print(f"\n🔍 Searching for: {args.query}")
-        searcher = SemanticSearcher(
-            model_name=default_config.search.model_name,
-            cache_dir=default_config.search.cache_dir
-        )
+        # Otherwise load the model while yt-dlp downloads, then embed
+        from ..core.pipeline import IngestPipeline
+        
+        searcher = create_searcher()
+        pipeline = IngestPipeline(extractor, searcher, language=args.language)
+        status = pipeline.run([(args.url, args.name)])[0]
+        if 'error' in status:
+            raise RuntimeError(status['error'])
         
-        searcher.load_transcript(text_file)
+        print(f"\n🔍 Searching for: {args.query}")
         results = searcher.search(args.query, args.results)
         searcher.print_results(results)
         
@@ -100,6 +310,153 @@ def extract_and_search_command(args):
         sys.exit(1)
 
 
+def serve_command(args):
+    """Handle serve subcommand: keep the model and indexes resident."""
+    from ..core.service import SearchService, create_server
+    
+    host = args.host or default_config.search.server_host
+    port = args.port or default_config.search.server_port
+    
+    print(f"Loading model {default_config.search.model_name}...")
+    window_ms = default_config.search.batch_window_ms if args.batch_window is None else args.batch_window
+    memory_mb = default_config.search.server_memory_mb if args.memory_mb is None else args.memory_mb
+    service = SearchService(
+        create_searcher(),
+        default_config.search.ann_nlist,
+        memory_budget=memory_mb * 1024 * 1024,
+        batch_window_ms=window_ms
+    )
+    
+    try:
+        # Load the model now rather than on the first request
+        _ = service.base.model
+        for transcript in args.preload or []:
+            service.transcript(str(Path(transcript).resolve()))
+        if args.corpus is not None:
+            service.corpus(str(Path(args.corpus).resolve()) if args.corpus else None)
+        
+        server = create_server(service, host, port)
+    except Exception as e:
+        print(f"❌ Failed to start server: {e}")
+        sys.exit(1)
+    
+    print(f"✅ Search server listening on http://{host}:{port}")
+    print("   search/auto will use it automatically (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        server.server_close()
+        service.close()
+
+
+def export_onnx_command(args):
+    """Handle export-onnx subcommand."""
+    from ..core.encoders import export_onnx
+    
+    model_name = args.model or default_config.search.model_name
+    try:
+        print(f"📦 Exporting {model_name} to ONNX...")
+        paths = export_onnx(model_name, args.output_dir, quantize=not args.no_int8)
+        for path in paths:
+            print(f"✅ Wrote {path}")
+        print(f"\nUse it with:\n  export YSS_ENCODER_BACKEND=onnx\n  export YSS_ONNX_MODEL={paths[-1]}")
+    except ImportError as e:
+        print(f"❌ Export needs torch, sentence-transformers and onnxruntime: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+
+
+def cache_command(args):
+    """Handle cache subcommand: stats, prune and verify without loading entries."""
+    from datetime import datetime
+    from ..core.cache import EmbeddingCache
+    
+    cache_dir = args.cache_dir or default_config.search.cache_dir
+    if not Path(cache_dir).is_dir():
+        print(f"❌ Cache directory not found: {cache_dir}")
+        sys.exit(1)
+    cache = EmbeddingCache(
+        cache_dir,
+        max_bytes=default_config.search.cache_max_mb * 1024 * 1024,
+        dtype=default_config.search.embedding_dtype
+    )
+    
+    if args.cache_action == 'stats':
+        stats = cache.stats()
+        if args.json:
+            print(json.dumps(stats, indent=2))
+            return
+        
+        budget = f" of {format_bytes(stats['max_bytes'])} budget" if stats['max_bytes'] else ""
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = f" ({stats['hits'] / lookups:.0%} hit rate)" if lookups else ""
+        print(f"📦 {stats['cache_dir']}: {len(stats['entries'])} entries, "
+              f"{format_bytes(stats['total_bytes'])}{budget}")
+        print(f"   Entries {format_bytes(stats['entry_bytes'])}, "
+              f"shared indexes {format_bytes(stats['other_bytes'])}")
+        print(f"   {stats['hits']} hits, {stats['misses']} misses{hit_rate}, "
+              f"{stats['stale']} stale entries")
+        if stats['entries']:
+            print()
+            print(f"{'SIZE':>10}  {'ROWS':>7}  {'LAST USED':16}  {'HITS':>5}  ENTRY")
+            for entry in sorted(stats['entries'], key=lambda e: e['last_access'], reverse=True):
+                used = datetime.fromtimestamp(entry['last_access']).strftime('%Y-%m-%d %H:%M')
+                status = f"  [{entry['stale']}]" if entry['stale'] else ""
+                print(f"{format_bytes(entry['bytes']):>10}  {entry['rows'] or 0:>7}  {used:16}  "
+                      f"{entry['hits']:>5}  {entry['name']}{status}")
+    
+    elif args.cache_action == 'prune':
+        removed = []
+        if args.stale:
+            removed = [entry['name'] for entry in cache.usage() if entry['stale']]
+            if not args.dry_run:
+                for name in removed:
+                    cache.remove_entry(name)
+                removed += cache.remove_abandoned()
+        max_bytes = cache.max_bytes if args.max_mb is None else int(args.max_mb * 1024 * 1024)
+        if max_bytes:
+            removed += cache.evict(max_bytes, dry_run=args.dry_run)
+        elif not args.stale:
+            print("❌ No size budget: pass --max-mb, --stale or set YSS_CACHE_MAX_MB")
+            sys.exit(1)
+        
+        verb = "Would remove" if args.dry_run else "Removed"
+        for name in removed:
+            print(f"   {name}")
+        print(f"✅ {verb} {len(removed)} entries; cache is "
+              f"{format_bytes(cache.stats()['total_bytes'])}")
+    
+    elif args.cache_action == 'verify':
+        broken = 0
+        for entry_dir in cache.entry_dirs():
+            problems = cache.verify_entry(entry_dir.name)
+            if not problems:
+                continue
+            broken += 1
+            print(f"❌ {entry_dir.name}: {'; '.join(problems)}")
+            if args.delete:
+                cache.remove_entry(entry_dir.name)
+        
+        if not broken:
+            print(f"✅ All {len(cache.entry_dirs())} entries are intact")
+        elif args.delete:
+            print(f"🧹 Removed {broken} broken entries")
+        else:
+            print(f"⚠️  {broken} broken entries (remove them with --delete)")
+            sys.exit(1)
+
+
+def bench_command(args):
+    """Handle bench subcommand."""
+    from benchmarks.run import run_from_args
+    
+    sys.exit(run_from_args(args))
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -116,40 +473,124 @@ Examples:
   # Extract and search in one command
   yss auto https://youtube.com/watch?v=abc123 "AI consciousness" -n interview
 
+  # Search every cached transcript at once
+  yss search "artificial intelligence" --all -r 20
+
+  # Extract a whole playlist or channel, 8 downloads at a time
+  yss ingest https://youtube.com/@channel/videos -j 8
+
   # Expand context around specific result
   yss search "consciousness" -t transcript.txt --expand 45 --context 5
+
+  # Keep the model loaded; later search/auto calls use the server
+  yss serve --preload transcript.txt
+
+  # Show cache usage, then trim it to 500 MB
+  yss cache stats
+  yss cache prune --max-mb 500
+
+  # Faster CPU encoding: export once, then select the ONNX backend
+  yss export-onnx models/minilm
+  YSS_ENCODER_BACKEND=onnx YSS_ONNX_MODEL=models/minilm/model.int8.onnx yss search ...
         """
     )
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
+    # Stage timing, shared by the commands that do real work
+    profile_options = argparse.ArgumentParser(add_help=False)
+    profile_options.add_argument('--profile', nargs='?', const='-', metavar='FILE', help='Report per-stage wall/CPU time and memory as JSON (stderr, or FILE)')
+    profile_options.add_argument('--cprofile', metavar='FILE', help='Also dump cProfile stats to FILE (view with python -m pstats)')
+    
     # Extract command
-    extract_parser = subparsers.add_parser('extract', help='Extract subtitles from YouTube')
+    extract_parser = subparsers.add_parser('extract', parents=[profile_options], help='Extract subtitles from YouTube')
     extract_parser.add_argument('url', help='YouTube video URL')
     extract_parser.add_argument('-l', '--language', default='en', help='Subtitle language (default: en)')
     extract_parser.add_argument('-n', '--name', help='Output filename (auto-generated if not provided)')
     extract_parser.add_argument('-o', '--output-dir', default='.', help='Output directory (default: current)')
     extract_parser.set_defaults(func=extract_command)
     
+    # Ingest command (bulk extraction)
+    ingest_parser = subparsers.add_parser('ingest', parents=[profile_options], help='Extract subtitles for playlists, channels or URL lists')
+    ingest_parser.add_argument('sources', nargs='+', help='Playlist/channel/video URLs or files listing URLs')
+    ingest_parser.add_argument('-j', '--jobs', type=int, help='Concurrent extractions (default: YSS_INGEST_CONCURRENCY or 4)')
+    ingest_parser.add_argument('--retries', type=int, help='Retries per video (default: YSS_INGEST_RETRIES or 3)')
+    ingest_parser.add_argument('--embed', action='store_true', help='Also embed each transcript (downloads overlap with embedding)')
+    ingest_parser.add_argument('--manifest', help='Manifest of completed videos (default: extractions/ingest_manifest.jsonl)')
+    ingest_parser.add_argument('-l', '--language', default='en', help='Subtitle language (default: en)')
+    ingest_parser.add_argument('-o', '--output-dir', default='.', help='Output directory (default: current)')
+    ingest_parser.set_defaults(func=ingest_command)
+    
     # Search command
-    search_parser = subparsers.add_parser('search', help='Search existing transcript')
+    search_parser = subparsers.add_parser('search', parents=[profile_options], help='Search existing transcript')
     search_parser.add_argument('query', nargs='?', help='Search query')
-    search_parser.add_argument('-t', '--transcript', required=True, help='Transcript file path')
+    search_parser.add_argument('-t', '--transcript', help='Transcript file path')
+    search_parser.add_argument('--all', action='store_true', help='Search every cached transcript')
+    search_parser.add_argument('--corpus', metavar='DIR', help='Search every transcript cached in DIR')
     search_parser.add_argument('-r', '--results', type=int, default=10, help='Number of results (default: 10)')
     search_parser.add_argument('-e', '--expand', type=int, help='Expand specific result ID')
     search_parser.add_argument('-c', '--context', type=int, default=3, help='Context chunks for expand (default: 3)')
+    search_parser.add_argument('--mode', choices=SEARCH_MODES, default='dense', help='dense (embeddings), lexical (BM25, no model) or hybrid (default: dense)')
+    search_parser.add_argument('--ann', action='store_true', help='Use the approximate IVF index for corpus search')
+    search_parser.add_argument('--nprobe', type=int, help='IVF lists to scan with --ann (default: YSS_ANN_NPROBE or 8)')
+    search_parser.add_argument('--no-server', action='store_true', help='Do not use a running search server')
+    search_parser.add_argument('--queries', metavar='FILE', help='Run every query in FILE (one per line, - for stdin) in one batch and print JSONL results')
+    search_parser.add_argument('--output', metavar='FILE', help='Write --queries results to FILE instead of stdout')
     search_parser.set_defaults(func=search_command)
     
     # Auto command (extract + search)
-    auto_parser = subparsers.add_parser('auto', help='Extract and search in one command')
+    auto_parser = subparsers.add_parser('auto', parents=[profile_options], help='Extract and search in one command')
     auto_parser.add_argument('url', help='YouTube video URL')
     auto_parser.add_argument('query', help='Search query')
     auto_parser.add_argument('-l', '--language', default='en', help='Subtitle language (default: en)')
     auto_parser.add_argument('-n', '--name', help='Output filename (auto-generated if not provided)')
     auto_parser.add_argument('-o', '--output-dir', default='.', help='Output directory (default: current)')
     auto_parser.add_argument('-r', '--results', type=int, default=10, help='Number of results (default: 10)')
+    auto_parser.add_argument('--no-server', action='store_true', help='Do not use a running search server')
     auto_parser.set_defaults(func=extract_and_search_command)
     
+    # Serve command (resident model and indexes)
+    serve_parser = subparsers.add_parser('serve', help='Run a local search server with the model kept loaded')
+    serve_parser.add_argument('--host', help='Bind address (default: YSS_SERVER_HOST or 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, help='Port (default: YSS_SERVER_PORT or 8765)')
+    serve_parser.add_argument('--preload', nargs='*', metavar='TRANSCRIPT', help='Transcripts to load at startup')
+    serve_parser.add_argument('--corpus', nargs='?', const='', metavar='DIR', help='Preload the corpus index (default cache if DIR omitted)')
+    serve_parser.add_argument('--batch-window', type=float, metavar='MS', help='Coalesce searches arriving within MS milliseconds into one batch; 0 disables (default: YSS_BATCH_WINDOW_MS or 5)')
+    serve_parser.add_argument('--memory-mb', type=int, help='Memory budget for resident indexes, least recently used unloaded first; 0 = unbounded (default: YSS_SERVER_MEMORY_MB or 2048)')
+    serve_parser.set_defaults(func=serve_command)
+    
+    # Export command (ONNX encoder backend)
+    export_parser = subparsers.add_parser('export-onnx', help='Export the sentence model to ONNX (fp32 and int8)')
+    export_parser.add_argument('output_dir', help='Directory for the ONNX model and tokenizer')
+    export_parser.add_argument('-m', '--model', help='Model to export (default: YSS_MODEL_NAME)')
+    export_parser.add_argument('--no-int8', action='store_true', help='Skip the dynamically quantized int8 copy')
+    export_parser.set_defaults(func=export_onnx_command)
+    
+    # Cache command (size budget and integrity)
+    cache_parser = subparsers.add_parser('cache', help='Show, prune or verify the embedding cache')
+    cache_parser.add_argument('--cache-dir', help='Cache directory (default: YSS_CACHE_DIR or cache)')
+    cache_actions = cache_parser.add_subparsers(dest='cache_action', required=True)
+    cache_stats = cache_actions.add_parser('stats', help='Sizes, hit/miss counts and stale entries')
+    cache_stats.add_argument('--json', action='store_true', help='Print the stats as JSON')
+    cache_prune = cache_actions.add_parser('prune', help='Evict least recently used entries down to a size budget')
+    cache_prune.add_argument('--max-mb', type=float, help='Size budget in MB (default: YSS_CACHE_MAX_MB)')
+    cache_prune.add_argument('--stale', action='store_true', help='Also remove incomplete or outdated entries, those whose source file is gone and abandoned temp files')
+    cache_prune.add_argument('--dry-run', action='store_true', help='Only list what would be removed')
+    cache_verify = cache_actions.add_parser('verify', help='Check every entry against its header')
+    cache_verify.add_argument('--delete', action='store_true', help='Remove broken entries')
+    cache_parser.set_defaults(func=cache_command)
+    
+    # Bench command (benchmarks/ is only present in a source checkout)
+    try:
+        # Options only: the harness itself is imported when bench runs
+        from benchmarks.options import add_arguments as add_bench_arguments
+    except ImportError:
+        add_bench_arguments = None
+    if add_bench_arguments:
+        bench_parser = subparsers.add_parser('bench', help='Benchmark chunking, cache I/O, encoding and search (JSON report)')
+        add_bench_arguments(bench_parser)
+        bench_parser.set_defaults(func=bench_command)
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -158,7 +599,21 @@ Examples:
         sys.exit(1)
     
     # Execute command
-    args.func(args)
+    profile_path = getattr(args, 'profile', None)
+    cprofile_path = getattr(args, 'cprofile', None)
+    if not (profile_path or cprofile_path):
+        args.func(args)
+        return
+    
+    profiling.enable(cprofile_path)
+    try:
+        with profiling.span(args.command):
+            args.func(args)
+    finally:
+        report = profiling.disable()
+        profiling.write_report(report, None if profile_path in (None, '-') else profile_path)
+        if cprofile_path:
+            print(f"📊 cProfile stats written to {cprofile_path}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -10,10 +10,28 @@ class SearchConfig:
     """Configuration for semantic search."""
     model_name: str = "all-MiniLM-L6-v2"
     cache_dir: str = "cache"
+    cache_max_mb: int = 0
     batch_size: int = 32
     max_sentences_per_chunk: int = 6
+    chunk_tokens: int = 0
+    chunk_overlap: int = 32
+    near_duplicate: float = 0.0
     default_results: int = 10
     default_context_chunks: int = 3
+    embedding_dtype: str = "float32"
+    server_host: str = "127.0.0.1"
+    server_port: int = 8765
+    use_server: bool = True
+    server_memory_mb: int = 2048
+    batch_window_ms: float = 5.0
+    ann_nlist: int = 0
+    ann_nprobe: int = 8
+    shard_rows: int = 0
+    shard_workers: int = 0
+    query_cache_size: int = 10000
+    embed_workers: int = 0
+    encoder_backend: str = "torch"
+    onnx_model_path: Optional[str] = None
 
 
 @dataclass
@@ -22,6 +40,8 @@ class ExtractionConfig:
     default_language: str = "en"
     output_dir: str = "."
     include_auto_subs: bool = True
+    ingest_concurrency: int = 4
+    ingest_retries: int = 3
     
 
 @dataclass
@@ -36,16 +56,36 @@ class AppConfig:
         search_config = SearchConfig(
             model_name=os.getenv("YSS_MODEL_NAME", "all-MiniLM-L6-v2"),
             cache_dir=os.getenv("YSS_CACHE_DIR", "cache"),
+            cache_max_mb=int(os.getenv("YSS_CACHE_MAX_MB", "0")),
             batch_size=int(os.getenv("YSS_BATCH_SIZE", "32")),
             max_sentences_per_chunk=int(os.getenv("YSS_MAX_SENTENCES", "6")),
+            chunk_tokens=int(os.getenv("YSS_CHUNK_TOKENS", "0")),
+            chunk_overlap=int(os.getenv("YSS_CHUNK_OVERLAP", "32")),
+            near_duplicate=float(os.getenv("YSS_NEAR_DUPLICATE", "0")),
             default_results=int(os.getenv("YSS_DEFAULT_RESULTS", "10")),
-            default_context_chunks=int(os.getenv("YSS_DEFAULT_CONTEXT", "3"))
+            default_context_chunks=int(os.getenv("YSS_DEFAULT_CONTEXT", "3")),
+            embedding_dtype=os.getenv("YSS_EMBEDDING_DTYPE", "float32"),
+            server_host=os.getenv("YSS_SERVER_HOST", "127.0.0.1"),
+            server_port=int(os.getenv("YSS_SERVER_PORT", "8765")),
+            use_server=bool(os.getenv("YSS_USE_SERVER", "true").lower() in ("true", "1", "yes")),
+            server_memory_mb=int(os.getenv("YSS_SERVER_MEMORY_MB", "2048")),
+            batch_window_ms=float(os.getenv("YSS_BATCH_WINDOW_MS", "5")),
+            ann_nlist=int(os.getenv("YSS_ANN_NLIST", "0")),
+            ann_nprobe=int(os.getenv("YSS_ANN_NPROBE", "8")),
+            shard_rows=int(os.getenv("YSS_SHARD_ROWS", "0")),
+            shard_workers=int(os.getenv("YSS_SHARD_WORKERS", "0")),
+            query_cache_size=int(os.getenv("YSS_QUERY_CACHE_SIZE", "10000")),
+            embed_workers=int(os.getenv("YSS_EMBED_WORKERS", "0")),
+            encoder_backend=os.getenv("YSS_ENCODER_BACKEND", "torch"),
+            onnx_model_path=os.getenv("YSS_ONNX_MODEL") or None
         )
         
         extraction_config = ExtractionConfig(
             default_language=os.getenv("YSS_LANGUAGE", "en"),
             output_dir=os.getenv("YSS_OUTPUT_DIR", "."),
-            include_auto_subs=bool(os.getenv("YSS_AUTO_SUBS", "true").lower() in ("true", "1", "yes"))
+            include_auto_subs=bool(os.getenv("YSS_AUTO_SUBS", "true").lower() in ("true", "1", "yes")),
+            ingest_concurrency=int(os.getenv("YSS_INGEST_CONCURRENCY", "4")),
+            ingest_retries=int(os.getenv("YSS_INGEST_RETRIES", "3"))
         )
         
         return cls(search=search_config, extraction=extraction_config)
@@ -0,0 +1,152 @@
+"""Approximate nearest-neighbour search with an inverted-file (IVF) index."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+from .scoring import normalize_rows, top_k
+
+
+class IVFIndex:
+    """Inverted-file index over a spherical k-means partition.
+
+    Every row is assigned to its nearest centroid. A query is scored against
+    the centroids first and then only against rows in the ``nprobe`` best
+    lists, trading recall for latency. Assignments are kept per row so new
+    rows can be added without retraining.
+    """
+
+    def __init__(self, centroids: np.ndarray, train_rows: int = 0):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.train_rows = train_rows
+        self.list_offsets = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+        self.list_rows = np.empty(0, dtype=np.int64)
+        self._fingerprint: Optional[str] = None
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the centroids: changes whenever the index is retrained."""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.blake2b(self.centroids.tobytes(), digest_size=8).hexdigest()
+        return self._fingerprint
+
+    @classmethod
+    def train(
+        cls,
+        embeddings: np.ndarray,
+        nlist: int = 0,
+        iterations: int = 10,
+        seed: int = 0
+    ) -> 'IVFIndex':
+        """
+        Run spherical k-means on (a sample of) the embeddings.
+
+        Args:
+            embeddings: Row vectors to partition
+            nlist: Number of lists; 0 picks roughly sqrt(N)
+            iterations: k-means iterations
+            seed: Random seed for sampling and initialization
+        """
+        n = len(embeddings)
+        if nlist <= 0:
+            nlist = max(1, int(np.sqrt(n)))
+        nlist = min(nlist, n)
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(n, 256 * nlist)
+        sample = normalize_rows(embeddings[np.sort(rng.choice(n, sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)]
+
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=nlist)
+
+            # Re-seed empty lists from random sample rows
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        return cls(centroids, train_rows=n)
+
+    def assign(self, embeddings: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+        """Nearest-centroid list id for every row."""
+        assignments = np.empty(len(embeddings), dtype=np.int32)
+        for start in range(0, len(embeddings), batch_size):
+            batch = normalize_rows(embeddings[start:start + batch_size])
+            assignments[start:start + batch_size] = np.argmax(batch @ self.centroids.T, axis=1)
+        return assignments
+
+    def set_assignments(self, assignments: np.ndarray) -> None:
+        """Build the inverted lists from per-row list ids."""
+        self.list_rows = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=self.nlist)
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the ``nprobe`` lists closest to a normalized query."""
+        nprobe = max(1, min(nprobe, self.nlist))
+        lists = top_k(self.centroids @ query, nprobe)
+        return np.concatenate([
+            self.list_rows[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists
+        ])
+
+    def search(
+        self,
+        query: np.ndarray,
+        embeddings: np.ndarray,
+        k: int,
+        nprobe: int = 8
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate cosine top-k for one query.
+
+        Returns:
+            Tuple of (row indices, scores), best first
+        """
+        query = normalize_rows(query.reshape(-1))
+        rows = self.candidates(query, nprobe)
+        scores = normalize_rows(embeddings[rows]) @ query
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+    def save(self, index_dir: Path) -> None:
+        """Persist the trained centroids."""
+        index_dir.mkdir(parents=True, exist_ok=True)
+        np.save(index_dir / "centroids.npy", self.centroids)
+        with open(index_dir / "ivf.json", 'w', encoding='utf-8') as f:
+            json.dump({'nlist': self.nlist, 'train_rows': self.train_rows}, f)
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Optional['IVFIndex']:
+        """Load trained centroids, or None if there are none."""
+        try:
+            with open(index_dir / "ivf.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            return cls(np.load(index_dir / "centroids.npy"), meta['train_rows'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def recall_at_k(
+    index: IVFIndex,
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    nprobe: int = 8
+) -> float:
+    """Fraction of exact cosine top-k rows the IVF search also returns."""
+    normalized = normalize_rows(embeddings)
+    hits = 0
+    for query in normalize_rows(queries):
+        exact = set(top_k(normalized @ query, k).tolist())
+        approx = set(index.search(query, embeddings, k, nprobe)[0].tolist())
+        hits += len(exact & approx)
+    return hits / (len(queries) * min(k, len(embeddings)))
@@ -1,90 +1,795 @@
 """Embedding cache management."""
 
-import pickle
+import contextlib
+import hashlib
+import json
 import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 import numpy as np
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from ..utils.profiling import span, traced
+from .chunk_table import CHUNKS_FILE, CHUNK_ROWS_FILE, ChunkTable, ChunkView, as_chunk_table
+
+
+EMBEDDINGS_FILE = "embeddings.npy"
+META_FILE = "meta.json"
+HASHES_FILE = "hashes.npy"
+ACCESS_FILE = "_access.sqlite"
+LOCK_DIR = "_locks"
+TEMP_PREFIX = "_tmp-"
+ENTRY_FILES = (EMBEDDINGS_FILE, META_FILE, CHUNKS_FILE, CHUNK_ROWS_FILE)
+
+# Layout of an entry directory; entries in any other format are rebuilt
+ENTRY_FORMAT = 4
+
+# Temp directories older than this belong to a crashed writer
+ABANDONED_TEMP_AGE = 3600
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+
+def quantize_embeddings(
+    embeddings: np.ndarray, 
+    dtype: str
+) -> tuple[np.ndarray, Optional[List[float]]]:
+    """
+    Convert float embeddings to the on-disk storage dtype.
+    
+    int8 uses symmetric per-dimension scalar quantization; the returned
+    scales map codes back to floats as ``codes * scales``.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if dtype == "float32":
+        return embeddings, None
+    if dtype == "float16":
+        return embeddings.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(embeddings).max(axis=0) / 127.0 if len(embeddings) else np.ones(0)
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        codes = np.clip(np.rint(embeddings / scales), -127, 127).astype(np.int8)
+        return codes, scales.tolist()
+    raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+
+def dequantize_embeddings(stored: np.ndarray, scales: Optional[List[float]]) -> np.ndarray:
+    """
+    Map stored embeddings back to float32 for scoring.
+    
+    float32 entries stay memory-mapped (no copy). float16 and int8 entries
+    are converted once, here, at load: numpy has no fast float16 matrix
+    product, and converting per query batch would allocate a float32 copy
+    of the matrix on every search. The narrower types save disk and cache
+    I/O, not resident memory.
+    """
+    if stored.dtype == np.int8:
+        return stored.astype(np.float32) * np.asarray(scales, dtype=np.float32)
+    if stored.dtype != np.float32:
+        return stored.astype(np.float32)
+    return stored
+
+
+def content_hash(text: str) -> str:
+    """Stable 128-bit hex digest of a piece of text."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def path_bytes(path: Path) -> int:
+    """Size on disk of a file, or of everything below a directory."""
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _write_synced(path: Path, write: Any) -> None:
+    """Write a file through ``write(f)`` and flush it to disk before returning."""
+    with open(path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class AccessLog:
+    """SQLite record of when each cache entry was last used.
+    
+    One row per entry key holds the last access time and hit/miss counts.
+    A second table remembers which key each version of a source file
+    hashed to, so it can be found again without re-reading the file, and
+    a third maps chunk text hashes to the entry rows holding their
+    vectors, so unchanged chunks are found without opening every entry.
+    The database is opened on first use, and failures to write it (e.g. a
+    read-only cache volume) never fail a load or save.
+    """
+    
+    # Hashes per query, below SQLite's bound-parameter limit
+    LOOKUP_BATCH = 500
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._chunks_created = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            with self._db:
+                self._chunks_created = not self._db.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunks'"
+                ).fetchone()
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS chunks ("
+                    "hash TEXT, model TEXT, dtype TEXT, name TEXT, row INTEGER, "
+                    "PRIMARY KEY (model, dtype, hash, name)) WITHOUT ROWID"
+                )
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS access ("
+                    "name TEXT PRIMARY KEY, last_access REAL, hits INTEGER, misses INTEGER)"
+                )
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS sources ("
+                    "path TEXT, params TEXT, signature TEXT, name TEXT, "
+                    "PRIMARY KEY (path, params))"
+                )
+        return self._db
+    
+    def record(self, name: str, hits: int = 0, misses: int = 0) -> None:
+        """Mark an entry as used now and add to its counters."""
+        try:
+            with self._lock:
+                db = self._connect()
+                with db:
+                    db.execute(
+                        "INSERT INTO access VALUES (?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+                        "last_access = excluded.last_access, "
+                        "hits = hits + excluded.hits, misses = misses + excluded.misses",
+                        (name, time.time(), hits, misses)
+                    )
+        except sqlite3.Error:
+            pass
+    
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        """Access record of every known key."""
+        if not self.path.exists():
+            return {}
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT name, last_access, hits, misses FROM access"
+                ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {
+            name: {'last_access': last, 'hits': hits, 'misses': misses}
+            for name, last, hits, misses in rows
+        }
+    
+    def source_name(self, path: str, params: str, signature: str) -> Optional[str]:
+        """Key recorded for this exact version (``signature``) of a source file."""
+        if not self.path.exists():
+            return None
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT name FROM sources WHERE path = ? AND params = ? AND signature = ?",
+                    (path, params, signature)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+    
+    def remember_source(self, path: str, params: str, signature: str, name: str) -> None:
+        """Record the key a version of a source file hashed to."""
+        try:
+            with self._lock:
+                db = self._connect()
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                        (path, params, signature, name)
+                    )
+        except sqlite3.Error:
+            pass
+    
+    def take_chunk_backfill(self) -> bool:
+        """True once if the chunk table was just created and older entries need indexing."""
+        try:
+            with self._lock:
+                self._connect()
+                created, self._chunks_created = self._chunks_created, False
+                return created
+        except sqlite3.Error:
+            return False
+    
+    def index_chunks(self, name: str, model: str, dtype: str, hashes: List[str]) -> None:
+        """Record which row of entry ``name`` holds the vector of each chunk hash."""
+        try:
+            with self._lock:
+                db = self._connect()
+                with db:
+                    db.execute("DELETE FROM chunks WHERE name = ?", (name,))
+                    db.executemany(
+                        "INSERT OR IGNORE INTO chunks VALUES (?, ?, ?, ?, ?)",
+                        ((h, model, dtype, name, row) for row, h in enumerate(hashes))
+                    )
+        except sqlite3.Error:
+            pass
+    
+    def find_chunks(self, model: str, dtype: str, hashes: List[str]) -> Dict[str, List[tuple]]:
+        """Every (hash, row) of ``hashes`` stored by entries of this model and dtype, per entry."""
+        found: Dict[str, List[tuple]] = {}
+        if not self.path.exists():
+            return found
+        try:
+            with self._lock:
+                db = self._connect()
+                for start in range(0, len(hashes), self.LOOKUP_BATCH):
+                    batch = hashes[start:start + self.LOOKUP_BATCH]
+                    rows = db.execute(
+                        "SELECT hash, name, row FROM chunks WHERE model = ? AND dtype = ? "
+                        f"AND hash IN ({', '.join('?' * len(batch))})",
+                        (model, dtype, *batch)
+                    ).fetchall()
+                    for h, name, row in rows:
+                        found.setdefault(name, []).append((h, row))
+        except sqlite3.Error:
+            return {}
+        return found
+    
+    def forget(self, names: Iterable[str]) -> None:
+        """Drop the records of removed entries."""
+        names = list(names)
+        try:
+            with self._lock:
+                db = self._connect()
+                with db:
+                    db.executemany("DELETE FROM chunks WHERE name = ?", [(n,) for n in names])
+                    db.executemany("DELETE FROM access WHERE name = ?", [(n,) for n in names])
+        except sqlite3.Error:
+            pass
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
 
 class EmbeddingCache:
-    """Manages caching of embeddings for performance."""
+    """Manages caching of embeddings for performance.
     
-    def __init__(self, cache_dir: str = "cache"):
+    Each entry is a directory holding a raw ``.npy`` matrix (opened with
+    ``np.memmap`` on load), a small JSON header describing it, the chunks
+    as a memory-mapped columnar table (see ChunkTable) and the text hash
+    of every chunk. Entries are keyed by a
+    hash of the transcript content, model name and chunking parameters, so
+    identical content always maps to the same entry regardless of path or
+    mtime, and unchanged chunks can be reused when a transcript is edited.
+    
+    With ``max_bytes`` set, every save evicts the least recently used
+    entries until the whole directory fits the budget again.
+    
+    Several processes may share one cache directory: an entry is written
+    to a temp directory and published with a single rename, so readers
+    see either no entry or a complete one, and build_lock() lets one
+    worker build a given entry while the others wait for it.
+    """
+    
+    def __init__(
+        self, 
+        cache_dir: str = "cache",
+        model_name: Optional[str] = None,
+        dtype: str = "float32",
+        max_bytes: int = 0
+    ):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.dtype = dtype
+        self.max_bytes = max_bytes
+        self.access = AccessLog(self.cache_dir / ACCESS_FILE)
+    
+    def _params_header(self, params: Dict[str, Any]) -> str:
+        return json.dumps({'model': self.model_name, **params}, sort_keys=True)
+    
+    @traced("cache.key")
+    def cache_key(self, transcript_name: str, content: str, params: Dict[str, Any]) -> str:
+        """Build the entry key for transcript content under given chunking params."""
+        digest = content_hash(self._params_header(params) + "\0" + content)
+        slug = re.sub(r'[^\w-]', '_', transcript_name)[:64]
+        return f"{slug}-{digest}"
+    
+    def remember_source_key(
+        self, 
+        source: str, 
+        signature: str, 
+        params: Dict[str, Any], 
+        transcript_name: str
+    ) -> None:
+        """Remember the key of one version of a source file (see source_key())."""
+        self.access.remember_source(source, self._params_header(params), signature, transcript_name)
+    
+    def source_key(self, source: str, signature: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Key last computed for a source file, if it is unchanged since.
+        
+        ``signature`` identifies the file version (size and mtime), which
+        saves reading and hashing a large transcript just to find its entry.
+        """
+        return self.access.source_name(source, self._params_header(params), signature)
     
     def get_cache_paths(self, transcript_name: str) -> tuple[Path, Path]:
-        """Get cache file paths for a specific transcript."""
+        """Get cache file paths for a specific transcript (created only by save_cache())."""
         transcript_cache_dir = self.cache_dir / transcript_name
-        transcript_cache_dir.mkdir(parents=True, exist_ok=True)
         
-        embeddings_path = transcript_cache_dir / "embeddings.pkl"
-        chunks_path = transcript_cache_dir / "chunks.pkl"
+        embeddings_path = transcript_cache_dir / EMBEDDINGS_FILE
+        chunks_path = transcript_cache_dir / CHUNKS_FILE
         
         return embeddings_path, chunks_path
     
-    def load_cache(self, transcript_name: str) -> Optional[tuple[np.ndarray, List[Dict[str, Any]]]]:
+    def read_meta(self, transcript_name: str) -> Optional[Dict[str, Any]]:
+        """Read the header of a cache entry without touching its data."""
+        meta_path = self.cache_dir / transcript_name / META_FILE
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list_entries(self) -> List[str]:
+        """List names of all complete cache entries."""
+        entries = []
+        for item in sorted(self.cache_dir.iterdir()):
+            if item.is_dir() and all((item / f).exists() for f in ENTRY_FILES):
+                entries.append(item.name)
+        return entries
+    
+    def entry_dirs(self) -> List[Path]:
+        """Every entry directory, complete or not (shared indexes start with '_')."""
+        return [
+            item for item in sorted(self.cache_dir.iterdir())
+            if item.is_dir() and not item.name.startswith('_')
+        ]
+
+    @traced("cache.load")
+    def load_cache(self, transcript_name: str) -> Optional[tuple[np.ndarray, ChunkTable]]:
         """
         Load cached embeddings and chunks.
         
         Returns:
             Tuple of (embeddings, chunks) or None if cache invalid/missing
         """
-        embeddings_path, chunks_path = self.get_cache_paths(transcript_name)
+        entry_dir = self.cache_dir / transcript_name
+        embeddings_path = entry_dir / EMBEDDINGS_FILE
+        meta = self.read_meta(transcript_name)
         
-        if not (embeddings_path.exists() and chunks_path.exists()):
+        if not (self._usable(meta) and embeddings_path.exists() and
+                all((entry_dir / f).exists() for f in (CHUNKS_FILE, CHUNK_ROWS_FILE))):
+            self.access.record(transcript_name, misses=1)
             return None
         
         try:
-            with open(embeddings_path, 'rb') as f:
-                embeddings = pickle.load(f)
-            with open(chunks_path, 'rb') as f:
-                chunks = pickle.load(f)
+            stored = np.load(embeddings_path, mmap_mode='r')
+            if stored.shape != (meta['rows'], meta['dim']):
+                raise ValueError(f"shape {stored.shape} does not match header")
+            embeddings = dequantize_embeddings(stored, meta.get('scales'))
+            with span("cache.read_chunks"):
+                chunks = ChunkTable.open(entry_dir, meta.get('speakers', []))
             
+            self.access.record(transcript_name, hits=1)
             return embeddings, chunks
             
         except Exception as e:
             print(f"⚠️  Error loading cache: {e}")
+            self.access.record(transcript_name, misses=1)
             return None
     
+    def load_chunks(self, transcript_name: str) -> Optional[ChunkTable]:
+        """Open the chunks of an entry without touching its embeddings (None if invalid)."""
+        if not self.is_cache_valid(transcript_name):
+            self.access.record(transcript_name, misses=1)
+            return None
+        try:
+            meta = self.read_meta(transcript_name) or {}
+            chunks = ChunkTable.open(self.cache_dir / transcript_name, meta.get('speakers', []))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Error reading cache: {e}")
+            return None
+        self.access.record(transcript_name, hits=1)
+        return chunks
+    
+    @traced("cache.read_chunk_range")
+    def read_chunks(self, transcript_name: str, start: int, stop: int) -> Optional[List[ChunkView]]:
+        """
+        Read chunks ``start`` to ``stop - 1`` of an entry without loading the rest.
+        
+        Returns:
+            The chunks (clamped to the entry), or None if the entry is missing or invalid
+        """
+        table = self.load_chunks(transcript_name)
+        return None if table is None else table[max(0, start):max(0, stop)]
+    
+    def _index_entry(self, name: str) -> None:
+        """Add an entry's chunk hashes to the shared chunk index."""
+        meta = self.read_meta(name)
+        hashes_path = self.cache_dir / name / HASHES_FILE
+        if not meta or not hashes_path.exists():
+            return
+        try:
+            hashes = [h.decode('ascii') for h in np.load(hashes_path).tolist()]
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Error reading cache entry {name}: {e}")
+            return
+        self.access.index_chunks(name, meta.get('model') or '', meta.get('dtype'), hashes)
+    
+    @traced("cache.lookup_chunks")
+    def lookup_chunk_embeddings(self, chunk_hashes: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Find already-computed embeddings for chunks by their text hash.
+        
+        Looks the hashes up in the shared chunk index and reads only the
+        matching rows. Only vectors stored at this cache's dtype are reused:
+        re-quantizing vectors that were already rounded to a narrower type
+        would compound the error.
+        
+        Returns:
+            Mapping of chunk hash to embedding vector for every hit
+        """
+        if self.access.take_chunk_backfill():
+            # Entries written before the chunk index existed
+            for name in self.list_entries():
+                self._index_entry(name)
+        
+        wanted = sorted(set(chunk_hashes))
+        matches = self.access.find_chunks(self.model_name or '', self.dtype, wanted)
+        found: Dict[str, np.ndarray] = {}
+        
+        # Entries holding the most wanted chunks first, so few are opened
+        for name, rows in sorted(matches.items(), key=lambda item: -len(item[1])):
+            rows = [(h, row) for h, row in rows if h not in found]
+            if not rows or not self.is_cache_valid(name):
+                continue
+            
+            try:
+                meta = self.read_meta(name)
+                stored = np.load(self.cache_dir / name / EMBEDDINGS_FILE, mmap_mode='r')
+                indices = np.array([row for _, row in rows])
+                vectors = dequantize_embeddings(np.asarray(stored[indices]), meta.get('scales'))
+                for (h, _), vector in zip(rows, vectors):
+                    found[h] = vector
+                # Reused rows keep their entry from being evicted
+                self.access.record(name)
+            except Exception as e:
+                print(f"⚠️  Error reading cache entry {name}: {e}")
+        
+        return found
+    
+    @traced("cache.save")
     def save_cache(
         self, 
         transcript_name: str, 
         embeddings: np.ndarray, 
-        chunks: List[Dict[str, Any]]
+        chunks: Union[ChunkTable, List[Dict[str, Any]]],
+        chunk_hashes: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        video_url: Optional[str] = None
     ) -> None:
-        """Save embeddings and chunks to cache."""
-        embeddings_path, chunks_path = self.get_cache_paths(transcript_name)
+        """
+        Save embeddings and chunks to cache.
+        
+        Files are written to a temp directory which is then renamed into
+        place, so a crash or a concurrent reader never sees a partial
+        entry. When ``source`` is given, older entries built from the same
+        source file with the same model are removed once the new entry is
+        published.
+        """
+        entry_dir = self.cache_dir / transcript_name
+        temp_dir = None
         
         try:
-            with open(embeddings_path, 'wb') as f:
-                pickle.dump(embeddings, f)
-            with open(chunks_path, 'wb') as f:
-                pickle.dump(chunks, f)
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            if embeddings.ndim != 2:
+                embeddings = embeddings.reshape(len(embeddings), -1 if embeddings.size else 0)
+            stored, scales = quantize_embeddings(embeddings, self.dtype)
+            meta = {
+                'format': ENTRY_FORMAT,
+                'model': self.model_name,
+                'dim': int(embeddings.shape[1]),
+                'rows': int(embeddings.shape[0]),
+                'dtype': self.dtype,
+                'scales': scales,
+                'source': source,
+                'video_url': video_url
+            }
+            
+            temp_dir = Path(tempfile.mkdtemp(prefix=f"{TEMP_PREFIX}{transcript_name[:64]}-",
+                                             dir=self.cache_dir))
+            _write_synced(temp_dir / EMBEDDINGS_FILE, lambda f: np.save(f, stored))
+            if chunk_hashes is not None:
+                hashes = np.array(chunk_hashes, dtype='S32')
+                _write_synced(temp_dir / HASHES_FILE, lambda f: np.save(f, hashes))
+            table = as_chunk_table(chunks)
+            meta['speakers'] = table.speakers
+            meta['text_bytes'] = len(table.text)
+            _write_synced(temp_dir / CHUNKS_FILE, lambda f: f.write(bytes(table.text)))
+            _write_synced(temp_dir / CHUNK_ROWS_FILE, lambda f: np.save(f, table.rows))
+            _write_synced(temp_dir / META_FILE, lambda f: f.write(json.dumps(meta).encode('utf-8')))
+            
+            self._publish(temp_dir, entry_dir)
+            temp_dir = None
             
             print(f"✅ Cached {len(embeddings)} embeddings for {transcript_name}")
+            self.access.record(transcript_name)
+            
+            if source:
+                self._remove_superseded(transcript_name, source)
+            if self.max_bytes:
+                self.evict(self.max_bytes, keep={transcript_name})
             
         except Exception as e:
             print(f"⚠️  Error saving cache: {e}")
+        finally:
+            if temp_dir is not None:
+                shutil.rmtree(temp_dir, ignore_errors=True)
     
-    def is_cache_valid(self, transcript_name: str, transcript_path: Path) -> bool:
-        """Check if cached data is still valid for the transcript file."""
-        if not transcript_path.exists():
-            return False
-            
-        embeddings_path, chunks_path = self.get_cache_paths(transcript_name)
+    def _publish(self, temp_dir: Path, entry_dir: Path) -> None:
+        """Atomically move a fully written temp directory to its entry name and index its chunks."""
+        try:
+            os.rename(temp_dir, entry_dir)
+        except OSError:
+            # Keys hash the content, so a usable entry already there is the same data
+            if self.is_cache_valid(entry_dir.name):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            else:
+                # Replace a broken or outdated entry; readers holding its files keep them
+                trash = Path(tempfile.mkdtemp(prefix=TEMP_PREFIX, dir=self.cache_dir))
+                os.rename(entry_dir, trash / entry_dir.name)
+                os.rename(temp_dir, entry_dir)
+                shutil.rmtree(trash, ignore_errors=True)
+        self._index_entry(entry_dir.name)
+    
+    @contextlib.contextmanager
+    def build_lock(self, transcript_name: str) -> Iterator[bool]:
+        """
+        Hold the exclusive build lock of one entry.
+        
+        Uses an advisory ``flock`` under ``cache_dir/_locks``, which also
+        excludes other threads of the same process. Without ``fcntl``
+        (Windows) there is no cross-process locking.
+        
+        Yields:
+            True if another worker held the lock first, in which case the
+            entry it was building may now be cached
+        """
+        if fcntl is None:
+            yield False
+            return
+        
+        lock_dir = self.cache_dir / LOCK_DIR
+        lock_dir.mkdir(exist_ok=True)
+        with open(lock_dir / f"{transcript_name}.lock", 'wb') as f:
+            waited = False
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print(f"⏳ Waiting for another process to finish building {transcript_name}...")
+                with span("cache.wait_for_build"):
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                waited = True
+            try:
+                yield waited
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _usable(self, meta: Optional[Dict[str, Any]]) -> bool:
+        """Whether a header describes an entry this cache can read."""
+        return (bool(meta) and
+                meta.get('format') == ENTRY_FORMAT and
+                (not self.model_name or meta.get('model') == self.model_name))
+    
+    @traced("cache.validate")
+    def is_cache_valid(self, transcript_name: str) -> bool:
+        """Check if a complete entry built by this model exists for the key."""
+        entry_dir = self.cache_dir / transcript_name
         
         # Check if cache files exist
-        if not (embeddings_path.exists() and chunks_path.exists()):
+        if not all((entry_dir / f).exists() for f in ENTRY_FILES):
             return False
         
-        # Compare file modification times
-        transcript_mtime = transcript_path.stat().st_mtime
-        cache_mtime = min(embeddings_path.stat().st_mtime, chunks_path.stat().st_mtime)
+        # Entries written by a different model or in an older layout are stale
+        return self._usable(self.read_meta(transcript_name))
+    
+    def _remove_superseded(self, transcript_name: str, source: str) -> None:
+        """Drop entries for an older version of the same source file."""
+        for name in self.list_entries():
+            if name == transcript_name:
+                continue
+            meta = self.read_meta(name)
+            if meta and meta.get('source') == source and meta.get('model') == self.model_name:
+                self.remove_entry(name)
+    
+    def remove_entry(self, name: str) -> None:
+        """Delete one entry directory and its access record."""
+        shutil.rmtree(self.cache_dir / name, ignore_errors=True)
+        self.access.forget([name])
+    
+    def remove_abandoned(self, max_age: float = ABANDONED_TEMP_AGE) -> List[str]:
+        """Delete temp directories left behind by writers that crashed mid-save."""
+        removed = []
+        cutoff = time.time() - max_age
+        for item in self.cache_dir.glob(f"{TEMP_PREFIX}*"):
+            try:
+                if item.stat().st_mtime < cutoff:
+                    shutil.rmtree(item, ignore_errors=True)
+                    removed.append(item.name)
+            except OSError:
+                pass
+        return removed
+    
+    def usage(self) -> List[Dict[str, Any]]:
+        """
+        Size, header and access record of every entry directory.
+        
+        Only headers and file sizes are read, never the embeddings or
+        chunks. ``stale`` names why an entry is no longer useful:
+        ``incomplete`` (files missing), ``outdated format`` or
+        ``source missing`` (the transcript it was built from is gone).
+        """
+        access = self.access.read()
+        entries = []
+        for entry_dir in self.entry_dirs():
+            name = entry_dir.name
+            meta = self.read_meta(name) or {}
+            record = access.get(name, {})
+            
+            stale = None
+            if not all((entry_dir / f).exists() for f in ENTRY_FILES):
+                stale = "incomplete"
+            elif meta.get('format') != ENTRY_FORMAT:
+                stale = "outdated format"
+            elif meta.get('source') and not Path(meta['source']).exists():
+                stale = "source missing"
+            
+            entries.append({
+                'name': name,
+                'bytes': path_bytes(entry_dir),
+                'rows': meta.get('rows'),
+                'model': meta.get('model'),
+                'dtype': meta.get('dtype'),
+                'source': meta.get('source'),
+                # Entries written before access tracking fall back to their mtime
+                'last_access': record.get('last_access') or entry_dir.stat().st_mtime,
+                'hits': record.get('hits', 0),
+                'misses': record.get('misses', 0),
+                'stale': stale
+            })
+        return entries
+    
+    def stats(self) -> Dict[str, Any]:
+        """Directory totals: bytes used, budget, entry count and hit/miss counts."""
+        entries = self.usage()
+        names = {entry['name'] for entry in entries}
+        other = sum(
+            path_bytes(item) for item in self.cache_dir.iterdir() if item.name not in names
+        )
+        access = self.access.read()
+        return {
+            'cache_dir': str(self.cache_dir),
+            'entries': entries,
+            'entry_bytes': sum(entry['bytes'] for entry in entries),
+            'other_bytes': other,
+            'total_bytes': other + sum(entry['bytes'] for entry in entries),
+            'max_bytes': self.max_bytes,
+            # Misses include keys that were never cached (e.g. lexical-only loads)
+            'hits': sum(record['hits'] for record in access.values()),
+            'misses': sum(record['misses'] for record in access.values()),
+            'stale': sum(1 for entry in entries if entry['stale'])
+        }
+    
+    @traced("cache.evict")
+    def evict(
+        self, 
+        max_bytes: int, 
+        keep: Iterable[str] = (), 
+        dry_run: bool = False
+    ) -> List[str]:
+        """
+        Remove least recently used entries until the directory fits ``max_bytes``.
+        
+        Shared indexes (``_ann``, ``_lexical``, the SQLite files) count
+        toward the total but are not evicted; entries in ``keep`` are never
+        removed.
+        
+        Returns:
+            Names of the removed (or, with ``dry_run``, removable) entries
+        """
+        stats = self.stats()
+        total = stats['total_bytes']
+        keep = set(keep)
+        
+        # Oldest first; among equally old entries free the largest first
+        candidates = sorted(
+            (entry for entry in stats['entries'] if entry['name'] not in keep),
+            key=lambda entry: (entry['last_access'], -entry['bytes'])
+        )
+        removed = []
+        for entry in candidates:
+            if total <= max_bytes:
+                break
+            if not dry_run:
+                shutil.rmtree(self.cache_dir / entry['name'], ignore_errors=True)
+            total -= entry['bytes']
+            removed.append(entry['name'])
+        
+        if removed and not dry_run:
+            self.access.forget(removed)
+            print(f"🧹 Evicted {len(removed)} cache entries to stay under "
+                  f"{max_bytes / (1024 * 1024):.0f} MB")
+        return removed
+    
+    def verify_entry(self, name: str) -> List[str]:
+        """
+        Check an entry's files against its header without loading them.
+        
+        Reads only the ``.npy`` headers and file sizes, so truncated or
+        mismatched files are found without decoding any chunk.
+        
+        Returns:
+            Problems found (empty if the entry is sound)
+        """
+        entry_dir = self.cache_dir / name
+        problems = [f"missing {f}" for f in ENTRY_FILES if not (entry_dir / f).exists()]
+        meta = self.read_meta(name)
+        if meta is None:
+            return problems or ["unreadable meta.json"]
+        
+        for filename in (EMBEDDINGS_FILE, HASHES_FILE, CHUNK_ROWS_FILE):
+            path = entry_dir / filename
+            if not path.exists():
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    version = np.lib.format.read_magic(f)
+                    read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                                   else np.lib.format.read_array_header_2_0)
+                    shape, _, dtype = read_header(f)
+                    expected = f.tell() + int(np.prod(shape)) * dtype.itemsize
+            except Exception as e:
+                problems.append(f"unreadable {filename}: {e}")
+                continue
+            
+            if shape[0] != meta.get('rows'):
+                problems.append(f"{filename} has {shape[0]} rows, header says {meta.get('rows')}")
+            elif filename == EMBEDDINGS_FILE and shape != (meta.get('rows'), meta.get('dim')):
+                problems.append(f"{filename} shape {shape} does not match header")
+            if path.stat().st_size < expected:
+                problems.append(f"{filename} is truncated")
         
-        # Cache is valid if it's newer than the transcript file
-        return cache_mtime >= transcript_mtime
+        chunks_path = entry_dir / CHUNKS_FILE
+        if chunks_path.exists() and chunks_path.stat().st_size != meta.get('text_bytes'):
+            problems.append(f"{CHUNKS_FILE} size does not match header")
+        return problems
     
     def clear_cache(self, transcript_name: Optional[str] = None) -> None:
         """Clear cache for specific transcript or all caches."""
@@ -94,13 +799,12 @@ class EmbeddingCache:
                 for file in transcript_cache_dir.iterdir():
                     file.unlink()
                 transcript_cache_dir.rmdir()
+                self.access.forget([transcript_name])
                 print(f"✅ Cleared cache for {transcript_name}")
         else:
             for item in self.cache_dir.iterdir():
                 if item.is_dir():
-                    for file in item.iterdir():
-                        file.unlink()
-                    item.rmdir()
+                    shutil.rmtree(item)
                 elif item.is_file():
                     item.unlink()
-            print("✅ Cleared all caches")
\ No newline at end of file
+            print("✅ Cleared all caches")
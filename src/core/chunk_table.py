@@ -0,0 +1,271 @@
+"""Columnar chunk storage: one text buffer plus fixed-width per-chunk rows."""
+
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+
+CHUNKS_FILE = "chunks.bin"
+CHUNK_ROWS_FILE = "chunks.npy"
+
+# One row per chunk. Content is text[text_start:text_end]; the chunk's own
+# (non-overlap) text starts at new_start. Times are NaN when unknown.
+ROW_DTYPE = np.dtype([
+    ('text_start', '<i8'),
+    ('new_start', '<i8'),
+    ('text_end', '<i8'),
+    ('speaker', '<i4'),
+    ('labeled', 'u1'),
+    ('start', '<f8'),
+    ('end', '<f8'),
+    ('tokens', '<i4'),
+])
+
+DEFAULT_SPEAKER = 'Speaker'
+
+
+class ChunkView(Mapping):
+    """Read-only, dict-like view of one row of a ChunkTable.
+
+    Fields are decoded on access, so ``chunk['content']`` or
+    ``chunk.get('start')`` cost one slice of the shared buffer and no
+    per-chunk dict is ever built.
+    """
+
+    __slots__ = ('_table', '_row')
+
+    KEYS = ('id', 'content', 'original', 'speaker', 'start_index', 'start', 'end', 'tokens')
+
+    def __init__(self, table: "ChunkTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        getter = _FIELD_GETTERS.get(key)
+        if getter is None:
+            raise KeyError(key)
+        return getter(self._table, self._row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"ChunkView({dict(self)!r})"
+
+
+class ChunkTable(Sequence):
+    """Chunks of one transcript held as columns rather than dicts.
+
+    All chunk text lives in one UTF-8 buffer; a chunk's overlap with the
+    previous chunk points back into that chunk's text instead of being
+    stored twice. Speakers are interned into a small list referenced by
+    code, and times and token counts are plain arrays. ``original`` is
+    rendered from the speaker and the new-text span only when read.
+
+    Indexing returns a ChunkView, so code written against chunk dicts
+    (``chunk['content']``, ``chunk.get('end')``) works unchanged.
+
+    Args:
+        text: UTF-8 text buffer (bytes or a uint8 array, e.g. a memmap)
+        rows: Structured array of ROW_DTYPE, one row per chunk
+        speakers: Speaker names indexed by the rows' speaker codes
+    """
+
+    def __init__(
+        self,
+        text: Union[bytes, np.ndarray] = b"",
+        rows: Optional[np.ndarray] = None,
+        speakers: Optional[List[str]] = None
+    ):
+        self.text = text
+        self.rows = rows if rows is not None else np.zeros(0, dtype=ROW_DTYPE)
+        self.speakers = list(speakers or [])
+        # Field views, so per-chunk access is a plain array index
+        self._text_start = self.rows['text_start']
+        self._new_start = self.rows['new_start']
+        self._text_end = self.rows['text_end']
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ChunkView, List[ChunkView]]:
+        if isinstance(index, slice):
+            return [ChunkView(self, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chunk index out of range")
+        return ChunkView(self, index)
+
+    def _decode(self, start: int, end: int) -> str:
+        return bytes(self.text[start:end]).decode('utf-8')
+
+    def content(self, i: int) -> str:
+        """Full text of chunk ``i``, including overlap."""
+        return self._decode(int(self._text_start[i]), int(self._text_end[i]))
+
+    def new_text(self, i: int) -> str:
+        """Text chunk ``i`` adds after the previous chunk's overlap."""
+        return self._decode(int(self._new_start[i]), int(self._text_end[i]))
+
+    def speaker(self, i: int) -> str:
+        return self.speakers[self.rows['speaker'][i]]
+
+    def original(self, i: int) -> str:
+        """New text of chunk ``i``, prefixed with its speaker label if it had one."""
+        if self.rows['labeled'][i]:
+            return f"**{self.speaker(i)}:** {self.new_text(i)}"
+        return self.new_text(i)
+
+    def contents(self) -> List[str]:
+        """Every chunk's content, in order (for encoding and indexing)."""
+        decode = self._decode
+        return [
+            decode(start, end)
+            for start, end in zip(self._text_start.tolist(), self._text_end.tolist())
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the text buffer and the row arrays."""
+        return len(self.text) + self.rows.nbytes
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Mapping]) -> "ChunkTable":
+        """
+        Build a table from chunk dicts (content, original, speaker and optionally start/end/tokens).
+
+        ``original`` must be the tail of ``content``, optionally prefixed
+        with ``**speaker:**``, as every chunker in this package produces.
+        """
+        builder = ChunkTableBuilder()
+        for chunk in chunks:
+            content, original = chunk['content'], chunk['original']
+            speaker = chunk.get('speaker') or DEFAULT_SPEAKER
+            label = f"**{speaker}:** "
+            labeled = original.startswith(label) and not content.startswith(label)
+            body = original[len(label):] if labeled else original
+            if not content.endswith(body):
+                raise ValueError(f"chunk original is not drawn from its content: {original[:40]!r}")
+            builder.add(
+                content,
+                len(content) - len(body),
+                speaker,
+                labeled=labeled,
+                start=chunk.get('start'),
+                end=chunk.get('end'),
+                tokens=chunk.get('tokens') or 0
+            )
+        return builder.build()
+
+    @classmethod
+    def open(cls, entry_dir: Path, speakers: List[str]) -> "ChunkTable":
+        """
+        Memory-map a table saved in ``entry_dir``.
+
+        Nothing is read up front: a range of chunks pages in only its rows
+        and its span of text.
+        """
+        entry_dir = Path(entry_dir)
+        rows = np.load(entry_dir / CHUNK_ROWS_FILE, mmap_mode='r')
+        if rows.dtype != ROW_DTYPE:
+            raise ValueError(f"{CHUNK_ROWS_FILE} has unexpected dtype {rows.dtype}")
+        text_path = entry_dir / CHUNKS_FILE
+        text = np.memmap(text_path, dtype=np.uint8, mode='r') if text_path.stat().st_size else b""
+        if len(rows) and int(rows['text_end'][-1]) > len(text):
+            raise ValueError(f"{CHUNKS_FILE} is truncated")
+        return cls(text, rows, speakers)
+
+
+def as_chunk_table(chunks: Union[ChunkTable, Iterable[Mapping]]) -> ChunkTable:
+    """Return ``chunks`` as a ChunkTable, converting a list of chunk dicts."""
+    return chunks if isinstance(chunks, ChunkTable) else ChunkTable.from_chunks(chunks)
+
+
+class ChunkTableBuilder:
+    """Appends chunks to a growing ChunkTable.
+
+    When a chunk's overlap already ends the text buffer (as it does for
+    consecutive chunks of one turn), only the new text is appended.
+    """
+
+    def __init__(self):
+        self._text = bytearray()
+        self._rows: List[tuple] = []
+        self._speaker_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self,
+        content: str,
+        new_start: int = 0,
+        speaker: str = DEFAULT_SPEAKER,
+        labeled: bool = False,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tokens: int = 0
+    ) -> None:
+        """
+        Append one chunk.
+
+        Args:
+            content: Chunk text, including overlap
+            new_start: Character offset in ``content`` where new text starts
+            speaker: Speaker name
+            labeled: Whether ``original`` carries a ``**speaker:**`` label
+            start: Start time in seconds, if known
+            end: End time in seconds, if known
+            tokens: Content token count
+        """
+        overlap = content[:new_start].rstrip(' ')
+        head = overlap.encode('utf-8')
+        if head and self._text.endswith(head):
+            # Share the overlap with the end of the buffer
+            text_start = len(self._text) - len(head)
+            self._text += content[len(overlap):].encode('utf-8')
+        else:
+            text_start = len(self._text)
+            self._text += content.encode('utf-8')
+        text_end = len(self._text)
+        new_start = text_end - len(content[new_start:].encode('utf-8'))
+
+        code = self._speaker_codes.setdefault(speaker, len(self._speaker_codes))
+        self._rows.append((
+            text_start, new_start, text_end, code, labeled,
+            np.nan if start is None else start,
+            np.nan if end is None else end,
+            tokens
+        ))
+
+    def build(self) -> ChunkTable:
+        return ChunkTable(
+            bytes(self._text),
+            np.array(self._rows, dtype=ROW_DTYPE),
+            list(self._speaker_codes)
+        )
+
+
+def _time(column: str) -> Any:
+    def get(table: ChunkTable, i: int) -> Optional[float]:
+        value = float(table.rows[column][i])
+        return None if np.isnan(value) else value
+    return get
+
+
+_FIELD_GETTERS = {
+    'id': lambda table, i: i,
+    'content': ChunkTable.content,
+    'original': ChunkTable.original,
+    'speaker': ChunkTable.speaker,
+    'start_index': lambda table, i: i,
+    'start': _time('start'),
+    'end': _time('end'),
+    'tokens': lambda table, i: int(table.rows['tokens'][i]),
+}
@@ -0,0 +1,71 @@
+"""Client for the resident search server.
+
+Kept free of the ML stack so the CLI can talk to a running server
+without importing torch or sentence-transformers.
+"""
+
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+class SearchClient:
+    """Client for a running search server."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, timeout: float = 300.0):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def health(self) -> Optional[Dict[str, Any]]:
+        """The server's health report, or None if nothing is listening.
+        
+        Fails fast when nothing is bound to the port.
+        """
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/health", timeout=0.25) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError, urllib.error.URLError):
+            return None
+
+    def _post(self, path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        data = json.dumps(request).encode('utf-8')
+        http_request = urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=data,
+            headers={'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(json.loads(e.read()).get('error', str(e)))
+
+    def search(
+        self,
+        query: str,
+        transcript: Optional[str] = None,
+        corpus: Optional[str] = None,
+        num_results: int = 10,
+        ann: bool = False,
+        nprobe: int = 8,
+        mode: str = "dense"
+    ) -> List[Dict[str, Any]]:
+        """Search a transcript, or a corpus when ``corpus`` is set ("" = server default)."""
+        request: Dict[str, Any] = {'query': query, 'num_results': num_results, 'mode': mode}
+        if corpus is not None:
+            request['corpus'] = str(Path(corpus).resolve()) if corpus else ""
+            request['ann'] = ann
+            request['nprobe'] = nprobe
+        else:
+            request['transcript'] = str(Path(transcript).resolve())
+        return self._post("/search", request)['results']
+
+    def expand(self, transcript: str, result_id: int, context_chunks: int = 3) -> str:
+        """Get expanded context around a result from the server."""
+        return self._post("/expand", {
+            'transcript': str(Path(transcript).resolve()),
+            'result_id': result_id,
+            'context_chunks': context_chunks
+        })['context']
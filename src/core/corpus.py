@@ -0,0 +1,238 @@
+"""Corpus-wide index over every cached transcript."""
+
+from typing import List, Optional
+from pathlib import Path
+import shutil
+import numpy as np
+
+from .ann import IVFIndex
+from .cache import EmbeddingCache, content_hash
+from .chunk_table import ChunkTable, ChunkView
+from .lexical import BM25Index
+from .scoring import normalize_rows, top_k_rows
+from .shards import ShardedIndex
+
+
+ANN_DIR = "_ann"
+LEXICAL_DIR = "_lexical"
+
+# Retrain the IVF centroids once the corpus outgrows the training set by this much
+ANN_RETRAIN_FACTOR = 4
+
+
+class CorpusIndex:
+    """Stacks all cached transcript embeddings into one searchable matrix.
+
+    Row ``i`` of ``embeddings`` belongs to transcript
+    ``transcript_names[row_transcripts[i]]`` and is chunk ``row_chunks[i]``
+    within that transcript.
+
+    Built with ``shard_rows``, the embeddings stay in memory-mapped shards
+    (see ShardedIndex) instead of one stacked matrix; corpus rows are
+    numbered the same way and search_dense() hides the difference.
+    """
+
+    def __init__(self, cache: EmbeddingCache):
+        self.cache = cache
+        self.entry_keys: List[str] = []
+        self.transcript_names: List[str] = []
+        self.video_urls: List[Optional[str]] = []
+        self.chunks: List[ChunkTable] = []
+        self.embeddings: Optional[np.ndarray] = None
+        self.row_transcripts: np.ndarray = np.empty(0, dtype=np.int32)
+        self.row_chunks: np.ndarray = np.empty(0, dtype=np.int32)
+        self.ann: Optional[IVFIndex] = None
+        self.lexical: Optional[BM25Index] = None
+        self.shards: Optional[ShardedIndex] = None
+        # Shard entry id -> transcript id (-1 if not loaded)
+        self._shard_transcripts: np.ndarray = np.empty(0, dtype=np.int64)
+        self._row_starts: np.ndarray = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.row_transcripts)
+
+    def build(self, shard_rows: int = 0, shard_workers: int = 0) -> None:
+        """
+        Load every cache entry and stack it into a contiguous matrix.
+
+        Args:
+            shard_rows: Keep embeddings in shards of this many rows instead (0 = stack)
+            shard_workers: Threads scoring shards in parallel (0 = one per core)
+        """
+        matrices = []
+        row_transcripts = []
+        row_chunks = []
+        dim = None
+
+        if shard_rows > 0:
+            self.shards = ShardedIndex.sync(self.cache, shard_rows, shard_workers)
+            shard_rows_of = {e['key']: e['rows'] for e in self.shards.entries}
+            names = self.shards.live_keys()
+        else:
+            names = self.cache.list_entries()
+
+        for name in names:
+            if self.shards is not None:
+                # Only the chunks: the vectors are read from the shards
+                chunks = self.cache.load_chunks(name)
+                if chunks is None:
+                    continue
+                embeddings = None
+                rows = shard_rows_of[name]
+            else:
+                cached_data = self.cache.load_cache(name)
+                if not cached_data:
+                    continue
+                embeddings, chunks = cached_data
+                if len(embeddings) == 0:
+                    continue
+                if dim is None:
+                    dim = embeddings.shape[1]
+                elif embeddings.shape[1] != dim:
+                    print(f"⚠️  Skipping {name}: embedding dim {embeddings.shape[1]} != {dim}")
+                    continue
+                rows = len(embeddings)
+
+            # Show the source file's name rather than the hashed cache key
+            meta = self.cache.read_meta(name) or {}
+            source = meta.get('source')
+
+            transcript_id = len(self.transcript_names)
+            self.entry_keys.append(name)
+            self.transcript_names.append(Path(source).stem if source else name)
+            self.video_urls.append(meta.get('video_url'))
+            self.chunks.append(chunks)
+            if embeddings is not None:
+                matrices.append(embeddings)
+            row_transcripts.append(np.full(rows, transcript_id, dtype=np.int32))
+            row_chunks.append(np.arange(rows, dtype=np.int32))
+
+        if not row_transcripts:
+            raise ValueError(f"No cached transcripts found in {self.cache.cache_dir}")
+
+        self.row_transcripts = np.concatenate(row_transcripts)
+        self.row_chunks = np.concatenate(row_chunks)
+        if self.shards is not None:
+            self._link_shards()
+        else:
+            # Normalized once here so every query is a single dot product
+            self.embeddings = normalize_rows(np.vstack(matrices))
+
+        layout = f" in {len(self.shards.manifest['shards'])} shards" if self.shards else ""
+        print(f"✅ Loaded corpus of {len(self.transcript_names)} transcripts "
+              f"({len(self)} chunks{layout})")
+
+    def _link_shards(self) -> None:
+        """Map shard entries to loaded transcripts and mask the rest out of scoring."""
+        positions = {key: i for i, key in enumerate(self.entry_keys)}
+        self._shard_transcripts = np.array(
+            [positions.get(entry['key'], -1) for entry in self.shards.entries], dtype=np.int64
+        )
+        self.shards.set_live(self._shard_transcripts >= 0)
+        counts = np.bincount(self.row_transcripts, minlength=len(self.entry_keys))
+        self._row_starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+
+    def search_dense(self, vectors: np.ndarray, k: int) -> List[tuple[np.ndarray, np.ndarray]]:
+        """
+        Exact dense top-k for normalized query vectors.
+
+        Returns:
+            Per query, (corpus rows, scores), best first
+        """
+        if self.shards is None:
+            similarities = vectors @ self.embeddings.T
+            top = top_k_rows(similarities, k)
+            return list(zip(top, np.take_along_axis(similarities, top, axis=1)))
+        results = []
+        for entries, chunks, scores in self.shards.search(vectors, k):
+            transcripts = self._shard_transcripts[entries]
+            results.append((self._row_starts[transcripts] + chunks, scores))
+        return results
+
+    def version(self) -> str:
+        """Identity of the stacked entries, for keying cached results."""
+        return content_hash("|".join(self.entry_keys) + f":{self.cache.dtype}")
+    
+    def build_ann(self, nlist: int = 0) -> None:
+        """
+        Build or update the IVF index persisted under ``cache_dir/_ann``.
+        
+        Centroids are reused across runs; only entries without stored list
+        assignments are assigned, so adding transcripts is incremental.
+        """
+        if self.shards is not None:
+            raise ValueError("The IVF index needs a stacked corpus; build it without shards.")
+        if self.embeddings is None:
+            raise ValueError("Corpus not built. Call build() first.")
+        
+        index_dir = self.cache.cache_dir / ANN_DIR
+        assignments_dir = index_dir / "assignments"
+        
+        index = IVFIndex.load(index_dir)
+        if (index is None or
+            index.centroids.shape[1] != self.embeddings.shape[1] or
+            (nlist and index.nlist != nlist) or
+            len(self) > ANN_RETRAIN_FACTOR * index.train_rows):
+            print(f"Training IVF index over {len(self)} chunks...")
+            index = IVFIndex.train(self.embeddings, nlist)
+            if assignments_dir.exists():
+                shutil.rmtree(assignments_dir)
+            index.save(index_dir)
+        assignments_dir.mkdir(parents=True, exist_ok=True)
+        
+        parts = []
+        for transcript_id, key in enumerate(self.entry_keys):
+            rows = self.row_transcripts == transcript_id
+            path = assignments_dir / f"{key}.npy"
+            assignments = np.load(path) if path.exists() else None
+            if assignments is None or len(assignments) != int(rows.sum()):
+                assignments = index.assign(self.embeddings[rows])
+                np.save(path, assignments)
+            parts.append(assignments)
+        
+        # Forget entries that are no longer in the cache
+        live = {f"{key}.npy" for key in self.entry_keys}
+        for path in assignments_dir.iterdir():
+            if path.name not in live:
+                path.unlink()
+        
+        index.set_assignments(np.concatenate(parts))
+        self.ann = index
+    
+    def lexical_index(self) -> BM25Index:
+        """
+        BM25 index over every corpus row, persisted under ``cache_dir/_lexical``.
+        
+        The file is named by the corpus version, so it is rebuilt whenever
+        the set of cached entries changes.
+        """
+        if self.lexical is not None:
+            return self.lexical
+        
+        index_dir = self.cache.cache_dir / LEXICAL_DIR
+        path = index_dir / f"{self.version()}.npz"
+        self.lexical = BM25Index.load(path)
+        if self.lexical is None or len(self.lexical) != len(self):
+            print(f"Building lexical index over {len(self)} chunks...")
+            self.lexical = BM25Index.build(
+                text for chunks in self.chunks for text in chunks.contents()
+            )
+            index_dir.mkdir(exist_ok=True)
+            for stale in index_dir.glob("*.npz"):
+                stale.unlink()
+            self.lexical.save(path)
+        return self.lexical
+    
+    def video_url(self, row: int) -> Optional[str]:
+        """Source video URL of a corpus row, if known."""
+        return self.video_urls[int(self.row_transcripts[row])]
+    
+    def locate(self, row: int) -> tuple[str, int, ChunkView]:
+        """Map a corpus row to (transcript name, chunk id, chunk)."""
+        transcript_id = int(self.row_transcripts[row])
+        chunk_id = int(self.row_chunks[row])
+        return (
+            self.transcript_names[transcript_id],
+            chunk_id,
+            self.chunks[transcript_id][chunk_id],
+        )
@@ -0,0 +1,146 @@
+"""Batched chunk embedding, in-process or across CPU worker processes."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .encoders import EncoderSpec
+from ..utils.profiling import traced
+
+
+# Model held by each worker process, set up once by _init_worker
+_worker_model: Any = None
+
+
+def _init_worker(model_spec: Any, threads: int) -> None:
+    """Pin torch to this worker's share of the cores and load the model."""
+    global _worker_model
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    if isinstance(model_spec, str):
+        model_spec = EncoderSpec(model_spec)
+    if isinstance(model_spec, EncoderSpec):
+        model_spec = model_spec.load()
+    _worker_model = model_spec
+
+
+def _encode_in_worker(texts: List[str]) -> np.ndarray:
+    return np.asarray(
+        _worker_model.encode(texts, batch_size=len(texts), show_progress_bar=False),
+        dtype=np.float32
+    )
+
+
+class EmbeddingEngine:
+    """Encodes chunk texts in length-sorted batches into one preallocated array.
+
+    Sorting by length keeps texts of similar size in the same batch, so
+    little compute is spent on padding. With ``workers`` > 1 the batches
+    are spread over a pool of CPU processes, each with its own model copy
+    and ``cpu_count // workers`` torch threads; the pool is started on
+    first use and kept for later calls.
+    """
+
+    def __init__(
+        self,
+        load_model: Callable[[], Any],
+        batch_size: int = 32,
+        workers: int = 0,
+        worker_model: Any = None
+    ):
+        """
+        Args:
+            load_model: Returns the in-process encoder; only called when
+                encoding without workers
+            batch_size: Texts per encode call
+            workers: Worker processes; 0 or 1 encodes in-process
+            worker_model: EncoderSpec, model name or picklable encoder for each worker
+        """
+        self.load_model = load_model
+        self.batch_size = max(1, batch_size)
+        self.workers = workers if workers > 1 and worker_model is not None else 0
+        self.worker_model = worker_model
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.last_stats: Dict[str, Any] = {}
+
+    def _batches(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """Row indices of each batch, shortest texts first."""
+        # Whitespace word count is a cheap stand-in for token count
+        lengths = np.fromiter((len(t.split()) for t in texts), dtype=np.int64, count=len(texts))
+        order = np.argsort(lengths, kind='stable')
+        return [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            # spawn: forking a process that already runs torch threads can deadlock
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.worker_model, threads)
+            )
+        return self._pool
+
+    @traced("embedding.encode")
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Encode texts into a float32 array whose rows follow the input order.
+
+        Throughput is recorded in ``last_stats``.
+        """
+        start = time.perf_counter()
+        batches = self._batches(texts)
+        batch_texts = [[texts[i] for i in rows] for rows in batches]
+
+        if self.workers and len(batches) > 1:
+            encoded = self._get_pool().map(_encode_in_worker, batch_texts)
+            mode = f"{self.workers} workers"
+        else:
+            model = self.load_model()
+            encoded = (
+                model.encode(batch, batch_size=len(batch), show_progress_bar=False)
+                for batch in batch_texts
+            )
+            mode = "in-process"
+
+        out: Optional[np.ndarray] = None
+        for rows, vectors in zip(batches, encoded):
+            vectors = np.asarray(vectors, dtype=np.float32)
+            if out is None:
+                out = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            out[rows] = vectors
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            'chunks': len(texts),
+            'seconds': elapsed,
+            'chunks_per_sec': len(texts) / elapsed if elapsed > 0 else 0.0,
+            'batch_size': self.batch_size,
+            'mode': mode
+        }
+        return out if out is not None else np.empty((0, 0), dtype=np.float32)
+
+    def report(self) -> str:
+        """One-line throughput summary of the last encode() call."""
+        stats = self.last_stats
+        if not stats:
+            return "No chunks embedded yet"
+        return (f"⚡ Embedded {stats['chunks']} chunks in {stats['seconds']:.2f}s "
+                f"({stats['chunks_per_sec']:.1f} chunks/sec, batch {stats['batch_size']}, "
+                f"{stats['mode']})")
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
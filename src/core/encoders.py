@@ -0,0 +1,205 @@
+"""Sentence encoder backends: PyTorch, dynamically quantized PyTorch and ONNX Runtime."""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from .scoring import normalize_rows
+
+
+ENCODER_BACKENDS = ("torch", "torch-int8", "onnx")
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_FILE = "model.int8.onnx"
+ONNX_INFO_FILE = "encoder.json"
+
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Average token vectors over the unpadded positions (sentence-transformers pooling)."""
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (token_embeddings * mask).sum(axis=1)
+    return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+class OnnxEncoder:
+    """Runs an exported transformer with ONNX Runtime on CPU.
+
+    Mirrors ``SentenceTransformer.encode`` for mean-pooled models such as
+    all-MiniLM-L6-v2, without importing torch. The tokenizer is read from
+    the directory holding the ``.onnx`` file unless given explicitly.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        tokenizer_path: Optional[str] = None,
+        max_seq_length: Optional[int] = None,
+        threads: int = 0
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = Path(model_path)
+        if not model_path.exists():
+            raise FileNotFoundError(f"ONNX model not found: {model_path}")
+
+        info_path = model_path.parent / ONNX_INFO_FILE
+        info = json.loads(info_path.read_text()) if info_path.exists() else {}
+        self.max_seq_length = max_seq_length or info.get('max_seq_length', 256)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(str(tokenizer_path or model_path.parent))
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        **kwargs: Any
+    ) -> np.ndarray:
+        """Encode texts into L2-normalized float32 rows."""
+        texts = list(texts)
+        out: Optional[np.ndarray] = None
+
+        for i in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feed = {
+                name: value.astype(np.int64)
+                for name, value in encoded.items() if name in self.input_names
+            }
+            token_embeddings = self.session.run(None, feed)[0]
+            pooled = mean_pool(token_embeddings, encoded['attention_mask'])
+            if out is None:
+                out = np.empty((len(texts), pooled.shape[1]), dtype=np.float32)
+            out[i:i + len(pooled)] = pooled
+
+        if out is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return normalize_rows(out)
+
+
+@dataclass(frozen=True)
+class EncoderSpec:
+    """Which encoder to load; picklable so worker processes can load their own."""
+    model_name: str = "all-MiniLM-L6-v2"
+    backend: str = "torch"
+    onnx_path: Optional[str] = None
+
+    def __post_init__(self):
+        if self.backend not in ENCODER_BACKENDS:
+            raise ValueError(
+                f"Unknown encoder backend {self.backend!r}; expected one of {ENCODER_BACKENDS}"
+            )
+        if self.backend == "onnx" and not self.onnx_path:
+            raise ValueError("The onnx backend needs an ONNX model path (YSS_ONNX_MODEL)")
+
+    @property
+    def cache_id(self) -> str:
+        """
+        Model identity used by the embedding and query caches.
+
+        Quantized or exported models produce slightly different vectors, so
+        each backend gets its own cache entries. An ONNX model is also
+        identified by the size and mtime of its file, so re-exporting or
+        re-quantizing it in place does not reuse the old model's vectors.
+        """
+        if self.backend == "torch":
+            return self.model_name
+        if self.backend == "onnx":
+            path = Path(self.onnx_path).resolve()
+            try:
+                stat = path.stat()
+                signature = f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+            except OSError:
+                signature = str(path)
+            digest = hashlib.sha256(signature.encode('utf-8')).hexdigest()[:12]
+            return f"{self.model_name}+onnx-{path.stem}-{digest}"
+        return f"{self.model_name}+{self.backend}"
+
+    def load(self) -> Any:
+        """Load the encoder; heavy imports happen here, not at module import."""
+        if self.backend == "onnx":
+            return OnnxEncoder(self.onnx_path)
+
+        from sentence_transformers import SentenceTransformer
+        if self.backend == "torch":
+            return SentenceTransformer(self.model_name)
+
+        import torch
+        model = SentenceTransformer(self.model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+
+
+def export_onnx(model_name: str, output_dir: str, quantize: bool = True) -> List[Path]:
+    """
+    Export a sentence-transformers model to ONNX for the ``onnx`` backend.
+
+    Args:
+        model_name: Sentence transformer to export
+        output_dir: Directory for the model, tokenizer and encoder.json
+        quantize: Also write a dynamically int8-quantized copy
+
+    Returns:
+        Paths of the written ONNX files
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model
+    transformer.config.return_dict = False
+    transformer.eval()
+    model.tokenizer.save_pretrained(str(output_dir))
+
+    sample = model.tokenizer(["export sample"], return_tensors="pt")
+    input_names = [
+        name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample
+    ]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    model_path = output_dir / ONNX_MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            str(model_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+
+    (output_dir / ONNX_INFO_FILE).write_text(json.dumps({
+        'model_name': model_name,
+        'max_seq_length': model.max_seq_length
+    }))
+
+    paths = [model_path]
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        int8_path = output_dir / ONNX_INT8_FILE
+        quantize_dynamic(str(model_path), str(int8_path), weight_type=QuantType.QInt8)
+        paths.append(int8_path)
+    return paths
@@ -1,10 +1,107 @@
 """YouTube subtitle extraction functionality."""
 
+import asyncio
 import os
 import re
 import subprocess
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..utils.profiling import span, traced
+from .processor import CaptionMerger
+
+
+TIMESTAMP = r'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})'
+CUE_TIMING_RE = re.compile(rf'^\s*{TIMESTAMP}\s+-->\s+{TIMESTAMP}')
+NUMERIC_LINE_RE = re.compile(r'^[\d:.,\s\->]+$')
+TAG_RE = re.compile(r'<[^>]+>')
+BRACES_RE = re.compile(r'\{[^}]+\}')
+
+
+class Cue(NamedTuple):
+    """One subtitle line with the time range of the cue it belongs to."""
+    start: float
+    end: float
+    text: str
+
+
+def _seconds(hours: Optional[str], minutes: str, seconds: str, millis: str) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def iter_vtt_cues(vtt_file: Path) -> Iterator[Cue]:
+    """
+    Stream cleaned subtitle lines from a VTT file in a single pass.
+    
+    Only text inside cues is emitted, so headers, NOTE and STYLE blocks are
+    dropped without special-casing them. Memory use is constant in the
+    file length.
+    """
+    start = end = None
+    
+    with open(vtt_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            
+            if not line:
+                # Blank line ends the current cue
+                start = end = None
+                continue
+            
+            timing = CUE_TIMING_RE.match(line)
+            if timing:
+                groups = timing.groups()
+                start, end = _seconds(*groups[:4]), _seconds(*groups[4:])
+                continue
+            
+            # Skip text outside cues, positioning-only lines and bare numbers
+            if start is None or line.startswith('<') or NUMERIC_LINE_RE.match(line):
+                continue
+            
+            # Remove HTML tags and positioning attributes
+            line = BRACES_RE.sub('', TAG_RE.sub('', line))
+            
+            # Clean up extra whitespace
+            line = ' '.join(line.split())
+            
+            if len(line) > 2:  # Only keep substantial lines
+                yield Cue(start, end, line)
+
+
+def timings_path(text_file: Path) -> Path:
+    """Sidecar file holding per-line cue times for an extracted transcript."""
+    return Path(text_file).with_suffix('.timings.tsv')
+
+
+def load_timings(text_file: Path) -> Tuple[Optional[str], Dict[int, Tuple[float, float]], bool]:
+    """
+    Read the timing sidecar of a transcript.
+    
+    Returns:
+        Tuple of (video URL or None, mapping of text-file line number to
+        (start, end) seconds, whether rolling captions were already merged
+        at extraction); empty if the transcript has no sidecar
+    """
+    path = timings_path(text_file)
+    video_url = None
+    line_times: Dict[int, Tuple[float, float]] = {}
+    merged = False
+    
+    if not path.exists():
+        return video_url, line_times, merged
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in f:
+            if row.startswith('# url='):
+                video_url = row[len('# url='):].strip() or None
+                continue
+            if row.startswith('# merged='):
+                merged = row[len('# merged='):].strip() == '1'
+                continue
+            line_no, start, end = row.split('\t')
+            line_times[int(line_no)] = (float(start), float(end))
+    
+    return video_url, line_times, merged
 
 
 class YouTubeExtractor:
@@ -15,6 +112,7 @@ class YouTubeExtractor:
         self.extractions_dir = self.base_output_dir / "extractions"
         self.extractions_dir.mkdir(exist_ok=True)
     
+    @traced("extractor.extract_subtitles")
     def extract_subtitles(
         self, 
         url: str, 
@@ -38,102 +136,170 @@ class YouTubeExtractor:
         try:
             # Get video info to generate filename if not provided
             if not output_name:
-                info_cmd = [
-                    "yt-dlp", 
-                    "--get-title", 
-                    "--get-id", 
-                    url
-                ]
-                result = subprocess.run(info_cmd, capture_output=True, text=True, check=True)
-                lines = result.stdout.strip().split('\n')
-                title = lines[0] if lines else "video"
-                video_id = lines[1] if len(lines) > 1 else "unknown"
-                
-                # Clean title for filename
-                clean_title = re.sub(r'[^\w\s-]', '', title)
-                clean_title = re.sub(r'[-\s]+', '_', clean_title)
-                output_name = f"{clean_title}_{video_id}"
+                with span("extractor.yt_dlp_info"):
+                    result = subprocess.run(
+                        self._info_command(url), capture_output=True, text=True, check=True
+                    )
+                output_name = self._output_name(result.stdout)
             
-            # Create subdirectory for this extraction
-            self.output_dir = self.extractions_dir / output_name
-            self.output_dir.mkdir(exist_ok=True)
-            
-            vtt_file = self.output_dir / f"{output_name}.{language}.vtt"
+            output_dir, vtt_file = self._prepare_output(output_name, language)
             
             # Extract subtitles using yt-dlp
-            cmd = [
-                "yt-dlp",
-                "--write-subs",
-                "--write-auto-subs", 
-                "--sub-langs", language,
-                "--skip-download",
-                "--output", str(self.output_dir / f"{output_name}.%(ext)s"),
-                url
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            
-            if not vtt_file.exists():
-                raise RuntimeError(f"Subtitle extraction failed. VTT file not found: {vtt_file}")
-            
-            # Convert to clean text
-            text_file = self._vtt_to_text(vtt_file)
+            cmd = self._subtitle_command(url, language, output_dir, output_name)
+            with span("extractor.yt_dlp_download"):
+                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             
-            print(f"✅ Subtitles extracted: {text_file}")
-            return str(vtt_file), str(text_file)
+            return self._finish(vtt_file, url)
             
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"yt-dlp failed: {e.stderr}")
         except Exception as e:
             raise RuntimeError(f"Extraction failed: {str(e)}")
     
-    def _vtt_to_text(self, vtt_file: Path) -> Path:
-        """Convert VTT subtitle file to clean text."""
-        text_file = vtt_file.with_suffix('.txt')
-        
-        with open(vtt_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Remove VTT headers and metadata
-        lines = content.split('\n')
-        text_lines = []
+    async def extract_subtitles_async(
+        self, 
+        url: str, 
+        language: str = "en",
+        output_name: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Extract subtitles with asyncio subprocesses.
         
-        for line in lines:
-            line = line.strip()
-            
-            # Skip VTT headers, timestamps, and positioning
-            if (line.startswith('WEBVTT') or 
-                line.startswith('NOTE') or
-                '-->' in line or
-                line.startswith('<') or
-                re.match(r'^\d+$', line) or
-                re.match(r'^[\d:.,\s\-\>]+$', line) or
-                not line):
-                continue
+        Same contract as extract_subtitles(), but yields to the event loop
+        while yt-dlp runs so other pipeline stages can make progress.
+        """
+        try:
+            if not output_name:
+                output_name = self._output_name(await self._run_async(self._info_command(url)))
             
-            # Remove HTML tags and positioning attributes
-            line = re.sub(r'<[^>]+>', '', line)
-            line = re.sub(r'\{[^}]+\}', '', line)
+            output_dir, vtt_file = self._prepare_output(output_name, language)
+            await self._run_async(self._subtitle_command(url, language, output_dir, output_name))
             
-            # Clean up extra whitespace
-            line = ' '.join(line.split())
+            # VTT conversion is a quick streaming pass; keep it off the loop anyway
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._finish, vtt_file, url
+            )
             
-            if line and len(line) > 2:  # Only keep substantial lines
-                text_lines.append(line)
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Extraction failed: {str(e)}")
+    
+    @staticmethod
+    async def _run_async(cmd: List[str]) -> str:
+        """Run a command without blocking the event loop and return its stdout."""
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"yt-dlp failed: {stderr.decode('utf-8', 'replace')}")
+        return stdout.decode('utf-8', 'replace')
+    
+    @staticmethod
+    def _info_command(url: str) -> List[str]:
+        return [
+            "yt-dlp", 
+            "--get-title", 
+            "--get-id", 
+            url
+        ]
+    
+    @staticmethod
+    def _output_name(info_stdout: str) -> str:
+        """Build "<clean title>_<video id>" from yt-dlp --get-title --get-id output."""
+        lines = info_stdout.strip().split('\n')
+        title = lines[0] if lines else "video"
+        video_id = lines[1] if len(lines) > 1 else "unknown"
         
-        # Remove consecutive duplicates (common in auto-generated subtitles)
-        clean_lines = []
-        prev_line = ""
-        for line in text_lines:
-            if line != prev_line:
-                clean_lines.append(line)
-                prev_line = line
+        # Clean title for filename
+        clean_title = re.sub(r'[^\w\s-]', '', title)
+        clean_title = re.sub(r'[-\s]+', '_', clean_title)
+        return f"{clean_title}_{video_id}"
+    
+    def _prepare_output(self, output_name: str, language: str) -> Tuple[Path, Path]:
+        """Create the extraction folder and return it with the expected VTT path."""
+        # Local, so concurrent extractions through one extractor don't clobber each other
+        output_dir = self.extractions_dir / output_name
+        output_dir.mkdir(exist_ok=True)
+        return output_dir, output_dir / f"{output_name}.{language}.vtt"
+    
+    @staticmethod
+    def _subtitle_command(url: str, language: str, output_dir: Path, output_name: str) -> List[str]:
+        return [
+            "yt-dlp",
+            "--write-subs",
+            "--write-auto-subs", 
+            "--sub-langs", language,
+            "--skip-download",
+            "--output", str(output_dir / f"{output_name}.%(ext)s"),
+            url
+        ]
+    
+    def _finish(self, vtt_file: Path, url: str) -> Tuple[str, str]:
+        """Check the download and convert it to clean text."""
+        if not vtt_file.exists():
+            raise RuntimeError(f"Subtitle extraction failed. VTT file not found: {vtt_file}")
         
-        # Join and save
-        clean_text = '\n'.join(clean_lines)
+        # Convert to clean text
+        text_file = self._vtt_to_text(vtt_file, url)
+        
+        print(f"✅ Subtitles extracted: {text_file}")
+        return str(vtt_file), str(text_file)
+    
+    def list_videos(self, url: str) -> List[str]:
+        """
+        List video IDs behind a playlist, channel or single video URL.
         
-        with open(text_file, 'w', encoding='utf-8') as f:
-            f.write(f"**Transcript extracted from YouTube video**\n\n")
-            f.write(clean_text)
+        Raises:
+            RuntimeError: If yt-dlp cannot resolve the URL
+        """
+        cmd = [
+            "yt-dlp",
+            "--flat-playlist",
+            "--print", "id",
+            url
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"yt-dlp failed: {e.stderr}")
+        
+        return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+    
+    @traced("extractor.vtt_to_text")
+    def _vtt_to_text(self, vtt_file: Path, video_url: Optional[str] = None) -> Path:
+        """
+        Convert VTT subtitle file to clean text.
+        
+        Also writes a ``.timings.tsv`` sidecar mapping each text line to the
+        start/end of its cue, so search results can link into the video.
+        Text repeated by rolling auto-captions is dropped (see CaptionMerger)
+        and the sidecar is marked ``# merged=1`` so it is not merged again.
+        """
+        text_file = vtt_file.with_suffix('.txt')
+        header = "**Transcript extracted from YouTube video**\n\n"
+        line_no = header.count('\n')
+        first = True
+        merger = CaptionMerger()
+        
+        with open(text_file, 'w', encoding='utf-8') as out, \
+             open(timings_path(text_file), 'w', encoding='utf-8') as times:
+            out.write(header)
+            times.write(f"# url={video_url or ''}\n")
+            times.write("# merged=1\n")
+            
+            for cue in iter_vtt_cues(vtt_file):
+                # Keep only what the cue adds to the lines before it
+                text = merger.merge(cue.text)
+                if not text:
+                    continue
+                
+                out.write(text if first else "\n" + text)
+                times.write(f"{line_no}\t{cue.start:.3f}\t{cue.end:.3f}\n")
+                line_no += 1
+                first = False
         
-        return text_file
\ No newline at end of file
+        if merger.words_removed:
+            print(f"🧹 {merger.report()}")
+        return text_file
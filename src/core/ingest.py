@@ -0,0 +1,222 @@
+"""Bulk subtitle ingestion for playlists, channels and URL lists."""
+
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+from .extractor import YouTubeExtractor
+
+
+VIDEO_URL = "https://www.youtube.com/watch?v={}"
+
+
+class IngestManifest:
+    """Append-only JSONL record of completed video IDs, used to resume."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.completed: Set[str] = set()
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self.completed.add(json.loads(line)['id'])
+                    except (ValueError, KeyError):
+                        continue  # tolerate a torn last line
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self.completed
+
+    def record(self, video_id: str, text_file: str) -> None:
+        """Mark a video as done."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'id': video_id, 'text_file': text_file}) + "\n")
+            self.completed.add(video_id)
+
+
+def read_sources(sources: Iterable[str]) -> List[str]:
+    """Expand file arguments into the URLs they list (one per line, # comments)."""
+    urls = []
+    for source in sources:
+        path = Path(source)
+        if path.is_file():
+            with open(path, 'r', encoding='utf-8') as f:
+                urls.extend(
+                    line.strip() for line in f
+                    if line.strip() and not line.lstrip().startswith('#')
+                )
+        else:
+            urls.append(source)
+    return urls
+
+
+class Ingestor:
+    """Runs subtitle extraction for many videos through a bounded worker pool.
+
+    yt-dlp spends most of its time waiting on the network, so threads are
+    enough to overlap many extractions.
+    """
+
+    def __init__(
+        self,
+        extractor: YouTubeExtractor,
+        manifest: IngestManifest,
+        concurrency: int = 4,
+        retries: int = 3,
+        backoff: float = 2.0,
+        language: str = "en"
+    ):
+        self.extractor = extractor
+        self.manifest = manifest
+        self.concurrency = max(1, concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.language = language
+
+    def resolve(self, urls: Iterable[str]) -> List[str]:
+        """Expand playlist/channel URLs into unique video IDs, in order."""
+        video_ids: List[str] = []
+        for url in urls:
+            try:
+                video_ids.extend(self.extractor.list_videos(url))
+            except RuntimeError as e:
+                print(f"⚠️  Could not list {url}: {e}")
+        return list(dict.fromkeys(video_ids))
+
+    def _extract_with_retry(self, video_id: str) -> str:
+        """Extract one video, retrying with exponential backoff and jitter."""
+        for attempt in range(self.retries + 1):
+            try:
+                _, text_file = self.extractor.extract_subtitles(
+                    VIDEO_URL.format(video_id), self.language
+                )
+                return text_file
+            except RuntimeError:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+        raise AssertionError("unreachable")
+
+    def run(self, video_ids: List[str]) -> Dict[str, Any]:
+        """
+        Extract every video not already in the manifest.
+
+        Returns:
+            Summary with lists of completed, skipped and failed video IDs
+        """
+        pending = [v for v in video_ids if v not in self.manifest]
+        skipped = len(video_ids) - len(pending)
+        if skipped:
+            print(f"⏭️  Skipping {skipped} videos already in {self.manifest.path}")
+
+        completed: List[str] = []
+        failed: List[Tuple[str, str]] = []
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(self._extract_with_retry, v): v for v in pending}
+            for done, future in enumerate(as_completed(futures), 1):
+                video_id = futures[future]
+                try:
+                    text_file = future.result()
+                    self.manifest.record(video_id, text_file)
+                    completed.append(video_id)
+                    print(f"[{done}/{len(pending)}] ✅ {video_id} → {text_file}")
+                except Exception as e:
+                    failed.append((video_id, str(e)))
+                    print(f"[{done}/{len(pending)}] ❌ {video_id}: {e}")
+
+        elapsed = time.perf_counter() - start
+        return {
+            'completed': completed,
+            'skipped': skipped,
+            'failed': failed,
+            'elapsed': elapsed
+        }
+
+    def run_embedded(self, video_ids: List[str], searcher: Any) -> Dict[str, Any]:
+        """
+        Extract and embed every video not already in the manifest.
+
+        Extraction of later videos overlaps with embedding of earlier ones;
+        a video is only recorded once its embeddings are cached.
+        """
+        from .pipeline import IngestPipeline
+
+        pending = [v for v in video_ids if v not in self.manifest]
+        skipped = len(video_ids) - len(pending)
+        if skipped:
+            print(f"⏭️  Skipping {skipped} videos already in {self.manifest.path}")
+
+        urls = {VIDEO_URL.format(v): v for v in pending}
+        done = 0
+
+        def on_embedded(url: str, text_file: str) -> None:
+            nonlocal done
+            done += 1
+            self.manifest.record(urls[url], text_file)
+            print(f"[{done}/{len(pending)}] ✅ {urls[url]} → {text_file}")
+
+        pipeline = IngestPipeline(
+            self.extractor,
+            searcher,
+            language=self.language,
+            concurrency=self.concurrency,
+            retries=self.retries,
+            backoff=self.backoff,
+            on_embedded=on_embedded
+        )
+
+        start = time.perf_counter()
+        statuses = pipeline.run([(url, None) for url in urls])
+        elapsed = time.perf_counter() - start
+
+        failed = [(urls[s['url']], s['error']) for s in statuses if 'error' in s]
+        for video_id, error in failed:
+            print(f"❌ {video_id}: {error}")
+
+        return {
+            'completed': [urls[s['url']] for s in statuses if 'error' not in s],
+            'skipped': skipped,
+            'failed': failed,
+            'elapsed': elapsed
+        }
+
+
+def default_manifest_path(output_dir: str) -> Path:
+    """Manifest location alongside the extractions."""
+    return Path(output_dir) / "extractions" / "ingest_manifest.jsonl"
+
+
+def ingest(
+    sources: Iterable[str],
+    output_dir: str = ".",
+    language: str = "en",
+    concurrency: int = 4,
+    retries: int = 3,
+    manifest_path: Optional[str] = None,
+    searcher: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Resolve sources and extract every video they contain.
+
+    When a searcher is given, each transcript is also chunked and embedded
+    into its cache, overlapping with the remaining downloads.
+    """
+    extractor = YouTubeExtractor(output_dir)
+    manifest = IngestManifest(Path(manifest_path) if manifest_path else default_manifest_path(output_dir))
+    ingestor = Ingestor(extractor, manifest, concurrency, retries, language=language)
+
+    video_ids = ingestor.resolve(read_sources(sources))
+    print(f"📋 Found {len(video_ids)} videos")
+    if searcher is not None:
+        return ingestor.run_embedded(video_ids, searcher)
+    return ingestor.run(video_ids)
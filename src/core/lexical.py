@@ -0,0 +1,165 @@
+"""BM25 inverted index and reciprocal-rank fusion."""
+
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .scoring import top_k
+
+
+LEXICAL_FILE = "lexical.npz"
+TOKEN_RE = re.compile(r"\w+")
+
+# Standard RRF damping constant (Cormack et al.)
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; numbers and names are kept whole."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of documents, stored as CSR postings.
+
+    ``postings_docs[offsets[t]:offsets[t + 1]]`` are the documents that
+    contain term ``t`` and ``postings_tf`` the matching term frequencies.
+    Scoring touches only the postings of the query terms.
+    """
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        offsets: np.ndarray,
+        postings_docs: np.ndarray,
+        postings_tf: np.ndarray,
+        doc_lengths: np.ndarray,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.vocab: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.offsets = offsets
+        self.postings_docs = postings_docs
+        self.postings_tf = postings_tf
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+
+        n_docs = len(doc_lengths)
+        doc_freq = np.diff(offsets).astype(np.float32)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        avg_length = float(doc_lengths.mean()) if n_docs else 0.0
+        # Per-document length normalization, precomputed once
+        self._norms = (k1 * (1 - b + b * doc_lengths / max(avg_length, 1e-9))).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> "BM25Index":
+        """Index documents in one pass, in O(total tokens)."""
+        vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        freqs: List[int] = []
+        doc_lengths: List[int] = []
+
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(doc_id)
+                freqs.append(tf)
+
+        term_array = np.asarray(term_ids, dtype=np.int64)
+        # Stable sort keeps documents ascending within each term's postings
+        order = np.argsort(term_array, kind='stable')
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_array, minlength=len(vocab)), out=offsets[1:])
+
+        return cls(
+            list(vocab),
+            offsets,
+            np.asarray(doc_ids, dtype=np.int32)[order],
+            np.asarray(freqs, dtype=np.float32)[order],
+            np.asarray(doc_lengths, dtype=np.float32)
+        )
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for a query (zero where no term matches)."""
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = self.postings_docs[start:end]
+            tf = self.postings_tf[start:end]
+            scores[docs] += self.idf[term_id] * tf * (self.k1 + 1) / (tf + self._norms[docs])
+        return scores
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k matching documents and their scores, best first."""
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores)
+        best = matched[top_k(scores[matched], k)]
+        return best, scores[best]
+
+    def save(self, path: Path) -> None:
+        """Write the index as one uncompressed .npz (no pickles), replacing any old file atomically."""
+        path = Path(path)
+        terms = np.array(sorted(self.vocab, key=self.vocab.get), dtype=str)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    terms=terms,
+                    offsets=self.offsets,
+                    postings_docs=self.postings_docs,
+                    postings_tf=self.postings_tf,
+                    doc_lengths=self.doc_lengths
+                )
+            os.replace(temp_path, path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BM25Index"]:
+        """Read an index written by save(), or None if missing or unreadable."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(
+                    data['terms'].tolist(),
+                    data['offsets'],
+                    data['postings_docs'],
+                    data['postings_tf'],
+                    data['doc_lengths']
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fuse several best-first rankings with RRF.
+
+    Returns:
+        Tuple of (top-k ids, fused scores), best first
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking):
+            fused[int(doc)] = fused.get(int(doc), 0.0) + 1.0 / (RRF_K + rank + 1)
+
+    ids = np.fromiter(fused, dtype=np.int64, count=len(fused))
+    scores = np.fromiter(fused.values(), dtype=np.float32, count=len(fused))
+    best = top_k(scores, k)
+    return ids[best], scores[best]
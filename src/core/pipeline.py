@@ -0,0 +1,117 @@
+"""Overlapped extract → chunk → embed pipeline."""
+
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple
+
+from .extractor import YouTubeExtractor
+
+
+class IngestPipeline:
+    """Runs extraction and embedding as concurrent stages.
+
+    yt-dlp runs as asyncio subprocesses (up to ``concurrency`` at a time)
+    while a single worker thread loads the model and then chunks and embeds
+    each finished transcript. A bounded queue between the stages applies
+    backpressure, so video N+1 downloads while video N is embedded and
+    wall-clock time approaches that of the slowest stage.
+    """
+
+    def __init__(
+        self,
+        extractor: YouTubeExtractor,
+        searcher: Any,
+        language: str = "en",
+        concurrency: int = 2,
+        queue_size: int = 2,
+        retries: int = 0,
+        backoff: float = 2.0,
+        on_embedded: Optional[Callable[[str, str], None]] = None
+    ):
+        self.extractor = extractor
+        self.searcher = searcher
+        self.language = language
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(1, queue_size)
+        self.retries = retries
+        self.backoff = backoff
+        self.on_embedded = on_embedded
+
+    def run(self, jobs: Sequence[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """
+        Extract and embed every (url, output name) job.
+
+        Returns:
+            One status dict per job, in job order, with ``text_file`` and
+            ``chunks`` on success or ``error`` on failure
+        """
+        return asyncio.run(self._run(list(jobs)))
+
+    async def _extract_with_retry(self, url: str, output_name: Optional[str]) -> str:
+        """Extract one video, retrying with exponential backoff and jitter."""
+        for attempt in range(self.retries + 1):
+            try:
+                _, text_file = await self.extractor.extract_subtitles_async(
+                    url, self.language, output_name
+                )
+                return text_file
+            except RuntimeError:
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+        raise AssertionError("unreachable")
+
+    async def _run(self, jobs: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="yss-encode")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        slots = asyncio.Semaphore(self.concurrency)
+        results: Dict[int, Dict[str, Any]] = {}
+
+        # Start loading the model while yt-dlp is still downloading
+        model_ready = loop.run_in_executor(encoder, lambda: self.searcher.model)
+
+        async def extract(index: int, url: str, output_name: Optional[str]) -> None:
+            async with slots:
+                try:
+                    text_file = await self._extract_with_retry(url, output_name)
+                except RuntimeError as e:
+                    results[index] = {'url': url, 'error': str(e)}
+                    return
+                # Waits here when the embed stage is behind
+                await queue.put((index, url, text_file))
+
+        async def embed() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                index, url, text_file = item
+                try:
+                    await model_ready
+                    await loop.run_in_executor(encoder, self.searcher.load_transcript, text_file)
+                    results[index] = {
+                        'url': url,
+                        'text_file': text_file,
+                        'chunks': len(self.searcher.chunks)
+                    }
+                    if self.on_embedded:
+                        self.on_embedded(url, text_file)
+                except Exception as e:
+                    results[index] = {'url': url, 'text_file': text_file, 'error': str(e)}
+
+        consumer = asyncio.create_task(embed())
+        try:
+            await asyncio.gather(*(
+                extract(index, url, output_name)
+                for index, (url, output_name) in enumerate(jobs)
+            ))
+            await queue.put(None)
+            await consumer
+        finally:
+            # Model errors were already reported per job; just retrieve them
+            model_ready.add_done_callback(lambda f: f.cancelled() or f.exception())
+            encoder.shutdown(wait=False)
+
+        return [results[index] for index in range(len(jobs))]
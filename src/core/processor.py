@@ -1,33 +1,191 @@
 """Text processing and formatting utilities."""
 
 import re
+import string
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Tuple
+
+from ..utils.profiling import traced
+from .chunk_table import DEFAULT_SPEAKER, ChunkTable, ChunkTableBuilder
+
+
+# Bump whenever chunking output changes so cached entries are rebuilt
+CHUNKER_VERSION = 5
+
+# Runs of text between sentence terminators
+SENTENCE_RE = re.compile(r'[^.!?]+')
+
+# Speaker turns: "**Name:** ...", "Name: ..." / "JOHN SMITH: ..." and the
+# ">>" marker YouTube captions use for a change of speaker. A mixed-case
+# "Name:" only counts in transcripts that are speaker-labeled (see
+# _labels_speakers()), so "Note: ..." in plain prose is not a turn.
+BOLD_SPEAKER_RE = re.compile(r'^\*\*([^*\n]{1,40}?):\*\*\s*')
+LABEL_SPEAKER_RE = re.compile(r"^([A-Z][\w.'-]*(?: [A-Z][\w.'-]*){0,2}):\s+")
+CAPTION_SPEAKER_RE = re.compile(r'^>>\s*')
+
+WORD_PIECE_RE = re.compile(r'\w+|[^\w\s]')
+
+# Content tokens per chunk when the encoder does not say (MiniLM: 256 incl. specials)
+DEFAULT_MAX_TOKENS = 254
+
+# Chunks shorter than this carry too little meaning to index
+MIN_CHUNK_CHARS = 20
+
+# Rolling captions: words a cue must repeat before they count as a repeat,
+# and how many recent words a new cue is matched against
+MIN_CAPTION_OVERLAP = 2
+CAPTION_TAIL_WORDS = 32
+
+# Words per shingle for near-duplicate chunk detection
+SHINGLE_WORDS = 5
+
+
+def estimate_token_lengths(words: List[str]) -> List[int]:
+    """
+    Approximate WordPiece token counts without loading a tokenizer.
+    
+    Punctuation counts separately and long words are assumed to split
+    into several pieces, which errs on the side of more tokens.
+    """
+    lengths = []
+    for word in words:
+        pieces = WORD_PIECE_RE.findall(word)
+        lengths.append(max(1, sum(1 + (len(p) - 1) // 6 for p in pieces)))
+    return lengths
+
+
+def _labels_speakers(lines: List[str]) -> bool:
+    """
+    Whether mixed-case ``Name:`` prefixes in these lines mark speaker turns.
+    
+    True when the transcript uses bold speaker labels, or when at least two
+    different names each label two or more lines (a dialogue). A heading
+    such as "Chapter One:" or a one-off "Note:" does neither.
+    """
+    counts: Dict[str, int] = {}
+    for line in lines:
+        line = line.strip()
+        if BOLD_SPEAKER_RE.match(line):
+            return True
+        label = LABEL_SPEAKER_RE.match(line)
+        if label:
+            counts[label.group(1)] = counts.get(label.group(1), 0) + 1
+    return sum(1 for n in counts.values() if n >= 2) >= 2
+
+
+def _word_key(word: str) -> str:
+    """Comparison form of a caption word: case and surrounding punctuation ignored."""
+    return word.strip(string.punctuation).casefold() or word
+
+
+def _repeated_prefix(tail: List[str], keys: List[str]) -> int:
+    """
+    Number of leading ``keys`` that the end of ``tail`` already says.
+    
+    This is the longest prefix of ``keys`` that is a suffix of ``tail``, or
+    all of ``keys`` when they occur anywhere in ``tail``. One KMP pass,
+    linear in ``len(tail) + len(keys)``.
+    """
+    if not tail or not keys:
+        return 0
+    fail = [0] * len(keys)
+    k = 0
+    for i in range(1, len(keys)):
+        while k and keys[i] != keys[k]:
+            k = fail[k - 1]
+        if keys[i] == keys[k]:
+            k += 1
+        fail[i] = k
+    k = 0
+    for key in tail:
+        while k and key != keys[k]:
+            k = fail[k - 1]
+        if key == keys[k]:
+            k += 1
+            if k == len(keys):
+                return k
+    return k
+
+
+class CaptionMerger:
+    """Drops the text that rolling auto-captions repeat from cue to cue.
+    
+    YouTube auto-captions show each line two or three times as the window
+    scrolls, often with a word or two added. Each line passed to merge()
+    is matched against the last CAPTION_TAIL_WORDS words kept so far: a
+    line already contained in them is dropped, and a leading part that
+    repeats their end is cut, as long as at least ``min_overlap`` words
+    repeat (an exact repeat of the previous line is always dropped). Work
+    per line is bounded, so merging is linear in the transcript.
+    
+    Args:
+        min_overlap: Fewest repeated words that are treated as a repeat
+    """
+    
+    def __init__(self, min_overlap: int = MIN_CAPTION_OVERLAP):
+        self.min_overlap = min_overlap
+        self.words_in = 0
+        self.words_out = 0
+        self._tail: List[str] = []
+        self._previous: List[str] = []
+    
+    def merge(self, line: str) -> str:
+        """The part of ``line`` not already said by the previous lines ("" if none)."""
+        words = line.split()
+        keys = [_word_key(w) for w in words]
+        skip = _repeated_prefix(self._tail, keys)
+        if keys == self._previous:
+            skip = len(keys)
+        elif skip < self.min_overlap:
+            skip = 0
+        self._previous = keys
+        
+        self.words_in += len(words)
+        self.words_out += len(words) - skip
+        self._tail = (self._tail + keys[skip:])[-CAPTION_TAIL_WORDS:]
+        return ' '.join(words[skip:])
+    
+    @property
+    def words_removed(self) -> int:
+        return self.words_in - self.words_out
+    
+    def report(self) -> str:
+        """One-line summary of the text removed so far."""
+        share = self.words_removed / self.words_in if self.words_in else 0.0
+        return (f"Removed {self.words_removed:,} of {self.words_in:,} caption words "
+                f"({share:.0%}) repeated by rolling captions")
 
 
 class TextProcessor:
     """Handles text cleaning and formatting for transcripts."""
     
     @staticmethod
-    def clean_transcript(input_file: Path, output_file: Path) -> None:
-        """Remove consecutive duplicate lines from transcript."""
+    def clean_transcript(input_file: Path, output_file: Path) -> CaptionMerger:
+        """
+        Remove text repeated by rolling captions from a transcript.
+        
+        Returns:
+            The CaptionMerger used, which counts the words removed
+        """
         with open(input_file, 'r', encoding='utf-8') as f:
             lines = f.readlines()
         
-        # Remove consecutive duplicates
+        # Drop repeated lines and the repeated start of partially new ones
+        merger = CaptionMerger()
         cleaned_lines = []
-        prev_line = ""
         
         for line in lines:
-            line = line.strip()
-            if line and line != prev_line:
+            line = merger.merge(line.strip())
+            if line:
                 cleaned_lines.append(line)
-                prev_line = line
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write('\n'.join(cleaned_lines))
+        
+        return merger
     
     @staticmethod
+    @traced("processor.chunk_transcript")
     def chunk_transcript(content: str) -> List[Dict[str, Any]]:
         """
         Chunk transcript content for semantic search.
@@ -39,6 +197,15 @@ class TextProcessor:
         current_chunk = []
         current_speaker = None
         
+        def save_chunk() -> None:
+            chunk_text = '\n'.join(current_chunk)
+            if len(chunk_text.strip()) > 20:
+                chunks.append({
+                    'content': chunk_text,
+                    'speaker': current_speaker,
+                    'original': f"**{current_speaker}:** {chunk_text}"
+                })
+        
         # Try speaker-based chunking first
         for line in lines:
             line = line.strip()
@@ -51,13 +218,7 @@ class TextProcessor:
             if line.startswith('**DHH:**') or line.startswith('**Interviewer:**'):
                 # Save previous chunk
                 if current_chunk and current_speaker:
-                    chunk_text = '\n'.join(current_chunk)
-                    if len(chunk_text.strip()) > 20:
-                        chunks.append({
-                            'content': chunk_text,
-                            'speaker': current_speaker,
-                            'original': f"**{current_speaker}:** {chunk_text}"
-                        })
+                    save_chunk()
                 
                 # Start new chunk
                 current_speaker = "DHH" if line.startswith('**DHH:**') else "Interviewer"
@@ -68,18 +229,11 @@ class TextProcessor:
         
         # Add final chunk
         if current_chunk and current_speaker:
-            chunk_text = '\n'.join(current_chunk)
-            if len(chunk_text.strip()) > 20:
-                chunks.append({
-                    'content': chunk_text,
-                    'speaker': current_speaker,
-                    'original': f"**{current_speaker}:** {chunk_text}"
-                })
+            save_chunk()
         
         # If no speaker format detected, use paragraph-based chunking
         if not chunks:
-            paragraphs = content.split('\n\n')
-            for para in paragraphs:
+            for para in content.split('\n\n'):
                 para = para.strip()
                 if (para and 
                     not para.startswith('#') and 
@@ -94,13 +248,14 @@ class TextProcessor:
         return chunks
     
     @staticmethod
+    @traced("processor.split_large_chunks")
     def split_large_chunks(chunks: List[Dict[str, Any]], max_sentences: int = 6) -> List[Dict[str, Any]]:
         """Split large chunks into smaller ones for better search granularity."""
         final_chunks = []
         
         for chunk in chunks:
-            sentences = re.split(r'[.!?]+', chunk['content'])
-            sentences = [s.strip() for s in sentences if s.strip()]
+            sentences = [m.group().strip() for m in SENTENCE_RE.finditer(chunk['content'])]
+            sentences = [s for s in sentences if s]
             
             if len(sentences) <= max_sentences:
                 # Keep small chunks as is
@@ -130,6 +285,192 @@ class TextProcessor:
         
         return final_chunks
     
+    @staticmethod
+    @traced("processor.chunk_by_tokens")
+    def chunk_by_tokens(
+        content: str, 
+        line_times: Optional[Dict[int, Tuple[float, float]]] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        overlap_tokens: int = 32,
+        max_sentences: int = 6,
+        token_lengths: Optional[Callable[[List[str]], List[int]]] = None,
+        merge_captions: bool = False,
+        near_duplicate: float = 0.0,
+        stats: Optional[Dict[str, int]] = None
+    ) -> ChunkTable:
+        """
+        Chunk a transcript in one pass, sized by tokenizer tokens.
+        
+        Speaker turns (``**Name:**``, ``NAME:``, ``>>`` and, in
+        speaker-labeled transcripts, ``Name:``) and blank lines always
+        start a new chunk. Within a turn, words are packed until the
+        next one would exceed ``max_tokens``; the chunk then ends at its last
+        sentence break (when that keeps at least half of it) and the next
+        chunk repeats up to ``overlap_tokens`` of its tail. A chunk also
+        ends after ``max_sentences`` sentences. Every word is handled a
+        bounded number of times, so the cost is linear in the transcript.
+        
+        With ``merge_captions`` each line is treated as a caption cue and
+        passed through a CaptionMerger first. With ``near_duplicate`` set, a
+        chunk is dropped when at least that share of its new text's
+        SHINGLE_WORDS-word shingles already occurred in kept chunks.
+        
+        Args:
+            content: Transcript text
+            line_times: Optional (start, end) seconds per line number
+            max_tokens: Content tokens per chunk, excluding special tokens
+            overlap_tokens: Tokens repeated from the previous chunk
+            max_sentences: Soft limit on sentences per chunk
+            token_lengths: Token count of each word; the encoder's tokenizer
+                gives an exact limit, the default is an estimate
+            merge_captions: Remove text repeated by rolling captions
+            near_duplicate: Shingle overlap at which a chunk is dropped (0 = off)
+            stats: Filled with caption_words, caption_words_removed and
+                chunks_suppressed when given
+        
+        Returns:
+            ChunkTable whose chunks have id, content (including overlap),
+            original (new text only, for contiguous context), speaker,
+            start_index, start, end and tokens
+        """
+        line_times = line_times or {}
+        token_lengths = token_lengths or estimate_token_lengths
+        max_tokens = max(1, max_tokens)
+        overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+        
+        chunks = ChunkTableBuilder()
+        merger = CaptionMerger() if merge_captions else None
+        seen_shingles: set = set()
+        suppressed = [0]
+        # Current chunk: (word, tokens, line number) plus running totals
+        words: List[Tuple[str, int, int]] = []
+        state = {'tokens': 0, 'sentences': 0, 'new_from': 0, 'last_break': 0}
+        speaker: Optional[str] = None
+        
+        def emit(items: List[Tuple[str, int, int]], new_from: int) -> None:
+            text = ' '.join(w for w, _, _ in items)
+            if len(text) <= MIN_CHUNK_CHARS and new_from == 0:
+                return
+            if near_duplicate > 0 and is_near_duplicate(items[new_from:]):
+                suppressed[0] += 1
+                return
+            overlap_chars = len(' '.join(w for w, _, _ in items[:new_from])) + 1 if new_from else 0
+            chunks.add(
+                text,
+                overlap_chars,
+                speaker or DEFAULT_SPEAKER,
+                labeled=bool(speaker),
+                start=line_times.get(items[0][2], (None, None))[0],
+                end=line_times.get(items[-1][2], (None, None))[1],
+                tokens=sum(n for _, n, _ in items)
+            )
+        
+        def is_near_duplicate(items: List[Tuple[str, int, int]]) -> bool:
+            keys = [_word_key(w) for w, _, _ in items]
+            shingles = {
+                hash(tuple(keys[i:i + SHINGLE_WORDS]))
+                for i in range(max(1, len(keys) - SHINGLE_WORDS + 1))
+            }
+            repeated = len(shingles & seen_shingles) / len(shingles)
+            seen_shingles.update(shingles)
+            return repeated >= near_duplicate
+        
+        def reset(carry: List[Tuple[str, int, int]], new_from: int) -> None:
+            words[:] = carry
+            state['tokens'] = sum(n for _, n, _ in carry)
+            state['sentences'] = 0
+            state['new_from'] = new_from
+            state['last_break'] = 0
+        
+        def close(incoming: int = 0) -> None:
+            """End the chunk inside a turn, carrying overlap (and any unfinished sentence)."""
+            cut = len(words)
+            if incoming and state['last_break'] > max(state['new_from'], len(words) // 2):
+                cut = state['last_break']
+            if state['new_from'] < cut:
+                emit(words[:cut], state['new_from'])
+            remainder = words[cut:]
+            
+            overlap: List[Tuple[str, int, int]] = []
+            budget = overlap_tokens
+            for item in reversed(words[state['new_from']:cut]):
+                if item[1] > budget:
+                    break
+                overlap.append(item)
+                budget -= item[1]
+            overlap.reverse()
+            
+            carry = overlap + remainder
+            if sum(n for _, n, _ in carry) + incoming > max_tokens:
+                carry = remainder
+                overlap = []
+            if sum(n for _, n, _ in carry) + incoming > max_tokens:
+                # The tail cannot share a chunk with the next word: emit it alone
+                if remainder:
+                    emit(remainder, 0)
+                carry = overlap = []
+            reset(carry, len(overlap))
+        
+        def flush() -> None:
+            """End the chunk at a hard boundary (speaker turn or paragraph)."""
+            if state['new_from'] < len(words):
+                emit(words, state['new_from'])
+            reset([], 0)
+        
+        def add(word: str, n: int, line_no: int) -> None:
+            if state['tokens'] + n > max_tokens:
+                close(n)
+            words.append((word, n, line_no))
+            state['tokens'] += n
+            if word[-1] in '.!?':
+                state['sentences'] += 1
+                state['last_break'] = len(words)
+                if state['sentences'] >= max_sentences:
+                    close()
+        
+        lines = content.split('\n')
+        mixed_case_labels = _labels_speakers(lines)
+        
+        for line_no, line in enumerate(lines):
+            line = line.strip()
+            if not line:
+                flush()
+                continue
+            if line.startswith('#') or line.startswith('**Transcript extracted'):
+                continue
+            
+            turn = BOLD_SPEAKER_RE.match(line)
+            if not turn:
+                turn = LABEL_SPEAKER_RE.match(line)
+                if turn and not (mixed_case_labels or turn.group(1).isupper()):
+                    turn = None
+            if turn or CAPTION_SPEAKER_RE.match(line):
+                flush()
+                speaker = turn.group(1).strip() if turn else None
+                line = line[turn.end():] if turn else CAPTION_SPEAKER_RE.sub('', line, count=1)
+            
+            if merger is not None:
+                line = merger.merge(line)
+            line_words = line.split()
+            if not line_words:
+                continue
+            for word, n in zip(line_words, token_lengths(line_words)):
+                if n <= max_tokens:
+                    add(word, n, line_no)
+                    continue
+                # A single over-long "word" (URL, run-on caption): no piece
+                # of max_tokens characters can exceed max_tokens tokens
+                for i in range(0, len(word), max_tokens):
+                    piece = word[i:i + max_tokens]
+                    add(piece, min(len(piece), n), line_no)
+        
+        flush()
+        if stats is not None:
+            stats['caption_words'] = merger.words_in if merger else 0
+            stats['caption_words_removed'] = merger.words_removed if merger else 0
+            stats['chunks_suppressed'] = suppressed[0]
+        return chunks.build()
+    
     @staticmethod
     def extract_snippet(text: str, max_sentences: int = 2) -> str:
         """Extract a brief snippet from text."""
@@ -0,0 +1,139 @@
+"""Persistent cache of query embeddings and search results."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+
+QUERY_CACHE_FILE = "_queries.sqlite"
+
+# Bump when normalize_query() changes; rows keyed the old way are dropped
+KEY_VERSION = 2
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query used for cache keys.
+    
+    Only whitespace is normalized: case can change what a cased encoder
+    returns ("US" vs "us"), so it is part of the key.
+    """
+    return " ".join(query.split())
+
+
+class QueryCache:
+    """SQLite-backed LRU cache with two layers.
+
+    ``vectors`` maps (model, normalized query) to the query embedding so
+    repeated queries skip the model. ``results`` maps (index version,
+    normalized query, k) to the ranked results so repeated searches also
+    skip scoring. The index version is derived from the content-hashed
+    cache key, so results for a transcript whose embeddings change are
+    never served again and age out through LRU eviction.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str,
+        max_vectors: int = 10000,
+        max_results: int = 10000
+    ):
+        self.model_name = model_name
+        self.max_vectors = max_vectors
+        self.max_results = max_results
+        self._lock = threading.Lock()
+
+        path = Path(cache_dir) / QUERY_CACHE_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS vectors ("
+                "model TEXT, query TEXT, vector BLOB, last_used REAL, "
+                "PRIMARY KEY (model, query))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "version TEXT, query TEXT, k INTEGER, payload TEXT, last_used REAL, "
+                "PRIMARY KEY (version, query, k))"
+            )
+            if self._db.execute("PRAGMA user_version").fetchone()[0] < KEY_VERSION:
+                # Older rows were keyed by lowercased queries
+                self._db.execute("DELETE FROM vectors")
+                self._db.execute("DELETE FROM results")
+                self._db.execute(f"PRAGMA user_version = {KEY_VERSION}")
+
+    def get_vectors(self, queries: List[str]) -> Dict[str, np.ndarray]:
+        """Cached embeddings for any of the (normalized) queries."""
+        keys = list({normalize_query(q) for q in queries})
+        if not keys:
+            return {}
+
+        placeholders = ",".join("?" * len(keys))
+        with self._lock, self._db:
+            rows = self._db.execute(
+                f"SELECT query, vector FROM vectors WHERE model = ? AND query IN ({placeholders})",
+                [self.model_name, *keys]
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE vectors SET last_used = ? WHERE model = ? AND query = ?",
+                [(time.time(), self.model_name, query) for query, _ in rows]
+            )
+        return {query: np.frombuffer(blob, dtype=np.float32) for query, blob in rows}
+
+    def put_vectors(self, vectors: Dict[str, np.ndarray]) -> None:
+        """Store query embeddings, evicting the least recently used."""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO vectors VALUES (?, ?, ?, ?)",
+                [
+                    (self.model_name, normalize_query(q), np.asarray(v, dtype=np.float32).tobytes(), now)
+                    for q, v in vectors.items()
+                ]
+            )
+            self._evict("vectors", self.max_vectors)
+
+    def get_results(self, version: str, query: str, k: int) -> Optional[List[Dict[str, Any]]]:
+        """Cached ranked results for a query against one index version."""
+        key = (version, normalize_query(query), k)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT payload FROM results WHERE version = ? AND query = ? AND k = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE results SET last_used = ? WHERE version = ? AND query = ? AND k = ?",
+                (time.time(), *key)
+            )
+        return json.loads(row[0])
+
+    def put_results(self, version: str, query: str, k: int, results: List[Dict[str, Any]]) -> None:
+        """Store ranked results, evicting the least recently used."""
+        payload = json.dumps([
+            {key: value.item() if hasattr(value, 'item') else value for key, value in r.items()}
+            for r in results
+        ])
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (version, normalize_query(query), k, payload, time.time())
+            )
+            self._evict("results", self.max_results)
+
+    def _evict(self, table: str, limit: int) -> None:
+        """Delete the oldest rows beyond ``limit``."""
+        self._db.execute(
+            f"DELETE FROM {table} WHERE rowid IN ("
+            f"SELECT rowid FROM {table} ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (limit,)
+        )
+
+    def close(self) -> None:
+        self._db.close()
@@ -1,128 +1,716 @@
 """Semantic search engine for transcripts."""
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
-from .processor import TextProcessor
-from .cache import EmbeddingCache
+from .extractor import load_timings, timings_path
+from .processor import TextProcessor, CHUNKER_VERSION, DEFAULT_MAX_TOKENS
+from .cache import EmbeddingCache, content_hash
+from .chunk_table import ChunkTable
+from .embedding import EmbeddingEngine
+from .encoders import EncoderSpec
+from .corpus import CorpusIndex
+from .lexical import BM25Index, LEXICAL_FILE, reciprocal_rank_fusion
+from .query_cache import QueryCache, normalize_query
+from .scoring import normalize_rows, top_k_rows
+from ..utils.helpers import format_timestamp, video_link
+from ..utils.profiling import span, traced
+
+
+SEARCH_MODES = ("dense", "lexical", "hybrid")
+
+# Candidates taken from each ranking before fusing them in hybrid mode
+FUSION_DEPTH = 50
+
+# Queries scored together by search_batch(), bounding the score matrix
+QUERY_BLOCK = 256
+
+
+def cache_params(
+    max_sentences: int, 
+    max_tokens: int, 
+    overlap: int, 
+    near_duplicate: float, 
+    exact: bool = True
+) -> Dict[str, Any]:
+    """
+    Parameters that change the cached chunks or vectors and so the cache key.
+    
+    ``exact=False`` describes chunks cut with estimated token counts
+    (see SemanticSearcher._token_budget()), which must never share a key
+    with chunks cut by the encoder's tokenizer.
+    """
+    params = {
+        'chunker': CHUNKER_VERSION,
+        'max_sentences': max_sentences,
+        'max_tokens': max_tokens,
+        'overlap': overlap,
+        'near_duplicate': near_duplicate,
+        'normalized': True
+    }
+    if not exact:
+        params['lengths'] = 'estimate'
+    return params
+
+
+def search_identity(
+    encoder_spec: EncoderSpec, 
+    cache_dir: str, 
+    dtype: str, 
+    shard_rows: int, 
+    params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Settings two searchers must share to return the same results (see SearchService)."""
+    return {
+        'encoder': encoder_spec.cache_id,
+        'cache_dir': str(Path(cache_dir).resolve()),
+        'dtype': dtype,
+        'shard_rows': shard_rows,
+        **params
+    }
 
 
 class SemanticSearcher:
-    """Semantic search engine for transcript content."""
+    """Semantic search engine for transcript content.
+    
+    The sentence transformer (and with it torch) is only imported the first
+    time text has to be encoded, so cache hits and context expansion never
+    pay for loading the model.
+    """
     
     def __init__(
         self, 
         model_name: str = "all-MiniLM-L6-v2",
-        cache_dir: str = "cache"
+        cache_dir: str = "cache",
+        embedding_dtype: str = "float32",
+        max_sentences_per_chunk: int = 6,
+        model: Optional[Any] = None,
+        query_cache_size: int = 0,
+        batch_size: int = 32,
+        embed_workers: int = 0,
+        encoder_backend: str = "torch",
+        onnx_path: Optional[str] = None,
+        chunk_tokens: int = 0,
+        chunk_overlap: int = 32,
+        near_duplicate: float = 0.0,
+        cache_max_bytes: int = 0,
+        shard_rows: int = 0,
+        shard_workers: int = 0
     ):
-        self.model = SentenceTransformer(model_name)
-        self.cache = EmbeddingCache(cache_dir)
+        # Callers holding a resident model (e.g. the search server) share it
+        self.model_name = model_name
+        self.encoder_spec = EncoderSpec(model_name, encoder_backend, onnx_path)
+        self._model = model
+        self.engine = EmbeddingEngine(
+            lambda: self.model,
+            batch_size=batch_size,
+            workers=embed_workers,
+            # Workers load their own copy; an injected model stays in-process
+            worker_model=self.encoder_spec if model is None else None
+        )
+        # Vectors from different backends are cached separately
+        model_id = self.encoder_spec.cache_id
+        self.cache = EmbeddingCache(cache_dir, model_id, embedding_dtype, cache_max_bytes)
         self.processor = TextProcessor()
+        self.max_sentences_per_chunk = max_sentences_per_chunk
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.near_duplicate = near_duplicate
+        self.shard_rows = shard_rows
+        self.shard_workers = shard_workers
+        self.query_cache: Optional[QueryCache] = None
+        if query_cache_size > 0:
+            self.query_cache = QueryCache(cache_dir, model_id, query_cache_size, query_cache_size)
         
         self.transcript_name: Optional[str] = None
-        self.chunks: List[Dict[str, Any]] = []
+        self.transcript_source: Optional[str] = None
+        self.video_url: Optional[str] = None
+        self.chunks = ChunkTable()
         self.embeddings: Optional[np.ndarray] = None
+        self.lexical: Optional[BM25Index] = None
+        self.corpus: Optional[CorpusIndex] = None
     
-    def load_transcript(self, transcript_path: str) -> None:
-        """Load and process transcript for searching."""
+    @property
+    def model(self) -> Any:
+        """Encoder for the configured backend, loaded on first use."""
+        if self._model is None:
+            with span("searcher.model_load"):
+                self._model = self.encoder_spec.load()
+        return self._model
+    
+    @traced("searcher.load_transcript")
+    def load_transcript(self, transcript_path: str, embed: bool = True) -> None:
+        """
+        Load and process transcript for searching.
+        
+        With ``embed=False`` an uncached transcript is only chunked, which
+        is enough for lexical search and never loads the model.
+        """
         transcript_path = Path(transcript_path)
         if not transcript_path.exists():
             raise FileNotFoundError(f"Transcript not found: {transcript_path}")
         
-        self.transcript_name = transcript_path.stem
+        with span("searcher.read_transcript"), open(transcript_path, 'r', encoding='utf-8') as f:
+            content = f.read()
         
-        # Try to load from cache first
-        if self.cache.is_cache_valid(self.transcript_name, transcript_path):
-            print("Loading cached data...")
-            cached_data = self.cache.load_cache(self.transcript_name)
-            if cached_data:
-                self.embeddings, self.chunks = cached_data
-                print(f"✅ Using cached {len(self.chunks)} chunks and embeddings")
-                return
+        # Cue timings (if extracted from a VTT) are part of the cached chunks
+        sidecar = timings_path(transcript_path)
+        timings = sidecar.read_text(encoding='utf-8') if sidecar.exists() else ""
         
-        # Cache invalid/missing - process from scratch
+        # Key the cache by content, model and chunking parameters
+        self.transcript_source = str(transcript_path.resolve())
+        self.transcript_name = self.cache.cache_key(
+            transcript_path.stem, content + "\0" + timings, self._cache_params()
+        )
+        self.cache.remember_source_key(
+            self.transcript_source,
+            self._source_signature(transcript_path),
+            self._cache_params(),
+            self.transcript_name
+        )
+        
+        self.lexical = None
+        
+        # Try to load from cache first (counts as a hit or miss for the entry)
+        if self._load_cached():
+            return
+        if not embed:
+            # Estimated token counts can cut chunks elsewhere than the
+            # tokenizer would, so these chunks get a key of their own
+            self.transcript_name = self.cache.cache_key(
+                transcript_path.stem, content + "\0" + timings, self._cache_params(exact=False)
+            )
+            self._chunk(content, transcript_path, embed=False)
+            return
+        
+        # One worker builds each entry; the others wait and load its result
+        with self.cache.build_lock(self.transcript_name):
+            # Another worker may have published it since the lookup above
+            if self.cache.is_cache_valid(self.transcript_name) and self._load_cached():
+                return
+            self._chunk(content, transcript_path, embed=True)
+            self._create_embeddings()
+    
+    def _load_cached(self) -> bool:
+        """Load the current transcript's cache entry, if there is one."""
+        cached_data = self.cache.load_cache(self.transcript_name)
+        if not cached_data:
+            return False
+        self.embeddings, self.chunks = cached_data
+        self.video_url = (self.cache.read_meta(self.transcript_name) or {}).get('video_url')
+        print(f"✅ Using cached {len(self.chunks)} chunks and embeddings")
+        return True
+    
+    def _chunk(self, content: str, transcript_path: Path, embed: bool) -> None:
+        """Chunk an uncached transcript (cache invalid/missing - process from scratch)."""
         print("Loading transcript...")
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        self.video_url, line_times, merged = load_timings(transcript_path)
         
-        # Process transcript into chunks
-        raw_chunks = self.processor.chunk_transcript(content)
-        self.chunks = self.processor.split_large_chunks(raw_chunks)
+        # Process transcript into chunks that fit the encoder
+        max_tokens, token_lengths = self._token_budget(embed)
+        # Lines of a timed transcript are caption cues: drop rolling repeats,
+        # unless the extractor already did (merging twice eats real words)
+        stats: Dict[str, int] = {}
+        self.chunks = self.processor.chunk_by_tokens(
+            content,
+            line_times,
+            max_tokens=max_tokens,
+            overlap_tokens=self.chunk_overlap,
+            max_sentences=self.max_sentences_per_chunk,
+            token_lengths=token_lengths,
+            merge_captions=bool(line_times) and not merged,
+            near_duplicate=self.near_duplicate,
+            stats=stats
+        )
         
+        if stats['caption_words_removed']:
+            print(f"🧹 Removed {stats['caption_words_removed']:,} of {stats['caption_words']:,} "
+                  f"caption words repeated by rolling captions")
+        if stats['chunks_suppressed']:
+            print(f"🧹 Suppressed {stats['chunks_suppressed']} near-duplicate chunks")
         print(f"Created {len(self.chunks)} chunks from transcript")
+        self.embeddings = None
+    
+    @traced("searcher.load_corpus")
+    def load_corpus(
+        self, 
+        cache_dir: Optional[str] = None,
+        ann: bool = False,
+        nlist: int = 0
+    ) -> None:
+        """
+        Load every cached transcript into a single stacked index.
         
-        # Create embeddings
-        self._create_embeddings()
+        With ``shard_rows`` set on the searcher, the embeddings are kept in
+        memory-mapped shards scored in parallel instead (see ShardedIndex).
+        
+        Args:
+            cache_dir: Cache directory to read (default: this searcher's cache)
+            ann: Also build/update the approximate IVF index
+            nlist: Number of IVF lists (0 = about sqrt of the chunk count)
+        """
+        cache = self.cache
+        if cache_dir:
+            cache = EmbeddingCache(cache_dir, self.cache.model_name, self.cache.dtype)
+        self.corpus = CorpusIndex(cache)
+        self.corpus.build(self.shard_rows, self.shard_workers)
+        if ann:
+            self.corpus.build_ann(nlist)
+    
+    def _cache_params(self, exact: bool = True) -> Dict[str, Any]:
+        """Cache key parameters for this searcher's chunking (see cache_params())."""
+        return cache_params(
+            self.max_sentences_per_chunk, self.chunk_tokens, self.chunk_overlap, self.near_duplicate, exact
+        )
+    
+    def config_identity(self) -> Dict[str, Any]:
+        """Settings two searchers must share to return the same results (see search_identity())."""
+        return search_identity(
+            self.encoder_spec, str(self.cache.cache_dir), self.cache.dtype, self.shard_rows, self._cache_params()
+        )
     
+    @staticmethod
+    def _source_signature(transcript_path: Path) -> str:
+        """Size and mtime of a transcript and its timings sidecar."""
+        parts = []
+        for path in (transcript_path, timings_path(transcript_path)):
+            try:
+                stat = path.stat()
+                parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+            except OSError:
+                parts.append("-")
+        return "|".join(parts)
+    
+    def _token_budget(self, exact: bool) -> tuple[int, Optional[Callable[[List[str]], List[int]]]]:
+        """
+        Content tokens per chunk and a per-word token counter.
+        
+        With ``exact`` the encoder's own tokenizer and sequence limit are
+        used (loading the model, which embedding needs anyway); otherwise
+        token counts are estimated.
+        """
+        limit = DEFAULT_MAX_TOKENS
+        token_lengths = None
+        if exact:
+            tokenizer = getattr(self.model, 'tokenizer', None)
+            max_seq_length = getattr(self.model, 'max_seq_length', None)
+            if max_seq_length:
+                limit = int(max_seq_length) - 2  # [CLS] and [SEP]
+            if tokenizer is not None:
+                def token_lengths(words: List[str]) -> List[int]:
+                    encoded = tokenizer(words, add_special_tokens=False)['input_ids']
+                    return [len(ids) for ids in encoded]
+        
+        max_tokens = min(self.chunk_tokens, limit) if self.chunk_tokens > 0 else limit
+        return max_tokens, token_lengths
+    
+    @traced("searcher.embed_chunks")
     def _create_embeddings(self) -> None:
-        """Create embeddings for loaded chunks."""
+        """Create embeddings for loaded chunks, reusing any already cached."""
         if not self.transcript_name:
             raise ValueError("No transcript loaded")
         
-        print("Creating embeddings for all chunks...")
-        texts = [chunk['content'] for chunk in self.chunks]
+        texts = self.chunks.contents()
+        chunk_hashes = [content_hash(text) for text in texts]
         
-        # Create embeddings in batches
-        batch_size = 32
-        embeddings = []
+        # Reuse embeddings for chunks whose text has been seen before
+        known = self.cache.lookup_chunk_embeddings(chunk_hashes)
+        missing = [i for i, h in enumerate(chunk_hashes) if h not in known]
+        print(f"Creating embeddings for {len(missing)} new chunks "
+              f"({len(texts) - len(missing)} reused)...")
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_embeddings = self.model.encode(batch, show_progress_bar=True)
-            embeddings.extend(batch_embeddings)
+        encoded = self.engine.encode([texts[i] for i in missing]) if missing else None
+        if encoded is not None:
+            print(self.engine.report())
         
-        self.embeddings = np.array(embeddings)
+        # Fill one preallocated array from fresh and reused vectors
+        dim = encoded.shape[1] if encoded is not None else len(next(iter(known.values()), ()))
+        embeddings = np.empty((len(texts), dim), dtype=np.float32)
+        if encoded is not None:
+            embeddings[missing] = encoded
+        for i, h in enumerate(chunk_hashes):
+            if h in known:
+                embeddings[i] = known[h]
+        
+        # Store unit vectors so scoring is a plain dot product
+        self.embeddings = normalize_rows(embeddings)
         
         # Cache the results
-        self.cache.save_cache(self.transcript_name, self.embeddings, self.chunks)
+        self.cache.save_cache(
+            self.transcript_name, 
+            self.embeddings, 
+            self.chunks,
+            chunk_hashes=chunk_hashes,
+            source=self.transcript_source,
+            video_url=self.video_url
+        )
+    
+    @traced("searcher.encode_queries")
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Encode queries in one batch as L2-normalized float32 rows.
+        
+        Queries already in the query cache are not sent to the model.
+        """
+        cached = self.query_cache.get_vectors(queries) if self.query_cache else {}
+        missing = list(dict.fromkeys(
+            q for q in queries if normalize_query(q) not in cached
+        ))
+        
+        if missing:
+            encoded = normalize_rows(self.model.encode(missing, show_progress_bar=False))
+            fresh = {normalize_query(q): v for q, v in zip(missing, encoded)}
+            if self.query_cache:
+                self.query_cache.put_vectors(fresh)
+            cached.update(fresh)
+        
+        return np.array([cached[normalize_query(q)] for q in queries], dtype=np.float32)
+    
+    def _index_version(self) -> str:
+        """Identity of the loaded embeddings, for keying cached results."""
+        return f"{self.transcript_name}:{self.cache.dtype}"
+    
+    @traced("searcher.lexical_index")
+    def lexical_index(self) -> BM25Index:
+        """BM25 index of the loaded chunks, read from or saved to the cache entry."""
+        if self.lexical is not None:
+            return self.lexical
+        
+        cached = self.cache.is_cache_valid(self.transcript_name)
+        path = self.cache.cache_dir / self.transcript_name / LEXICAL_FILE
+        self.lexical = BM25Index.load(path) if cached else None
+        if self.lexical is None or len(self.lexical) != len(self.chunks):
+            self.lexical = BM25Index.build(self.chunks.contents())
+            if cached:
+                self.lexical.save(path)
+        return self.lexical
+    
+    @staticmethod
+    def _time_fields(chunk: Dict[str, Any], video_url: Optional[str]) -> Dict[str, Any]:
+        """Start/end seconds and a deep link for chunks that carry cue timings."""
+        start = chunk.get('start')
+        if start is None:
+            return {}
+        fields = {'start': start, 'end': chunk.get('end')}
+        if video_url:
+            fields['link'] = video_link(video_url, start)
+        return fields
+    
+    def _result(self, chunk_idx: int, score: float) -> Dict[str, Any]:
+        """Build the result record for one chunk of the loaded transcript."""
+        chunk = self.chunks[chunk_idx]
+        return {
+            'id': chunk_idx,
+            'similarity': score,
+            'speaker': chunk['speaker'],
+            'snippet': self.processor.extract_snippet(chunk['content']),
+            'full_content': chunk['content'],
+            'original': chunk['original'],
+            **self._time_fields(chunk, self.video_url)
+        }
+    
+    @traced("searcher.rank")
+    def _rank(
+        self, 
+        queries: List[str], 
+        num_results: int, 
+        mode: str,
+        query_vectors: Optional[np.ndarray] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Rank the loaded transcript for each query (dense queries share one matrix product)."""
+        depth = num_results if mode == "dense" else max(num_results, FUSION_DEPTH)
+        if mode != "lexical":
+            # Embeddings are unit length, so the dot product is the cosine similarity
+            if query_vectors is None:
+                query_vectors = self.encode_queries(queries)
+            with span("searcher.score"):
+                # Loaded embeddings are float32 whatever the cache dtype (see dequantize_embeddings)
+                similarities = query_vectors @ self.embeddings.T
+                dense_top = top_k_rows(similarities, depth)
+        
+        all_results = []
+        for row, query in enumerate(queries):
+            if mode == "dense":
+                indices, scores = dense_top[row], similarities[row, dense_top[row]]
+            elif mode == "lexical":
+                indices, scores = self.lexical_index().search(query, num_results)
+            else:
+                lexical_top, _ = self.lexical_index().search(query, depth)
+                indices, scores = reciprocal_rank_fusion([dense_top[row], lexical_top], num_results)
+            all_results.append([
+                self._result(int(idx), score) for idx, score in zip(indices, scores)
+            ])
+        
+        return all_results
     
-    def search(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
+    def search(self, query: str, num_results: int = 10, mode: str = "dense") -> List[Dict[str, Any]]:
         """
         Perform semantic search on the loaded transcript.
         
         Args:
             query: Search query
             num_results: Number of results to return
+            mode: "dense" (embeddings), "lexical" (BM25, no model) or
+                "hybrid" (both, fused by reciprocal rank)
             
         Returns:
             List of search results with relevance scores
         """
-        if self.embeddings is None or not self.chunks:
-            raise ValueError("No transcript loaded. Call load_transcript() first.")
+        self._check_loaded(mode)
         
         print(f"🔍 Searching for: '{query}'")
         
-        # Create query embedding
-        query_embedding = self.model.encode([query])
+        return self.search_many([query], num_results, mode)[0]
+    
+    def _check_loaded(self, mode: str) -> None:
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}; expected one of {SEARCH_MODES}")
+        if not self.chunks or (mode != "lexical" and self.embeddings is None):
+            raise ValueError("No transcript loaded. Call load_transcript() first.")
+    
+    @traced("searcher.search")
+    def search_many(
+        self, 
+        queries: List[str], 
+        num_results: int = 10,
+        mode: str = "dense",
+        query_vectors: Optional[np.ndarray] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search the loaded transcript for many queries at once.
+        
+        All queries are encoded in a single model call and scored with one
+        matrix-matrix product. Queries with cached results skip both steps.
         
-        # Calculate similarities
-        similarities = cosine_similarity(query_embedding, self.embeddings)[0]
+        Args:
+            queries: Search queries
+            num_results: Number of results per query
+            mode: "dense", "lexical" or "hybrid" (see search())
+            query_vectors: Already encoded queries (one normalized row each),
+                e.g. from a batch shared with other indexes
+            
+        Returns:
+            One result list per query, in query order
+        """
+        self._check_loaded(mode)
+        if not queries:
+            return []
+        
+        version = self._index_version() + ("" if mode == "dense" else f":{mode}")
+        all_results: List[Optional[List[Dict[str, Any]]]] = [
+            self.query_cache.get_results(version, q, num_results) if self.query_cache else None
+            for q in queries
+        ]
+        
+        pending = [i for i, results in enumerate(all_results) if results is None]
+        if pending:
+            ranked = self._rank(
+                [queries[i] for i in pending],
+                num_results,
+                mode,
+                None if query_vectors is None else np.asarray(query_vectors)[pending]
+            )
+            for i, results in zip(pending, ranked):
+                all_results[i] = results
+                if self.query_cache:
+                    self.query_cache.put_results(version, queries[i], num_results, results)
+        
+        return all_results
+    
+    def search_corpus(
+        self, 
+        query: str, 
+        num_results: int = 10,
+        nprobe: int = 8,
+        mode: str = "dense"
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform semantic search across every transcript in the loaded corpus.
         
-        # Get top results
-        top_indices = np.argsort(similarities)[::-1][:num_results]
+        Uses the IVF index when one was built by load_corpus().
         
-        results = []
-        for idx in top_indices:
-            chunk_idx = int(idx)
-            similarity_score = similarities[idx]
+        Args:
+            query: Search query
+            num_results: Number of results to return
+            nprobe: IVF lists to scan (higher = better recall, slower)
+            mode: "dense", "lexical" or "hybrid" (see search())
             
-            chunk = self.chunks[chunk_idx]
-            snippet = self.processor.extract_snippet(chunk['content'])
+        Returns:
+            Globally ranked search results tagged with their source transcript
+        """
+        self._check_corpus(mode)
+        
+        print(f"🔍 Searching corpus for: '{query}'")
+        
+        return self.search_corpus_many([query], num_results, nprobe, mode)[0]
+    
+    def _check_corpus(self, mode: str) -> None:
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}; expected one of {SEARCH_MODES}")
+        if self.corpus is None or not len(self.corpus):
+            raise ValueError("No corpus loaded. Call load_corpus() first.")
+    
+    @traced("searcher.search_corpus")
+    def search_corpus_many(
+        self, 
+        queries: List[str], 
+        num_results: int = 10,
+        nprobe: int = 8,
+        mode: str = "dense",
+        query_vectors: Optional[np.ndarray] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search the loaded corpus for many queries at once.
+        
+        Exact dense scoring is one matrix-matrix product over the whole
+        library (per shard, in parallel, for a sharded corpus); IVF and
+        lexical lookups run per query.
+        
+        Args:
+            queries: Search queries
+            num_results: Number of results per query
+            nprobe: IVF lists to scan (higher = better recall, slower)
+            mode: "dense", "lexical" or "hybrid" (see search())
+            query_vectors: Already encoded queries (one normalized row each)
             
-            result = {
-                'id': chunk_idx,
-                'similarity': similarity_score,
-                'speaker': chunk['speaker'],
-                'snippet': snippet,
-                'full_content': chunk['content'],
-                'original': chunk['original']
-            }
-            results.append(result)
-        
-        return results
+        Returns:
+            One globally ranked result list per query, in query order
+        """
+        self._check_corpus(mode)
+        if not queries:
+            return []
+        
+        version = self.corpus.version()
+        if self.corpus.ann:
+            # Retraining (e.g. a new YSS_ANN_NLIST) keeps the entry keys but moves the lists
+            ann = self.corpus.ann
+            version += f":ivf{ann.nlist}-{ann.fingerprint}-p{nprobe}"
+        if mode != "dense":
+            version += f":{mode}"
+        all_results: List[Optional[List[Dict[str, Any]]]] = [
+            self.query_cache.get_results(version, q, num_results) if self.query_cache else None
+            for q in queries
+        ]
+        pending = [i for i, results in enumerate(all_results) if results is None]
+        if not pending:
+            return all_results
+        
+        depth = num_results if mode == "dense" else max(num_results, FUSION_DEPTH)
+        if mode != "lexical":
+            if query_vectors is None:
+                vectors = self.encode_queries([queries[i] for i in pending])
+            else:
+                vectors = np.asarray(query_vectors, dtype=np.float32)[pending]
+            if self.corpus.ann is None:
+                # One matrix product over the (normalized) library or each of its shards
+                with span("searcher.score"):
+                    dense = self.corpus.search_dense(vectors, depth)
+        
+        for row, i in enumerate(pending):
+            query = queries[i]
+            if mode == "lexical":
+                top_indices, top_scores = self.corpus.lexical_index().search(query, num_results)
+            elif self.corpus.ann is not None:
+                top_indices, top_scores = self.corpus.ann.search(
+                    vectors[row], self.corpus.embeddings, depth, nprobe
+                )
+            else:
+                top_indices, top_scores = dense[row]
+            
+            if mode == "hybrid":
+                lexical_top, _ = self.corpus.lexical_index().search(query, depth)
+                top_indices, top_scores = reciprocal_rank_fusion(
+                    [top_indices, lexical_top], num_results
+                )
+            
+            results = []
+            for idx, score in zip(top_indices, top_scores):
+                transcript_name, chunk_idx, chunk = self.corpus.locate(int(idx))
+                results.append({
+                    'id': chunk_idx,
+                    'transcript': transcript_name,
+                    'transcript_id': self.corpus.entry_keys[self.corpus.row_transcripts[idx]],
+                    'similarity': score,
+                    'speaker': chunk['speaker'],
+                    'snippet': self.processor.extract_snippet(chunk['content']),
+                    'full_content': chunk['content'],
+                    'original': chunk['original'],
+                    **self._time_fields(chunk, self.corpus.video_url(int(idx)))
+                })
+            
+            all_results[i] = results
+            if self.query_cache:
+                self.query_cache.put_results(version, query, num_results, results)
+        
+        return all_results
+    
+    def search_batch(
+        self, 
+        queries: List[str], 
+        num_results: int = 10,
+        mode: str = "dense",
+        corpus: bool = False,
+        nprobe: int = 8,
+        block: int = QUERY_BLOCK
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Run a whole query list against the loaded transcript or corpus.
+        
+        Every query is encoded in one model call up front; they are then
+        scored ``block`` at a time (one matrix product each) and yielded
+        as soon as their block is ranked, so results can be streamed.
+        
+        Args:
+            queries: Search queries
+            num_results: Number of results per query
+            mode: "dense", "lexical" or "hybrid" (see search())
+            corpus: Search the loaded corpus instead of the transcript
+            nprobe: IVF lists to scan for corpus search with an ANN index
+            block: Queries scored together
+            
+        Yields:
+            (query index, results) in query order
+        """
+        if corpus:
+            self._check_corpus(mode)
+        else:
+            self._check_loaded(mode)
+        vectors = self.encode_queries(queries) if mode != "lexical" and queries else None
+        
+        for start in range(0, len(queries), max(1, block)):
+            batch = queries[start:start + block]
+            batch_vectors = None if vectors is None else vectors[start:start + block]
+            if corpus:
+                ranked = self.search_corpus_many(batch, num_results, nprobe, mode, batch_vectors)
+            else:
+                ranked = self.search_many(batch, num_results, mode, batch_vectors)
+            yield from enumerate(ranked, start)
+    
+    def result_record(self, index: int, query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Machine-readable form of one query's results (a JSONL line of search --queries).
+        
+        Results from a single transcript carry its cache entry key as
+        ``transcript_id``; corpus results carry their own.
+        """
+        transcript = Path(self.transcript_source).stem if self.transcript_source else None
+        return {
+            'query_index': index,
+            'query': query,
+            'results': [
+                {
+                    'rank': rank,
+                    'score': float(result['similarity']),
+                    'chunk_id': int(result['id']),
+                    'transcript_id': result.get('transcript_id', self.transcript_name),
+                    'transcript': result.get('transcript', transcript),
+                    'start': result.get('start'),
+                    'end': result.get('end')
+                }
+                for rank, result in enumerate(results, 1)
+            ]
+        }
     
     def get_expanded_context(
         self, 
@@ -142,30 +730,72 @@ class SemanticSearcher:
         if result_id >= len(self.chunks):
             return f"Error: Result ID {result_id} not found"
         
-        # Get context range
         start_idx = max(0, result_id - context_chunks)
         end_idx = min(len(self.chunks), result_id + context_chunks + 1)
+        return self.format_context(self.chunks[start_idx:end_idx], start_idx, result_id)
+    
+    @traced("searcher.expand_transcript")
+    def expand_transcript(
+        self, 
+        transcript_path: str, 
+        result_id: int, 
+        context_chunks: int = 3
+    ) -> str:
+        """
+        Expanded context around a result without loading the transcript's index.
         
-        context_chunks_list = self.chunks[start_idx:end_idx]
+        When the transcript is cached, only the chunks in the window are
+        read from the entry's chunk store; the model, the embeddings and
+        the other chunks are never touched. Uncached transcripts fall back
+        to chunking the file.
+        """
+        path = Path(transcript_path)
+        start_idx = max(0, result_id - context_chunks)
+        stop_idx = result_id + context_chunks + 1
         
-        # Build context with main result highlighted
-        context_text = ""
-        for i, chunk in enumerate(context_chunks_list):
-            if start_idx + i == result_id:
-                context_text += f"\n>>> MAIN RESULT <<<\n"
-                context_text += chunk['original'] + "\n"
-                context_text += ">>> END RESULT <<<\n\n"
+        # An unchanged file maps straight to its entry; otherwise hash its content
+        name = self.cache.source_key(
+            str(path.resolve()), self._source_signature(path), self._cache_params()
+        )
+        chunks = self.cache.read_chunks(name, start_idx, stop_idx) if name else None
+        if chunks is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            sidecar = timings_path(path)
+            timings = sidecar.read_text(encoding='utf-8') if sidecar.exists() else ""
+            name = self.cache.cache_key(path.stem, content + "\0" + timings, self._cache_params())
+            chunks = self.cache.read_chunks(name, start_idx, stop_idx)
+        if chunks is None:
+            self.load_transcript(transcript_path, embed=False)
+            return self.get_expanded_context(result_id, context_chunks)
+        if result_id < 0 or result_id >= start_idx + len(chunks):
+            return f"Error: Result ID {result_id} not found"
+        return self.format_context(chunks, start_idx, result_id)
+    
+    @staticmethod
+    def format_context(chunks: List[Dict[str, Any]], first_id: int, result_id: int) -> str:
+        """Join a window of chunks (the first with ID ``first_id``), marking the result."""
+        parts = []
+        for chunk_id, chunk in enumerate(chunks, first_id):
+            if chunk_id == result_id:
+                parts.append(f"\n>>> MAIN RESULT <<<\n{chunk['original']}\n>>> END RESULT <<<\n\n")
             else:
-                context_text += chunk['original'] + "\n\n"
-        
-        return context_text.strip()
+                parts.append(chunk['original'] + "\n\n")
+        return "".join(parts).strip()
     
-    def print_results(self, results: List[Dict[str, Any]]) -> None:
+    @staticmethod
+    def print_results(results: List[Dict[str, Any]]) -> None:
         """Print search results in a formatted way."""
         print(f"\n🎯 Found {len(results)} results:\n")
         
         for i, result in enumerate(results, 1):
-            print(f"[{result['id']}] {result['speaker']} (Score: {result['similarity']:.3f})")
+            if 'transcript' in result:
+                print(f"[{result['id']}] {result['transcript']} · {result['speaker']} "
+                      f"(Score: {result['similarity']:.3f})")
+            else:
+                print(f"[{result['id']}] {result['speaker']} (Score: {result['similarity']:.3f})")
+            if result.get('start') is not None:
+                print(f"    ⏱  {format_timestamp(result['start'])}  {result.get('link', '')}".rstrip())
             print(f"    {result['snippet']}")
             print()
         
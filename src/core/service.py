@@ -0,0 +1,385 @@
+"""Resident search server.
+
+The server keeps the sentence transformer and recently used indexes in
+memory so that repeated searches only pay for encoding the query and
+scoring. Concurrent searches are coalesced into shared batches.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .searcher import SemanticSearcher
+
+
+MAX_BATCH = 64
+
+
+def _array_bytes(searcher: SemanticSearcher) -> int:
+    """Bytes held by a searcher's embedding and index arrays."""
+    total = 0
+    indexes = [searcher.embeddings, searcher.lexical]
+    if searcher.corpus is not None:
+        indexes += [searcher.corpus.embeddings, searcher.corpus.lexical, searcher.corpus.ann]
+    for index in indexes:
+        if isinstance(index, np.ndarray):
+            total += index.nbytes
+        elif index is not None:
+            total += sum(v.nbytes for v in vars(index).values() if isinstance(v, np.ndarray))
+    return total
+
+
+def _chunk_bytes(searcher: SemanticSearcher) -> int:
+    """Bytes held by a searcher's chunk tables (measured once, at load)."""
+    groups = searcher.corpus.chunks if searcher.corpus is not None else [searcher.chunks]
+    return sum(chunks.nbytes for chunks in groups)
+
+
+class MicroBatcher:
+    """Coalesces searches that arrive within a short window.
+    
+    Request threads block in submit() while one worker thread drains the
+    queue: it waits up to ``window_ms`` after the first request for
+    others, encodes every query of the batch in one model call, then runs
+    one search_many() (a single matrix product) per target index and
+    hands each caller its own results.
+    """
+    
+    def __init__(self, base: SemanticSearcher, window_ms: float = 5.0, max_batch: int = MAX_BATCH):
+        self.base = base
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.queries = 0
+        self._queue: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="search-batcher", daemon=True)
+        self._thread.start()
+    
+    def submit(
+        self, 
+        searcher: SemanticSearcher, 
+        query: str, 
+        num_results: int, 
+        mode: str,
+        corpus: bool = False,
+        nprobe: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Queue one search and wait for its results."""
+        future: Future = Future()
+        self._queue.put((searcher, query, num_results, mode, corpus, nprobe, future))
+        return future.result()
+    
+    def close(self) -> None:
+        """Stop the worker after the queued searches are answered."""
+        self._queue.put(None)
+        self._thread.join()
+    
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._process(batch)
+            if stop:
+                return
+    
+    def _process(self, batch: List[Tuple[Any, ...]]) -> None:
+        """Answer one batch: one encode call, then one search per index and settings."""
+        self.batches += 1
+        self.queries += len(batch)
+        
+        vectors: Dict[str, np.ndarray] = {}
+        texts = list(dict.fromkeys(item[1] for item in batch if item[3] != "lexical"))
+        if texts:
+            try:
+                vectors = dict(zip(texts, self.base.encode_queries(texts)))
+            except Exception as e:
+                for item in batch:
+                    if item[3] != "lexical":
+                        item[-1].set_exception(e)
+                batch = [item for item in batch if item[3] == "lexical"]
+        
+        groups: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]] = {}
+        for item in batch:
+            searcher, _, num_results, mode, corpus, nprobe, _ = item
+            groups.setdefault((id(searcher), num_results, mode, corpus, nprobe), []).append(item)
+        
+        for (_, num_results, mode, corpus, nprobe), items in groups.items():
+            searcher = items[0][0]
+            queries = [item[1] for item in items]
+            query_vectors = np.array([vectors[q] for q in queries]) if mode != "lexical" else None
+            try:
+                if corpus:
+                    ranked = searcher.search_corpus_many(
+                        queries, num_results, nprobe, mode, query_vectors
+                    )
+                else:
+                    ranked = searcher.search_many(queries, num_results, mode, query_vectors)
+            except Exception as e:
+                for item in items:
+                    item[-1].set_exception(e)
+                continue
+            for item, results in zip(items, ranked):
+                item[-1].set_result(results)
+
+
+class SearchService:
+    """Holds one model and recently used searchers per transcript or corpus.
+    
+    Resident searchers are kept in LRU order; once their estimated memory
+    exceeds ``memory_budget`` bytes the least recently used are dropped
+    (and reloaded from the cache on their next request). Loading happens
+    outside the service lock, so a cold transcript never holds up requests
+    for resident ones; concurrent requests for the same key wait for one
+    load instead of each building it.
+    """
+
+    def __init__(
+        self, 
+        searcher: SemanticSearcher, 
+        ann_nlist: int = 0,
+        memory_budget: int = 0,
+        batch_window_ms: float = 5.0
+    ):
+        self.base = searcher
+        self.ann_nlist = ann_nlist
+        self.memory_budget = memory_budget
+        self._lock = threading.Lock()
+        # key -> (file signature, searcher, chunk bytes)
+        self._resident: "OrderedDict[str, Tuple[Any, SemanticSearcher, int]]" = OrderedDict()
+        # key -> lock held while that key is being loaded
+        self._loading: Dict[str, threading.Lock] = {}
+        self.batcher = MicroBatcher(searcher, batch_window_ms) if batch_window_ms > 0 else None
+
+    def _spawn(self) -> SemanticSearcher:
+        """Create a searcher sharing the resident model, caches and settings."""
+        searcher = SemanticSearcher(
+            model_name=self.base.model_name,
+            cache_dir=str(self.base.cache.cache_dir),
+            embedding_dtype=self.base.cache.dtype,
+            max_sentences_per_chunk=self.base.max_sentences_per_chunk,
+            chunk_tokens=self.base.chunk_tokens,
+            chunk_overlap=self.base.chunk_overlap,
+            near_duplicate=self.base.near_duplicate,
+            shard_rows=self.base.shard_rows,
+            shard_workers=self.base.shard_workers,
+            model=self.base.model,
+            batch_size=self.base.engine.batch_size,
+            encoder_backend=self.base.encoder_spec.backend,
+            onnx_path=self.base.encoder_spec.onnx_path
+        )
+        searcher.cache = self.base.cache
+        searcher.query_cache = self.base.query_cache
+        return searcher
+
+    def transcript(self, transcript_path: str) -> SemanticSearcher:
+        """Get the resident searcher for a transcript, reloading it if the file changed."""
+        stat = Path(transcript_path).stat()
+        signature = (stat.st_mtime, stat.st_size)
+        key = f"transcript:{transcript_path}"
+        return self._get(key, signature, lambda searcher: searcher.load_transcript(transcript_path))
+
+    def corpus(self, corpus_dir: Optional[str], ann: bool = False) -> SemanticSearcher:
+        """Get the resident searcher for a corpus, building it on first use."""
+        key = f"corpus:{corpus_dir or ''}|{ann}"
+        return self._get(
+            key, None, lambda searcher: searcher.load_corpus(corpus_dir, ann=ann, nlist=self.ann_nlist)
+        )
+
+    def _lookup(self, key: str, signature: Any) -> Optional[SemanticSearcher]:
+        """The resident searcher for ``key`` if still current (caller holds the lock)."""
+        entry = self._resident.get(key)
+        if entry and entry[0] == signature:
+            self._resident.move_to_end(key)
+            return entry[1]
+        return None
+
+    def _get(self, key: str, signature: Any, load: Callable[[SemanticSearcher], None]) -> SemanticSearcher:
+        """Return the resident searcher for ``key``, loading it if missing or stale."""
+        with self._lock:
+            searcher = self._lookup(key, signature)
+            if searcher is not None:
+                return searcher
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            # Whoever held the load lock before us may have just loaded it
+            with self._lock:
+                searcher = self._lookup(key, signature)
+                if searcher is not None:
+                    return searcher
+            try:
+                searcher = self._spawn()
+                load(searcher)
+                with self._lock:
+                    self._admit(key, signature, searcher)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+            return searcher
+
+    def _admit(self, key: str, signature: Any, searcher: SemanticSearcher) -> None:
+        """Make a searcher resident, evicting the least recently used over budget."""
+        self._resident[key] = (signature, searcher, _chunk_bytes(searcher))
+        self._resident.move_to_end(key)
+        if not self.memory_budget:
+            return
+        
+        # Lexical indexes are built lazily, so sizes are re-measured here
+        while len(self._resident) > 1 and self.resident_bytes() > self.memory_budget:
+            evicted, _ = self._resident.popitem(last=False)
+            print(f"🧹 Unloaded {evicted.split(':', 1)[1] or 'default corpus'} (memory budget)")
+
+    def resident_bytes(self) -> int:
+        """Estimated memory held by every resident searcher."""
+        return sum(
+            chunk_bytes + _array_bytes(searcher)
+            for _, searcher, chunk_bytes in self._resident.values()
+        )
+
+    def identity(self) -> Dict[str, Any]:
+        """Encoder, cache and index settings a client must match to use this server."""
+        return {**self.base.config_identity(), 'ann_nlist': self.ann_nlist}
+
+    def stats(self) -> Dict[str, Any]:
+        """Resident indexes and batching counters."""
+        with self._lock:
+            return {
+                'resident': [key for key in self._resident],
+                'resident_bytes': self.resident_bytes(),
+                'memory_budget': self.memory_budget,
+                'batches': self.batcher.batches if self.batcher else 0,
+                'batched_queries': self.batcher.queries if self.batcher else 0
+            }
+
+    def reload(self) -> None:
+        """Drop every resident index so it is rebuilt on next use."""
+        with self._lock:
+            self._resident.clear()
+
+    def close(self) -> None:
+        """Stop the batch worker."""
+        if self.batcher:
+            self.batcher.close()
+
+    def search(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run one search request, batched with concurrent ones when enabled."""
+        num_results = int(request.get('num_results', 10))
+        mode = request.get('mode', 'dense')
+        nprobe = int(request.get('nprobe', 8))
+        corpus = request.get('corpus') is not None
+        if corpus:
+            searcher = self.corpus(request['corpus'] or None, bool(request.get('ann')))
+        else:
+            searcher = self.transcript(request['transcript'])
+        
+        if self.batcher:
+            return self.batcher.submit(
+                searcher, request['query'], num_results, mode, corpus, nprobe
+            )
+        if corpus:
+            return searcher.search_corpus(request['query'], num_results, nprobe, mode)
+        return searcher.search(request['query'], num_results, mode)
+
+    def handle(self, path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one JSON request."""
+        if path == "/search":
+            return {'results': [_jsonable(r) for r in self.search(request)]}
+
+        if path == "/expand":
+            result_id = int(request['result_id'])
+            context_chunks = int(request.get('context_chunks', 3))
+            stat = Path(request['transcript']).stat()
+            with self._lock:
+                entry = self._resident.get(f"transcript:{request['transcript']}")
+            if entry and entry[0] == (stat.st_mtime, stat.st_size):
+                context = entry[1].get_expanded_context(result_id, context_chunks)
+            else:
+                # Read just the window from the cache rather than loading the index
+                context = self._spawn().expand_transcript(
+                    request['transcript'], result_id, context_chunks
+                )
+            return {'context': context}
+
+        if path == "/reload":
+            self.reload()
+            return {'status': 'ok'}
+
+        raise KeyError(path)
+
+
+def _jsonable(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert numpy scalars in a search result to plain Python types."""
+    return {
+        key: value.item() if hasattr(value, 'item') else value
+        for key, value in result.items()
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON-over-HTTP request handler bound to a SearchService."""
+
+    service: SearchService
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._reply(200, {
+                'status': 'ok',
+                'model': self.service.base.cache.model_name,
+                'identity': self.service.identity()
+            })
+        elif self.path == "/stats":
+            self._reply(200, self.service.stats())
+        else:
+            self._reply(404, {'error': f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            self._reply(200, self.service.handle(self.path, request))
+        except KeyError as e:
+            self._reply(400, {'error': f"Missing or unknown field: {e}"})
+        except Exception as e:
+            self._reply(500, {'error': str(e)})
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Keep the server console to the searcher's own status lines
+        pass
+
+
+def create_server(service: SearchService, host: str, port: int) -> ThreadingHTTPServer:
+    """Bind an HTTP server for the service on host:port."""
+    handler = type("SearchHandler", (_Handler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,286 @@
+"""Sharded, memory-mapped corpus embeddings scored in parallel."""
+
+import heapq
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .scoring import normalize_rows, top_k_rows
+
+
+SHARD_DIR = "_shards"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = 1
+
+# Rows per shard (about 100 MB of float32 at 384 dimensions)
+DEFAULT_SHARD_ROWS = 65536
+
+# Rebuild all shards once this share of their rows belongs to removed entries
+COMPACT_FRACTION = 0.25
+
+
+class ShardedIndex:
+    """Corpus embeddings split into fixed-size, memory-mapped shards.
+
+    Each shard is a normalized float32 ``.npy`` matrix of at most
+    ``shard_rows`` rows plus a ``.rows.npy`` map giving the (entry, chunk)
+    each row came from. ``manifest.json`` lists the entries and the shard
+    files in order. New entries are appended to the last shard until it is
+    full and then to new ones, so adding transcripts never rewrites a full
+    shard. Entries that leave the cache are only marked dead in the
+    manifest and masked at query time, until they make up COMPACT_FRACTION
+    of the rows and the shards are rebuilt.
+
+    A query batch is scored shard by shard on a thread pool (the matrix
+    products release the GIL) and the per-shard top-k lists are merged
+    with a heap, so latency falls with core count and only the shards'
+    pages, never one stacked matrix, have to be in memory.
+
+    Args:
+        directory: Directory holding the manifest and shard files
+        manifest: Parsed manifest
+        workers: Scoring threads (0 = one per core)
+    """
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any], workers: int = 0):
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._matrices: List[np.ndarray] = []
+        self._origins: List[np.ndarray] = []
+        for shard in manifest['shards']:
+            self._matrices.append(np.load(self.directory / f"{shard['file']}.npy", mmap_mode='r'))
+            self._origins.append(np.load(self.directory / f"{shard['file']}.rows.npy", mmap_mode='r'))
+        self._masks: List[Optional[np.ndarray]] = []
+        self.set_live(np.array([e['live'] for e in self.entries], dtype=bool))
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """Manifest entries (key, rows, live), indexed by the row maps' entry ids."""
+        return self.manifest['entries']
+
+    @property
+    def shard_rows(self) -> int:
+        return self.manifest['shard_rows']
+
+    def __len__(self) -> int:
+        return sum(len(matrix) for matrix in self._matrices)
+
+    def live_keys(self) -> List[str]:
+        """Keys of the entries still in the cache, in manifest order."""
+        return [e['key'] for e in self.entries if e['live']]
+
+    def dead_rows(self) -> int:
+        return sum(e['rows'] for e in self.entries if not e['live'])
+
+    @classmethod
+    def open(cls, directory: Path, workers: int = 0) -> Optional['ShardedIndex']:
+        """Open the shards in ``directory``, or None if there is no usable manifest."""
+        try:
+            with open(Path(directory) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('format') != MANIFEST_FORMAT:
+                return None
+            return cls(directory, manifest, workers)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def sync(
+        cls,
+        cache: Any,
+        shard_rows: int = DEFAULT_SHARD_ROWS,
+        workers: int = 0
+    ) -> 'ShardedIndex':
+        """
+        Bring the shards under ``cache_dir/_shards`` up to date with the cache.
+
+        Entries new to the cache are appended, entries gone from it are
+        marked dead, and dead entries whose key is back (keys hash the
+        content, so an evicted transcript rebuilds to the same key) are
+        made live again when their row count still matches. The shards are rebuilt from scratch only when the
+        model or shard size changed or too many rows are dead. Holds the
+        cache's build lock, so concurrent processes do not append twice.
+
+        Args:
+            cache: EmbeddingCache to index
+            shard_rows: Rows per shard
+            workers: Scoring threads (0 = one per core)
+        """
+        directory = cache.cache_dir / SHARD_DIR
+        with cache.build_lock(SHARD_DIR):
+            index = cls.open(directory, workers)
+            live_keys = cache.list_entries()
+            if index is not None:
+                live = set(live_keys)
+                revived = set()
+                for entry in index.entries:
+                    key = entry['key']
+                    if entry['live'] or key in revived or key not in live:
+                        entry['live'] = entry['live'] and key in live
+                        continue
+                    # Same key, same content: the rows in the shards still apply
+                    if (cache.read_meta(key) or {}).get('rows') == entry['rows']:
+                        entry['live'] = True
+                        revived.add(key)
+            if (index is None or
+                    index.manifest.get('model') != cache.model_name or
+                    index.shard_rows != shard_rows or
+                    index.dead_rows() > COMPACT_FRACTION * max(len(index), 1)):
+                manifest = {
+                    'format': MANIFEST_FORMAT,
+                    'model': cache.model_name,
+                    'shard_rows': shard_rows,
+                    'dim': None,
+                    'entries': [],
+                    'shards': []
+                }
+            else:
+                manifest = index.manifest
+                index.close()
+
+            known = {e['key'] for e in manifest['entries'] if e['live']}
+            added = _append_entries(directory, manifest, cache, [k for k in live_keys if k not in known])
+            directory.mkdir(exist_ok=True)
+            _write_manifest(directory, manifest)
+            _remove_unreferenced(directory, manifest)
+            if added:
+                print(f"✅ Added {added} chunks to {len(manifest['shards'])} corpus shards")
+        return cls(directory, manifest, workers)
+
+    def set_live(self, live: np.ndarray) -> None:
+        """Restrict scoring to entries whose flag in ``live`` (one per manifest entry) is set."""
+        self._masks = []
+        for origins in self._origins:
+            mask = live[origins[:, 0]] if len(origins) else np.ones(0, dtype=bool)
+            self._masks.append(None if mask.all() else mask)
+
+    def _score_shard(self, shard: int, vectors: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (scores, (entry, chunk) origins) of one shard for every query."""
+        scores = vectors @ self._matrices[shard].T
+        mask = self._masks[shard]
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+        top = top_k_rows(scores, k)
+        return np.take_along_axis(scores, top, axis=1), self._origins[shard][top]
+
+    def search(self, vectors: np.ndarray, k: int) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Score normalized query vectors against every shard.
+
+        Returns:
+            Per query, (entry ids, chunk ids, scores) of the best ``k``
+            live rows, best first
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        shards = range(len(self._matrices))
+        if len(shards) > 1 and self.workers > 1:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="shard")
+            parts = list(self._pool.map(lambda s: self._score_shard(s, vectors, k), shards))
+        else:
+            parts = [self._score_shard(s, vectors, k) for s in shards]
+
+        results = []
+        for q in range(len(vectors)):
+            # Each shard's list is sorted best first: merge them lazily
+            merged = heapq.merge(*(
+                zip((-scores[q]).tolist(), origins[q, :, 0].tolist(), origins[q, :, 1].tolist())
+                for scores, origins in parts
+            ))
+            best = [item for item in islice(merged, k) if item[0] != np.inf]
+            results.append((
+                np.array([entry for _, entry, _ in best], dtype=np.int64),
+                np.array([chunk for _, _, chunk in best], dtype=np.int64),
+                np.array([-score for score, _, _ in best], dtype=np.float32)
+            ))
+        return results
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+def _write_manifest(directory: Path, manifest: Dict[str, Any]) -> None:
+    temp = directory / f"{MANIFEST_FILE}.{uuid.uuid4().hex[:8]}.tmp"
+    temp.write_text(json.dumps(manifest), encoding='utf-8')
+    os.replace(temp, directory / MANIFEST_FILE)
+
+
+def _write_shard(directory: Path, number: int, matrix: np.ndarray, origins: np.ndarray) -> str:
+    """Write one shard under a fresh name (readers of the old manifest keep theirs)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"shard-{number:05d}-{uuid.uuid4().hex[:8]}"
+    np.save(directory / f"{name}.npy", matrix)
+    np.save(directory / f"{name}.rows.npy", origins)
+    return name
+
+
+def _append_entries(directory: Path, manifest: Dict[str, Any], cache: Any, keys: List[str]) -> int:
+    """Append the embeddings of ``keys`` to the shards, filling the last one first."""
+    shard_rows = manifest['shard_rows']
+    shards = manifest['shards']
+    matrices: List[np.ndarray] = []
+    origins: List[np.ndarray] = []
+    pending = 0
+    # Reopen a partly filled last shard so it is topped up rather than left short
+    if keys and shards and shards[-1]['rows'] < shard_rows:
+        tail = shards.pop()
+        matrices.append(np.load(directory / f"{tail['file']}.npy"))
+        origins.append(np.load(directory / f"{tail['file']}.rows.npy"))
+        pending = tail['rows']
+
+    def flush(rows: int) -> None:
+        matrix = np.concatenate(matrices)
+        origin = np.concatenate(origins)
+        name = _write_shard(directory, len(shards), matrix[:rows], origin[:rows])
+        shards.append({'file': name, 'rows': rows})
+        matrices[:] = [matrix[rows:]]
+        origins[:] = [origin[rows:]]
+
+    added = 0
+    for key in keys:
+        cached_data = cache.load_cache(key)
+        if not cached_data or len(cached_data[0]) == 0:
+            continue
+        embeddings = cached_data[0]
+        if manifest['dim'] is None:
+            manifest['dim'] = int(embeddings.shape[1])
+        elif embeddings.shape[1] != manifest['dim']:
+            print(f"⚠️  Skipping {key}: embedding dim {embeddings.shape[1]} != {manifest['dim']}")
+            continue
+
+        entry_id = len(manifest['entries'])
+        manifest['entries'].append({'key': key, 'rows': len(embeddings), 'live': True})
+        matrices.append(normalize_rows(embeddings))
+        origins.append(np.column_stack([
+            np.full(len(embeddings), entry_id, dtype=np.int32),
+            np.arange(len(embeddings), dtype=np.int32)
+        ]))
+        pending += len(embeddings)
+        added += len(embeddings)
+        while pending >= shard_rows:
+            flush(shard_rows)
+            pending -= shard_rows
+
+    if pending:
+        flush(pending)
+    return added
+
+
+def _remove_unreferenced(directory: Path, manifest: Dict[str, Any]) -> None:
+    """Delete shard files no longer named by the manifest (replaced tails, old builds)."""
+    if not directory.exists():
+        return
+    live = {shard['file'] for shard in manifest['shards']}
+    for path in directory.glob("shard-*"):
+        if path.name.split('.')[0] not in live:
+            path.unlink(missing_ok=True)
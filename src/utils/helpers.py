@@ -37,9 +37,35 @@ def format_duration(seconds: float) -> str:
         return f"{seconds}s"
 
 
+def format_bytes(size: float) -> str:
+    """Format a byte count as B, KB, MB or GB."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     """Truncate text to maximum length with suffix."""
     if len(text) <= max_length:
         return text
     
-    return text[:max_length - len(suffix)] + suffix
\ No newline at end of file
+    return text[:max_length - len(suffix)] + suffix
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as a video timestamp (m:ss or h:mm:ss)."""
+    total = int(seconds)
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def video_link(url: str, seconds: float) -> str:
+    """Deep link into a YouTube video at the given offset."""
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}t={int(seconds)}s"
@@ -0,0 +1,175 @@
+"""Lightweight stage timing: nested spans with wall/CPU time and memory deltas."""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+# Shared no-op returned by span() while profiling is off
+_NULL_SPAN = contextlib.nullcontext()
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (falls back to the peak where /proc is missing)."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Profiler:
+    """Aggregates spans by their nesting path, e.g. ``search/encode_queries``.
+
+    Spans may be opened from several threads; each thread keeps its own
+    nesting stack.
+    """
+
+    def __init__(self, cprofile_path: Optional[str] = None):
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._order: List[str] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self.cprofile_path = cprofile_path
+        self._cprofile = None
+        if cprofile_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        path = f"{stack[-1]}/{name}" if stack else name
+        stack.append(path)
+        with self._lock:
+            entry = self.stats.get(path)
+            if entry is None:
+                entry = self.stats[path] = {'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'mem_delta': 0}
+                self._order.append(path)
+
+        rss = _rss_bytes()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            rss = _rss_bytes() - rss
+            stack.pop()
+            with self._lock:
+                entry['count'] += 1
+                entry['wall_s'] += wall
+                entry['cpu_s'] += cpu
+                entry['mem_delta'] += rss
+
+    def stop(self) -> None:
+        """Stop cProfile collection and write the pstats file, if requested."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Per-span totals, in the order spans were first entered.
+
+        CPU time is process-wide, so spans running alongside other threads
+        include their CPU use too.
+        """
+        peak = None
+        if resource is not None:
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            peak = maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+        with self._lock:
+            spans = [
+                {
+                    'name': path,
+                    'depth': path.count('/'),
+                    'count': int(s['count']),
+                    'wall_ms': round(s['wall_s'] * 1000, 3),
+                    'cpu_ms': round(s['cpu_s'] * 1000, 3),
+                    'mem_delta_mb': round(s['mem_delta'] / (1024 * 1024), 3)
+                }
+                for path, s in ((p, self.stats[p]) for p in self._order)
+            ]
+        return {
+            'total_wall_ms': round((time.perf_counter() - self._start) * 1000, 3),
+            'total_cpu_ms': round((time.process_time() - self._start_cpu) * 1000, 3),
+            'peak_rss_mb': peak,
+            'cprofile': self.cprofile_path,
+            'spans': spans
+        }
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable(cprofile_path: Optional[str] = None) -> Profiler:
+    """Start collecting spans (and optionally cProfile data) for this process."""
+    global _profiler
+    _profiler = Profiler(cprofile_path)
+    return _profiler
+
+
+def disable() -> Optional[Dict[str, Any]]:
+    """Stop collecting; returns the final report, or None if profiling was off."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    return profiler.report()
+
+
+def span(name: str) -> contextlib.AbstractContextManager:
+    """Time a block as a named stage; a shared no-op while profiling is off."""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _profiler.span(name)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator form of span(); costs one global check per call while off."""
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _profiler is None:
+                return fn(*args, **kwargs)
+            with _profiler.span(name):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def write_report(report: Dict[str, Any], path: Optional[str] = None) -> None:
+    """Write a report as JSON to ``path``, or to stderr so results on stdout stay clean."""
+    payload = json.dumps(report, indent=2)
+    if path:
+        Path(path).write_text(payload + "\n")
+    else:
+        print(payload, file=sys.stderr)
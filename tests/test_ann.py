@@ -0,0 +1,84 @@
+"""Tests for the approximate IVF index."""
+
+import numpy as np
+from src.core.ann import IVFIndex, recall_at_k
+from src.core.cache import EmbeddingCache
+from src.core.corpus import CorpusIndex, ANN_DIR
+
+
+def clustered(n, dim=32, clusters=20, seed=0):
+    """Synthetic embeddings drawn around a few random centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    return (centres[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+class TestIVFIndex:
+    """Test cases for IVFIndex class."""
+
+    def test_recall_against_exact(self):
+        """Test that recall@10 is high and grows with nprobe."""
+        embeddings = clustered(4000)
+        queries = clustered(50, seed=1)
+
+        index = IVFIndex.train(embeddings, nlist=32)
+        index.set_assignments(index.assign(embeddings))
+
+        low = recall_at_k(index, embeddings, queries, k=10, nprobe=1)
+        high = recall_at_k(index, embeddings, queries, k=10, nprobe=8)
+
+        assert high >= low
+        assert high >= 0.9
+        assert recall_at_k(index, embeddings, queries, k=10, nprobe=32) == 1.0
+
+    def test_corpus_ann_is_persisted_and_incremental(self, tmp_path):
+        """Test that centroids persist and new entries only get assigned."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        chunks = [{'content': "x", 'speaker': 'Speaker', 'original': "x"}] * 500
+        cache.save_cache("alpha", clustered(500, seed=2), chunks)
+
+        corpus = CorpusIndex(cache)
+        corpus.build()
+        corpus.build_ann(nlist=8)
+        centroids = np.load(tmp_path / ANN_DIR / "centroids.npy")
+
+        cache.save_cache("beta", clustered(500, seed=3), chunks)
+        corpus = CorpusIndex(cache)
+        corpus.build()
+        corpus.build_ann(nlist=8)
+
+        assert np.array_equal(centroids, corpus.ann.centroids)
+        assert sorted(p.name for p in (tmp_path / ANN_DIR / "assignments").iterdir()) == [
+            "alpha.npy", "beta.npy"
+        ]
+        assert corpus.ann.list_offsets[-1] == 1000
+
+        rows, scores = corpus.ann.search(corpus.embeddings[700], corpus.embeddings, k=1, nprobe=8)
+        assert rows[0] == 700
+        assert np.isclose(scores[0], 1.0)
+
+
+def test_retrained_index_does_not_serve_cached_results(tmp_path):
+    """Test that results cached against old centroids are not reused after retraining."""
+    from src.core.searcher import SemanticSearcher
+    from tests.test_searcher import StubEncoder, TRANSCRIPT
+
+    searcher = SemanticSearcher(
+        cache_dir=str(tmp_path / "cache"), model=StubEncoder(), query_cache_size=100
+    )
+    for i in range(3):
+        path = tmp_path / f"talk{i}.txt"
+        path.write_text(TRANSCRIPT.replace("Paragraph", f"Talk{i} paragraph"))
+        searcher.load_transcript(str(path))
+    stored = []
+    put_results = searcher.query_cache.put_results
+    searcher.query_cache.put_results = lambda *args: stored.append(args[0]) or put_results(*args)
+
+    searcher.load_corpus(ann=True, nlist=4)
+    searcher.search_corpus("topic1", 3)
+    searcher.search_corpus("topic1", 3)
+    searcher.load_corpus(ann=True, nlist=6)
+    searcher.search_corpus("topic1", 3)
+
+    assert len(stored) == 2
+    assert stored[0] != stored[1]
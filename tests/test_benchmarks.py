@@ -0,0 +1,41 @@
+"""Tests for the benchmark harness."""
+
+import numpy as np
+
+from benchmarks.run import HashEncoder, compare, parse_sizes, run_benchmarks, synthetic_transcript
+from src.core.processor import TextProcessor
+
+
+class TestHarness:
+    """Test cases for the benchmark harness."""
+
+    def test_synthetic_transcript_size(self):
+        """Test that the generated transcript chunks into the requested count."""
+        chunks = TextProcessor.chunk_by_tokens(synthetic_transcript(300))
+        assert len(chunks) == 300
+
+    def test_stub_encoder_is_deterministic(self):
+        """Test that the stub encoder gives the same vectors across instances."""
+        texts = ["alpha beta", "gamma"]
+        assert np.array_equal(HashEncoder(16).encode(texts), HashEncoder(16).encode(texts))
+
+    def test_report_shape_and_compare(self):
+        """Test that every stage is reported and slowdowns are flagged."""
+        report = run_benchmarks([200], n_queries=3, dim=16, repeat=2)
+
+        stages = report['results'][0]['stages']
+        assert {'chunk_by_tokens', 'encode', 'cache_load', 'search_dense', 'search_lexical'} <= set(stages)
+        assert stages['encode']['items'] == stages['chunk_by_tokens']['items']
+        assert 'peak_rss_mb' in report and 'peak_rss_mb' not in stages['encode']
+        assert all(s['p50_ms'] >= 0 for s in stages.values())
+        assert compare(report, report) == []
+
+        faster = {'results': [{'size': 200, 'stages': {
+            'encode': dict(stages['encode'], p50_ms=stages['encode']['p50_ms'] / 10)
+        }}]}
+        assert [r['stage'] for r in compare(report, faster)] == ['encode']
+
+
+def test_parse_sizes():
+    """Test that k/M suffixes are expanded."""
+    assert parse_sizes("1k, 10K,1M,500") == [1_000, 10_000, 1_000_000, 500]
@@ -0,0 +1,256 @@
+"""Tests for embedding cache storage."""
+
+import numpy as np
+import pytest
+from src.core.cache import HASHES_FILE, EmbeddingCache, content_hash
+
+
+CHUNKS = [{'id': 0, 'content': "hello", 'speaker': 'Speaker', 'original': "hello"}]
+
+
+def fields(chunks):
+    return [(c['content'], c['speaker'], c['original'], c.get('start')) for c in chunks]
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache class."""
+
+    @pytest.mark.parametrize("dtype,tolerance", [
+        ("float32", 0.0),
+        ("float16", 1e-3),
+        ("int8", 1e-2),
+    ])
+    def test_round_trip(self, tmp_path, dtype, tolerance):
+        """Test that each storage dtype reloads close to the original."""
+        rng = np.random.default_rng(0)
+        embeddings = rng.uniform(-1, 1, size=(20, 8)).astype(np.float32)
+
+        cache = EmbeddingCache(str(tmp_path), "test-model", dtype)
+        cache.save_cache("video", embeddings, CHUNKS)
+        loaded, chunks = cache.load_cache("video")
+
+        assert loaded.shape == embeddings.shape
+        assert loaded.dtype == np.float32  # converted once here, never per search
+        assert np.allclose(loaded, embeddings, atol=tolerance)
+        assert fields(chunks) == fields(CHUNKS)
+
+        meta = cache.read_meta("video")
+        assert meta['model'] == "test-model"
+        assert meta['dtype'] == dtype
+        assert (meta['rows'], meta['dim']) == (20, 8)
+
+    def test_load_is_memory_mapped(self, tmp_path):
+        """Test that float entries are opened without reading them into RAM."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        cache.save_cache("video", np.ones((4, 3), dtype=np.float32), CHUNKS)
+
+        loaded, _ = cache.load_cache("video")
+
+        assert isinstance(loaded, np.memmap)
+
+    def test_model_mismatch_invalidates(self, tmp_path):
+        """Test that entries built by another model are not reused."""
+        EmbeddingCache(str(tmp_path), "model-a").save_cache(
+            "video", np.ones((1, 3), dtype=np.float32), CHUNKS
+        )
+
+        assert EmbeddingCache(str(tmp_path), "model-b").load_cache("video") is None
+
+    def test_cache_key_tracks_content_and_params(self, tmp_path):
+        """Test that keys depend on content and chunking, not on paths."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        params = {'chunker': 1, 'max_sentences': 6}
+
+        key = cache.cache_key("talk", "some text", params)
+
+        assert key == cache.cache_key("talk", "some text", dict(params))
+        assert key != cache.cache_key("talk", "other text", params)
+        assert key != cache.cache_key("talk", "some text", {**params, 'max_sentences': 4})
+
+    def test_lookup_chunk_embeddings(self, tmp_path):
+        """Test that chunk embeddings are found by text hash across entries."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        hashes = [content_hash("one"), content_hash("two")]
+        embeddings = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+        cache.save_cache("video", embeddings, CHUNKS * 2, chunk_hashes=hashes)
+
+        found = cache.lookup_chunk_embeddings([content_hash("two"), content_hash("three")])
+
+        assert list(found) == [content_hash("two")]
+        assert np.allclose(found[content_hash("two")], [0.0, 1.0])
+
+    def test_lookup_uses_shared_index(self, tmp_path):
+        """Test that lookups read the shared chunk index, not every entry's hash file."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        hashes = [content_hash("one"), content_hash("two")]
+        embeddings = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+        cache.save_cache("video", embeddings, CHUNKS * 2, chunk_hashes=hashes)
+        (tmp_path / "video" / HASHES_FILE).unlink()
+
+        found = cache.lookup_chunk_embeddings(hashes)
+        assert np.allclose(found[content_hash("one")], [1.0, 0.0])
+
+        cache.remove_entry("video")
+        assert cache.lookup_chunk_embeddings(hashes) == {}
+
+    def test_lookup_reuses_only_same_dtype(self, tmp_path):
+        """Test that vectors quantized to another dtype are not reused."""
+        hashes = [content_hash("one"), content_hash("two")]
+        embeddings = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+        EmbeddingCache(str(tmp_path), "test-model", "int8").save_cache(
+            "video", embeddings, CHUNKS * 2, chunk_hashes=hashes
+        )
+
+        assert EmbeddingCache(str(tmp_path), "test-model").lookup_chunk_embeddings(hashes) == {}
+        assert len(EmbeddingCache(str(tmp_path), "test-model", "int8").lookup_chunk_embeddings(hashes)) == 2
+
+    def test_cache_paths_create_no_entry(self, tmp_path):
+        """Test that asking for an entry's paths leaves no incomplete entry behind."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+
+        embeddings_path, _ = cache.get_cache_paths("video")
+
+        assert not embeddings_path.parent.exists()
+        assert cache.entry_dirs() == []
+
+    def test_save_removes_superseded_entry(self, tmp_path):
+        """Test that a new version of a source file replaces the old entry."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        embeddings = np.ones((1, 2), dtype=np.float32)
+        cache.save_cache("talk-old", embeddings, CHUNKS, source="/videos/talk.txt")
+        cache.save_cache("talk-new", embeddings, CHUNKS, source="/videos/talk.txt")
+
+        assert cache.list_entries() == ["talk-new"]
+
+
+class TestCacheBudget:
+    """Test cases for access tracking, eviction and verification."""
+
+    def test_hits_and_misses_are_counted(self, tmp_path):
+        """Test that loads record hits and misses per entry."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        cache.save_cache("video", np.ones((2, 3), dtype=np.float32), CHUNKS)
+
+        cache.load_cache("video")
+        cache.load_cache("video")
+        cache.load_cache("absent")
+        stats = cache.stats()
+
+        assert (stats['hits'], stats['misses']) == (2, 1)
+        assert [entry['name'] for entry in stats['entries']] == ["video"]
+        assert not (tmp_path / "absent").exists()
+
+    def test_save_evicts_least_recently_used(self, tmp_path):
+        """Test that saving over budget drops the entries used longest ago."""
+        embeddings = np.ones((256, 16), dtype=np.float32)
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        for name in ("a", "b", "c"):
+            cache.save_cache(name, embeddings, CHUNKS)
+        cache.load_cache("a")
+        budget = cache.stats()['total_bytes'] - cache.usage()[0]['bytes'] // 2
+
+        cache.max_bytes = budget
+        cache.save_cache("d", embeddings, CHUNKS)
+
+        assert cache.list_entries() == ["a", "d"]
+        assert cache.stats()['total_bytes'] <= budget
+
+    def test_verify_detects_truncation(self, tmp_path):
+        """Test that a truncated matrix is reported from its header alone."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        cache.save_cache("video", np.ones((50, 8), dtype=np.float32), CHUNKS * 50)
+        assert cache.verify_entry("video") == []
+
+        with open(tmp_path / "video" / "embeddings.npy", 'r+b') as f:
+            f.truncate(256)
+
+        assert cache.verify_entry("video") == ["embeddings.npy is truncated"]
+
+
+class TestConcurrentWrites:
+    """Test cases for atomic publishing and build locks."""
+
+    def test_failed_save_leaves_no_entry(self, tmp_path, monkeypatch):
+        """Test that a save failing mid-write publishes nothing and cleans up."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("src.core.cache.as_chunk_table", fail)
+        cache.save_cache("video", np.ones((2, 3), dtype=np.float32), CHUNKS)
+
+        assert cache.list_entries() == []
+        assert not list(tmp_path.glob("_tmp-*"))
+
+    def test_save_replaces_outdated_entry(self, tmp_path):
+        """Test that an entry in an older layout is swapped for the new one."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        (tmp_path / "video").mkdir()
+        (tmp_path / "video" / "meta.json").write_text('{"model": "test-model"}')
+        assert cache.load_cache("video") is None
+
+        cache.save_cache("video", np.ones((2, 3), dtype=np.float32), CHUNKS)
+
+        assert fields(cache.load_cache("video")[1]) == fields(CHUNKS)
+        assert not list(tmp_path.glob("_tmp-*"))
+
+    def test_concurrent_builds_share_one_result(self, tmp_path):
+        """Test that workers loading the same transcript embed it only once."""
+        import threading
+        import time
+        from src.core.searcher import SemanticSearcher
+        from tests.test_searcher import StubEncoder, TRANSCRIPT
+
+        class SlowEncoder(StubEncoder):
+            def encode(self, texts, **kwargs):
+                time.sleep(0.2)
+                return super().encode(texts, **kwargs)
+
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        encoder = SlowEncoder()
+        searchers = [
+            SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=encoder) for _ in range(3)
+        ]
+        threads = [threading.Thread(target=s.load_transcript, args=(str(path),)) for s in searchers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(encoder.calls) == 1
+        assert all(len(s.chunks) == len(searchers[0].chunks) for s in searchers)
+
+
+class TestChunkTableEntries:
+    """Test cases for the memory-mapped chunk table of an entry."""
+
+    def test_range_reads(self, tmp_path):
+        """Test that any window of chunks reads back exactly, clamped to the entry."""
+        chunks = [
+            {'id': i, 'content': f"chunk {i} ünïcode", 'speaker': 'Speaker',
+             'original': f"**Speaker:** chunk {i} ünïcode", 'start': i * 1.5}
+            for i in range(100)
+        ]
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        cache.save_cache("video", np.ones((100, 2), dtype=np.float32), chunks)
+
+        _, loaded = cache.load_cache("video")
+        assert len(loaded) == 100
+        assert fields(loaded[40:43]) == fields(chunks[40:43])
+        assert fields(cache.read_chunks("video", 98, 120)) == fields(chunks[98:])
+        assert [c['id'] for c in cache.read_chunks("video", 98, 120)] == [98, 99]
+        assert cache.read_chunks("absent", 0, 1) is None
+        assert cache.verify_entry("video") == []
+
+    def test_verify_detects_truncated_text(self, tmp_path):
+        """Test that a short text buffer is reported without decoding chunks."""
+        cache = EmbeddingCache(str(tmp_path), "test-model")
+        cache.save_cache("video", np.ones((50, 2), dtype=np.float32), CHUNKS * 50)
+
+        with open(tmp_path / "video" / "chunks.bin", 'r+b') as f:
+            f.truncate(10)
+
+        assert cache.verify_entry("video") == ["chunks.bin size does not match header"]
+        assert cache.load_cache("video") is None
@@ -0,0 +1,48 @@
+"""Tests for the columnar chunk table."""
+
+import pytest
+
+from src.core.chunk_table import ChunkTable
+from src.core.processor import TextProcessor
+from tests.test_processor import CAPTIONS
+
+
+class TestChunkTable:
+    """Test cases for ChunkTable and its row views."""
+
+    def test_views_match_chunk_dicts(self):
+        """Test that rows read back every field a chunk dict would hold."""
+        chunks = [
+            {'content': "Plain paragraph with no speaker at all.", 'speaker': 'Speaker',
+             'original': "Plain paragraph with no speaker at all.", 'start': None, 'end': None},
+            {'content': "Thanks for having me on the show.", 'speaker': 'Jane Doe',
+             'original': "**Jane Doe:** Thanks for having me on the show.", 'start': 4.0, 'end': 9.5},
+        ]
+
+        table = ChunkTable.from_chunks(chunks)
+
+        assert len(table) == 2
+        for i, chunk in enumerate(chunks):
+            view = table[i]
+            assert (view['id'], view['start_index']) == (i, i)
+            assert {key: view[key] for key in chunk} == chunk
+        assert table[-1]['speaker'] == 'Jane Doe'
+        with pytest.raises(IndexError):
+            table[2]
+        with pytest.raises(TypeError):
+            table[0]['content'] = "edited"
+
+    def test_overlap_is_stored_once(self):
+        """Test that overlapping chunks share text while reading back in full."""
+        table = TextProcessor.chunk_by_tokens(CAPTIONS, max_tokens=60, overlap_tokens=10)
+        contents = table.contents()
+
+        assert [chunk['content'] for chunk in table] == contents
+        assert len(table.text) < sum(len(text.encode('utf-8')) for text in contents)
+        for chunk in table:
+            assert chunk['content'].endswith(chunk['original'])
+
+    def test_rejects_original_not_drawn_from_content(self):
+        """Test that a chunk whose original cannot be rendered from its content is refused."""
+        with pytest.raises(ValueError):
+            ChunkTable.from_chunks([{'content': "one", 'speaker': 'Speaker', 'original': "two"}])
@@ -0,0 +1,122 @@
+"""Tests for corpus-wide indexing."""
+
+import numpy as np
+import pytest
+from src.core.cache import EmbeddingCache
+from src.core.corpus import CorpusIndex
+
+
+def _chunks(n):
+    return [
+        {'id': i, 'content': f"chunk {i}", 'speaker': 'Speaker', 'original': f"chunk {i}"}
+        for i in range(n)
+    ]
+
+
+class TestCorpusIndex:
+    """Test cases for CorpusIndex class."""
+
+    def test_build_stacks_all_entries(self, tmp_path):
+        """Test that every cache entry lands in one matrix with a row map."""
+        cache = EmbeddingCache(str(tmp_path))
+        cache.save_cache("alpha", np.ones((3, 4), dtype=np.float32), _chunks(3))
+        cache.save_cache("beta", np.zeros((2, 4), dtype=np.float32), _chunks(2))
+
+        corpus = CorpusIndex(cache)
+        corpus.build()
+
+        assert len(corpus) == 5
+        assert corpus.embeddings.flags['C_CONTIGUOUS']
+        assert corpus.transcript_names == ["alpha", "beta"]
+
+        name, chunk_id, chunk = corpus.locate(4)
+        assert name == "beta"
+        assert chunk_id == 1
+        assert chunk['content'] == "chunk 1"
+
+    def test_build_empty_cache(self, tmp_path):
+        """Test that an empty cache directory is reported."""
+        corpus = CorpusIndex(EmbeddingCache(str(tmp_path)))
+
+        with pytest.raises(ValueError):
+            corpus.build()
+
+
+class TestShardedCorpus:
+    """Test cases for the sharded, memory-mapped corpus layout."""
+
+    def _cache(self, tmp_path, names, rows=50, dim=8):
+        cache = EmbeddingCache(str(tmp_path))
+        for seed, name in enumerate(names):
+            vectors = np.random.default_rng(seed).normal(size=(rows, dim)).astype(np.float32)
+            cache.save_cache(name, vectors, _chunks(rows))
+        return cache
+
+    def test_sharded_search_matches_stacked(self, tmp_path):
+        """Test that merged per-shard top-k equals top-k over one stacked matrix."""
+        cache = self._cache(tmp_path, ["alpha", "beta", "gamma"])
+        stacked, sharded = CorpusIndex(cache), CorpusIndex(cache)
+        stacked.build()
+        sharded.build(shard_rows=32, shard_workers=4)
+        queries = np.random.default_rng(9).normal(size=(5, 8)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+        assert sharded.embeddings is None
+        assert len(sharded.shards.manifest['shards']) == 5
+        for (rows, scores), (want_rows, want_scores) in zip(
+            sharded.search_dense(queries, 7), stacked.search_dense(queries, 7)
+        ):
+            assert list(rows) == list(want_rows)
+            assert np.allclose(scores, want_scores, atol=1e-5)
+        assert sharded.locate(int(rows[0]))[:2] == stacked.locate(int(want_rows[0]))[:2]
+
+    def test_new_entries_only_touch_the_last_shard(self, tmp_path):
+        """Test that adding a transcript appends rows and leaves full shards alone."""
+        cache = self._cache(tmp_path, ["alpha", "beta"])
+        first = CorpusIndex(cache)
+        first.build(shard_rows=32)
+        before = [s['file'] for s in first.shards.manifest['shards']]
+
+        cache.save_cache("gamma", np.ones((50, 8), dtype=np.float32), _chunks(50))
+        second = CorpusIndex(cache)
+        second.build(shard_rows=32)
+        after = [s['file'] for s in second.shards.manifest['shards']]
+
+        assert after[:3] == before[:3] and after[3] != before[3]
+        assert [s['rows'] for s in second.shards.manifest['shards']] == [32, 32, 32, 32, 22]
+        assert len(second) == 150
+
+    def test_removed_entries_are_masked(self, tmp_path):
+        """Test that rows of an entry gone from the cache are never returned."""
+        cache = self._cache(tmp_path, ["alpha", "beta", "gamma", "delta"])
+        CorpusIndex(cache).build(shard_rows=32)
+        cache.remove_entry("beta")
+
+        corpus = CorpusIndex(cache)
+        corpus.build(shard_rows=32)
+        query = np.asarray(cache.load_cache("alpha")[0][:1])  # any vector
+        rows, _ = corpus.search_dense(query / np.linalg.norm(query), 150)[0]
+
+        assert corpus.transcript_names == ["alpha", "delta", "gamma"]
+        assert len(rows) == 150 == len(corpus)
+        assert corpus.shards.dead_rows() == 50
+
+    def test_rebuilt_entry_is_searchable_again(self, tmp_path):
+        """Test that a transcript evicted and rebuilt under the same key rejoins sharded search."""
+        # Enough entries that one dead one stays below the compaction threshold
+        cache = self._cache(tmp_path, ["alpha", "beta", "gamma", "delta", "epsilon"])
+        CorpusIndex(cache).build(shard_rows=32)
+        vectors = np.asarray(cache.load_cache("beta")[0])
+        cache.remove_entry("beta")
+        CorpusIndex(cache).build(shard_rows=32)
+
+        cache.save_cache("beta", vectors, _chunks(50))
+        corpus = CorpusIndex(cache)
+        corpus.build(shard_rows=32)
+        query = vectors[:1] / np.linalg.norm(vectors[:1])
+        rows, _ = corpus.search_dense(query, 1)[0]
+
+        assert corpus.transcript_names == ["alpha", "beta", "delta", "epsilon", "gamma"]
+        assert corpus.locate(int(rows[0]))[:2] == ("beta", 0)
+        assert corpus.shards.dead_rows() == 0
+        assert len(corpus.shards.entries) == 5  # revived, not appended twice
@@ -0,0 +1,48 @@
+"""Tests for the batched embedding engine."""
+
+import numpy as np
+
+from src.core.embedding import EmbeddingEngine
+from tests.test_searcher import StubEncoder
+
+
+TEXTS = [" ".join(f"w{j}" for j in range(n)) for n in (9, 1, 5, 12, 3, 7, 2)]
+
+
+class TestEmbeddingEngine:
+    """Test cases for EmbeddingEngine class."""
+
+    def test_rows_follow_input_order(self):
+        """Test that length-sorted batching returns rows in input order."""
+        model = StubEncoder()
+        engine = EmbeddingEngine(lambda: model, batch_size=3)
+
+        result = engine.encode(TEXTS)
+
+        assert result.dtype == np.float32
+        assert np.array_equal(result, StubEncoder().encode(TEXTS))
+
+    def test_batches_are_length_sorted(self):
+        """Test that each batch holds texts of similar length, shortest first."""
+        model = StubEncoder()
+        engine = EmbeddingEngine(lambda: model, batch_size=3)
+
+        engine.encode(TEXTS)
+
+        lengths = [[len(t.split()) for t in call] for call in model.calls]
+        assert lengths == [[1, 2, 3], [5, 7, 9], [12]]
+        assert engine.last_stats['chunks'] == len(TEXTS)
+        assert "chunks/sec" in engine.report()
+
+    def test_worker_processes_match_in_process(self):
+        """Test that encoding across worker processes gives the same vectors."""
+        engine = EmbeddingEngine(
+            lambda: None, batch_size=2, workers=2, worker_model=StubEncoder()
+        )
+        try:
+            result = engine.encode(TEXTS)
+        finally:
+            engine.close()
+
+        assert engine.last_stats['mode'] == "2 workers"
+        assert np.array_equal(result, StubEncoder().encode(TEXTS))
@@ -0,0 +1,128 @@
+"""Tests for the encoder backends."""
+
+import numpy as np
+import pytest
+
+from src.core.encoders import EncoderSpec, mean_pool
+from src.core.searcher import SemanticSearcher
+from tests.test_searcher import StubEncoder, TRANSCRIPT
+
+
+CORPUS = [
+    "The telescope captured images of a distant spiral galaxy.",
+    "Stock markets fell sharply after the interest rate announcement.",
+    "A good sourdough needs a lively starter and a long fermentation.",
+    "The striker scored twice in the second half to win the final.",
+    "Neural networks learn representations from large amounts of data.",
+    "The senate passed the budget bill after a lengthy debate.",
+    "Regular exercise lowers blood pressure and improves sleep.",
+    "Volcanic eruptions can cool the global climate for several years.",
+    "The violinist performed a Bach partita without any sheet music.",
+    "Electric cars are becoming cheaper as battery prices drop.",
+    "The detective found a hidden letter behind the bookcase.",
+    "Honeybees communicate the location of flowers by dancing.",
+]
+
+QUERIES = [
+    "astronomy and space", "economy and finance", "baking bread", "football match",
+    "machine learning", "politics and government", "health and fitness",
+    "climate and geology", "classical music", "electric vehicles", "mystery novel",
+    "insects and pollination",
+]
+
+
+def rankings(model, k=5):
+    docs = np.asarray(model.encode(CORPUS), dtype=np.float32)
+    queries = np.asarray(model.encode(QUERIES), dtype=np.float32)
+    docs /= np.linalg.norm(docs, axis=1, keepdims=True)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ docs.T), axis=1)[:, :k]
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("sentence_transformers")
+    from src.core.encoders import export_onnx
+
+    try:
+        paths = export_onnx("all-MiniLM-L6-v2", str(tmp_path_factory.mktemp("onnx")))
+    except OSError as e:
+        pytest.skip(f"model not available offline: {e}")
+    return paths
+
+
+class TestEncoderSpec:
+    """Test cases for EncoderSpec class."""
+
+    def test_backends_get_separate_cache_ids(self):
+        """Test that each backend caches its vectors under its own identity."""
+        ids = {
+            EncoderSpec("m").cache_id,
+            EncoderSpec("m", "torch-int8").cache_id,
+            EncoderSpec("m", "onnx", "models/model.onnx").cache_id,
+            EncoderSpec("m", "onnx", "models/model.int8.onnx").cache_id,
+        }
+        assert len(ids) == 4
+        assert EncoderSpec("m").cache_id == "m"
+
+    def test_onnx_cache_id_follows_the_model_file(self, tmp_path):
+        """Test that re-exporting an ONNX model in place changes its cache identity."""
+        path = tmp_path / "model.onnx"
+        path.write_bytes(b"first export")
+        spec = EncoderSpec("m", "onnx", str(path))
+        before = spec.cache_id
+
+        assert spec.cache_id == before
+        path.write_bytes(b"second, larger export")
+        assert spec.cache_id != before
+
+    def test_invalid_configuration(self):
+        """Test that unknown backends and a missing ONNX path are rejected."""
+        with pytest.raises(ValueError):
+            EncoderSpec("m", "tensorrt")
+        with pytest.raises(ValueError):
+            EncoderSpec("m", "onnx")
+
+    def test_backend_switch_does_not_reuse_vectors(self, tmp_path):
+        """Test that a searcher on another backend re-encodes instead of hitting the cache."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder()).load_transcript(str(path))
+
+        quantized = SemanticSearcher(
+            cache_dir=str(tmp_path / "cache"), model=StubEncoder(), encoder_backend="torch-int8"
+        )
+        quantized.load_transcript(str(path))
+
+        assert quantized.model.calls
+
+
+def test_mean_pool_ignores_padding():
+    """Test that padded positions do not contribute to the sentence vector."""
+    tokens = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+
+    assert np.allclose(mean_pool(tokens, mask), [[2.0, 2.0]])
+
+
+class TestOnnxRankingAgreement:
+    """Ranking agreement of the ONNX backends with the PyTorch model."""
+
+    def test_fp32_export_matches_torch(self, exported):
+        """Test that the fp32 ONNX export ranks the fixture corpus like PyTorch."""
+        reference = rankings(EncoderSpec("all-MiniLM-L6-v2").load())
+        onnx = rankings(EncoderSpec("all-MiniLM-L6-v2", "onnx", str(exported[0])).load())
+
+        assert np.array_equal(reference[:, 0], onnx[:, 0])
+        overlap = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(reference, onnx)])
+        assert overlap >= 0.95
+
+    def test_int8_export_agrees_with_torch(self, exported):
+        """Test that the int8 model keeps the top results of the PyTorch model."""
+        reference = rankings(EncoderSpec("all-MiniLM-L6-v2").load())
+        int8 = rankings(EncoderSpec("all-MiniLM-L6-v2", "onnx", str(exported[1])).load())
+
+        assert np.mean(reference[:, 0] == int8[:, 0]) >= 0.9
+        overlap = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(reference, int8)])
+        assert overlap >= 0.8
@@ -0,0 +1,142 @@
+"""Tests for VTT parsing and cue timings."""
+
+from src.core.extractor import YouTubeExtractor, iter_vtt_cues, load_timings
+from src.core.processor import TextProcessor
+from src.core.searcher import SemanticSearcher
+from tests.test_searcher import StubEncoder
+
+
+VTT = """WEBVTT
+Kind: captions
+Language: en
+
+NOTE this block is ignored
+
+00:00:01.000 --> 00:00:04.500 align:start position:0%
+hello and <c.colorE5E5E5>welcome</c> to the show
+
+00:00:04.500 --> 00:00:08.000
+hello and welcome to the show
+
+01:02:03.250 --> 01:02:05.000
+<00:00:04.600>
+today we talk about {\\an8}compilers
+"""
+
+
+class TestVttParsing:
+    """Test cases for streaming VTT parsing."""
+
+    def test_iter_vtt_cues(self, tmp_path):
+        """Test that cue text is cleaned and carries its time range."""
+        vtt_file = tmp_path / "video.en.vtt"
+        vtt_file.write_text(VTT)
+
+        cues = list(iter_vtt_cues(vtt_file))
+
+        assert [c.text for c in cues] == [
+            "hello and welcome to the show",
+            "hello and welcome to the show",
+            "today we talk about compilers",
+        ]
+        assert (cues[0].start, cues[0].end) == (1.0, 4.5)
+        assert cues[2].start == 3723.25
+
+    def test_vtt_to_text_writes_timings(self, tmp_path):
+        """Test that each text line is mapped to its cue time."""
+        vtt_file = tmp_path / "video.en.vtt"
+        vtt_file.write_text(VTT)
+        extractor = YouTubeExtractor(str(tmp_path))
+
+        text_file = extractor._vtt_to_text(vtt_file, "https://youtube.com/watch?v=abc")
+        lines = text_file.read_text().split("\n")
+        video_url, line_times, merged = load_timings(text_file)
+
+        assert lines[0] == "**Transcript extracted from YouTube video**"
+        assert lines[2:] == ["hello and welcome to the show", "today we talk about compilers"]
+        assert video_url == "https://youtube.com/watch?v=abc"
+        assert line_times == {2: (1.0, 4.5), 3: (3723.25, 3725.0)}
+        assert merged
+
+
+ROLLING_VTT = """WEBVTT
+
+00:00:00.000 --> 00:00:02.000
+so today we are going to
+
+00:00:02.000 --> 00:00:02.010
+so today we are going to
+
+00:00:02.010 --> 00:00:04.000
+so today we are going to
+talk about compilers and
+
+00:00:04.000 --> 00:00:04.010
+talk about compilers and
+
+00:00:04.010 --> 00:00:06.000
+compilers and why they matter
+"""
+
+
+def test_vtt_to_text_merges_rolling_captions(tmp_path, capsys):
+    """Test that text repeated by rolling captions is written once and reported."""
+    vtt_file = tmp_path / "video.en.vtt"
+    vtt_file.write_text(ROLLING_VTT)
+
+    text_file = YouTubeExtractor(str(tmp_path))._vtt_to_text(vtt_file)
+    _, line_times, _ = load_timings(text_file)
+
+    assert text_file.read_text().split("\n")[2:] == [
+        "so today we are going to", "talk about compilers and", "why they matter"
+    ]
+    assert line_times == {2: (0.0, 2.0), 3: (2.01, 4.0), 4: (4.01, 6.0)}
+    assert "Removed 18 of 31 caption words" in capsys.readouterr().out
+
+
+def test_extracted_captions_are_merged_once(tmp_path):
+    """Test that loading an extracted transcript keeps every word the extractor kept."""
+    vtt_file = tmp_path / "video.en.vtt"
+    vtt_file.write_text(
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.000\nalpha bravo charlie delta\n\n"
+        "00:00:01.000 --> 00:00:02.000\ncharlie delta charlie delta echo foxtrot\n\n"
+        "00:00:02.000 --> 00:00:03.000\ngolf hotel india juliet kilo\n"
+    )
+    text_file = YouTubeExtractor(str(tmp_path))._vtt_to_text(vtt_file)
+    assert text_file.read_text().split("\n")[2:] == [
+        "alpha bravo charlie delta", "charlie delta echo foxtrot", "golf hotel india juliet kilo"
+    ]
+
+    searcher = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder())
+    searcher.load_transcript(str(text_file))
+
+    words = " ".join(chunk['original'] for chunk in searcher.chunks).split()
+    assert words == (
+        "alpha bravo charlie delta charlie delta echo foxtrot golf hotel india juliet kilo".split()
+    )
+
+
+def test_legacy_sidecar_is_merged_on_load(tmp_path):
+    """Test that transcripts extracted before the merge marker are merged when chunked."""
+    text_file = tmp_path / "old.txt"
+    text_file.write_text("Header\n\nso today we are going to\nso today we are going to talk")
+    (tmp_path / "old.timings.tsv").write_text("# url=\n2\t0.000\t1.000\n3\t1.000\t2.000\n")
+
+    searcher = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder())
+    searcher.load_transcript(str(text_file))
+
+    assert searcher.chunks.contents()[-1].split().count("today") == 1
+
+
+def test_chunks_carry_time_ranges():
+    """Test that token chunks keep the time range of their lines."""
+    content = (
+        "Header line that is long enough\n\n"
+        "First one. Second one. Third one.\n"
+        "Fourth one. Fifth one. Sixth one."
+    )
+    line_times = {2: (10.0, 12.0), 3: (12.0, 15.0)}
+
+    chunks = TextProcessor.chunk_by_tokens(content, line_times, max_sentences=3, overlap_tokens=0)
+    assert [(c['start'], c['end']) for c in chunks][-2:] == [(10.0, 12.0), (12.0, 15.0)]
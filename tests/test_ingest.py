@@ -0,0 +1,90 @@
+"""Tests for bulk ingestion."""
+
+import threading
+import time
+
+from src.core.ingest import IngestManifest, Ingestor, read_sources
+
+
+class FakeExtractor:
+    """Extractor double that records concurrency and fails on demand."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def list_videos(self, url):
+        return url.split(",")
+
+    def extract_subtitles(self, url, language="en", output_name=None):
+        video_id = url.rsplit("=", 1)[-1]
+        with self._lock:
+            self.calls.append(video_id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.01)
+            if self.failures.get(video_id, 0) > 0:
+                self.failures[video_id] -= 1
+                raise RuntimeError("network hiccup")
+            return f"{video_id}.vtt", f"{video_id}.txt"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestIngestor:
+    """Test cases for Ingestor class."""
+
+    def test_bounded_concurrency(self, tmp_path):
+        """Test that no more than the configured number of workers run at once."""
+        extractor = FakeExtractor()
+        ingestor = Ingestor(extractor, IngestManifest(tmp_path / "m.jsonl"), concurrency=3)
+
+        summary = ingestor.run([f"v{i}" for i in range(12)])
+
+        assert len(summary['completed']) == 12
+        assert extractor.peak <= 3
+
+    def test_retry_then_fail(self, tmp_path):
+        """Test that transient errors are retried and persistent ones reported."""
+        extractor = FakeExtractor(failures={"flaky": 1, "broken": 99})
+        ingestor = Ingestor(
+            extractor, IngestManifest(tmp_path / "m.jsonl"), retries=2, backoff=0.001
+        )
+
+        summary = ingestor.run(["flaky", "broken", "fine"])
+
+        assert sorted(summary['completed']) == ["fine", "flaky"]
+        assert [video_id for video_id, _ in summary['failed']] == ["broken"]
+        assert extractor.calls.count("broken") == 3
+
+    def test_resume_from_manifest(self, tmp_path):
+        """Test that completed videos are skipped on the next run."""
+        path = tmp_path / "m.jsonl"
+        Ingestor(FakeExtractor(), IngestManifest(path)).run(["a", "b"])
+
+        extractor = FakeExtractor()
+        summary = Ingestor(extractor, IngestManifest(path)).run(["a", "b", "c"])
+
+        assert summary['skipped'] == 2
+        assert extractor.calls == ["c"]
+
+    def test_resolve_deduplicates(self, tmp_path):
+        """Test that videos listed by several sources are ingested once."""
+        ingestor = Ingestor(FakeExtractor(), IngestManifest(tmp_path / "m.jsonl"))
+
+        assert ingestor.resolve(["a,b", "b,c"]) == ["a", "b", "c"]
+
+
+def test_read_sources(tmp_path):
+    """Test that URL files are expanded and comments skipped."""
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("# backfill\nhttps://youtu.be/one\n\nhttps://youtu.be/two\n")
+
+    assert read_sources([str(url_file), "https://youtu.be/three"]) == [
+        "https://youtu.be/one", "https://youtu.be/two", "https://youtu.be/three"
+    ]
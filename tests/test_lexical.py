@@ -0,0 +1,141 @@
+"""Tests for the BM25 index and hybrid search modes."""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.core.lexical import BM25Index, LEXICAL_FILE, reciprocal_rank_fusion, tokenize
+from src.core.searcher import SemanticSearcher
+from tests.test_searcher import StubEncoder, TRANSCRIPT
+
+
+DOCS = [
+    "the quick brown fox jumps over the lazy dog",
+    "a fox and another fox",
+    "model XJ9000 shipped in 2023",
+    "nothing relevant here at all",
+]
+
+
+def reference_bm25(docs, query, k1=1.2, b=0.75):
+    tokenized = [tokenize(d) for d in docs]
+    avg = sum(map(len, tokenized)) / len(tokenized)
+    scores = []
+    for tokens in tokenized:
+        counts = Counter(tokens)
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in t for t in tokenized)
+            if not counts[term]:
+                continue
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            tf = counts[term]
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / avg))
+        scores.append(score)
+    return np.array(scores)
+
+
+class TestBM25Index:
+    """Test cases for BM25Index class."""
+
+    def test_scores_match_reference(self):
+        """Test that postings-based scoring equals a direct BM25 computation."""
+        index = BM25Index.build(DOCS)
+
+        for query in ["fox", "lazy fox dog", "xj9000 2023", "absent"]:
+            assert index.scores(query) == pytest.approx(reference_bm25(DOCS, query), rel=1e-5)
+
+    def test_exact_names_and_numbers(self):
+        """Test that a rare identifier ranks its document first and misses are empty."""
+        index = BM25Index.build(DOCS)
+
+        rows, _ = index.search("XJ9000", 3)
+        assert rows.tolist() == [2]
+        assert len(index.search("zebra", 3)[0]) == 0
+
+    def test_save_load_round_trip(self, tmp_path):
+        """Test that a persisted index scores identically."""
+        index = BM25Index.build(DOCS)
+        index.save(tmp_path / LEXICAL_FILE)
+
+        loaded = BM25Index.load(tmp_path / LEXICAL_FILE)
+
+        assert np.array_equal(loaded.scores("quick fox"), index.scores("quick fox"))
+        assert BM25Index.load(tmp_path / "missing.npz") is None
+
+
+def test_reciprocal_rank_fusion():
+    """Test that documents ranked well in both lists come first."""
+    ids, scores = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], 3)
+
+    assert ids.tolist() == [1, 3, 2]
+    assert scores[0] > scores[1] > scores[2]
+
+
+class TestSearchModes:
+    """Test cases for lexical and hybrid modes of SemanticSearcher."""
+
+    def test_lexical_mode_never_loads_model(self, tmp_path):
+        """Test that lexical search on an uncached transcript needs no encoder."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        searcher = SemanticSearcher(cache_dir=str(tmp_path / "cache"))
+
+        searcher.load_transcript(str(path), embed=False)
+        results = searcher.search("topic4", 3, mode="lexical")
+
+        assert searcher._model is None
+        assert all("topic4" in r['full_content'] for r in results)
+
+    def test_estimated_chunks_do_not_share_the_tokenizer_key(self, tmp_path):
+        """Test that lexical-only chunks are keyed apart from tokenizer-cut chunks."""
+        class TokenizingEncoder(StubEncoder):
+            max_seq_length = 18
+
+            @staticmethod
+            def tokenizer(words, add_special_tokens=False):
+                return {'input_ids': [[0] * len(word) for word in words]}
+
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        searcher = SemanticSearcher(
+            cache_dir=str(tmp_path / "cache"), model=TokenizingEncoder(), query_cache_size=100
+        )
+        searcher.load_transcript(str(path), embed=False)
+        estimated = searcher.transcript_name
+        searcher.search("topic3 filler", 3, mode="lexical")
+
+        searcher.load_transcript(str(path))
+        results = searcher.search("topic3 filler", 3, mode="lexical")
+
+        assert searcher.transcript_name != estimated
+        assert not searcher.cache.is_cache_valid(estimated)
+        for result in results:
+            assert result['full_content'] == searcher.chunks[result['id']]['content']
+
+    def test_lexical_index_persisted_with_cache(self, tmp_path):
+        """Test that the BM25 index is saved next to cached embeddings and reused."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        searcher = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder())
+        searcher.load_transcript(str(path))
+        searcher.search("topic1", 3, mode="lexical")
+
+        assert (searcher.cache.cache_dir / searcher.transcript_name / LEXICAL_FILE).exists()
+
+    def test_hybrid_mode_fuses_rankings(self, tmp_path):
+        """Test that hybrid results come from the dense and lexical candidates."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        searcher = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder())
+        searcher.load_transcript(str(path))
+
+        hybrid = searcher.search("topic2 filler", 5, mode="hybrid")
+        lexical = searcher.search("topic2 filler", 5, mode="lexical")
+
+        assert len(hybrid) == 5
+        assert hybrid[0]['id'] in {r['id'] for r in lexical}
+        with pytest.raises(ValueError):
+            searcher.search("topic2", 5, mode="fuzzy")
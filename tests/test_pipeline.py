@@ -0,0 +1,100 @@
+"""Tests for the overlapped extract → embed pipeline."""
+
+import asyncio
+import threading
+import time
+
+from src.core.ingest import IngestManifest, Ingestor
+from src.core.pipeline import IngestPipeline
+
+
+class FakeAsyncExtractor:
+    """Async extractor double whose downloads take a fixed time."""
+
+    def __init__(self, delay=0.05, failures=()):
+        self.delay = delay
+        self.failures = set(failures)
+        self.finished = {}
+
+    async def extract_subtitles_async(self, url, language="en", output_name=None):
+        await asyncio.sleep(self.delay)
+        video_id = url.rsplit("=", 1)[-1]
+        if video_id in self.failures:
+            raise RuntimeError("no subtitles")
+        self.finished[video_id] = time.perf_counter()
+        return f"{video_id}.vtt", f"{video_id}.txt"
+
+
+class FakeSearcher:
+    """Searcher double with a slow model load and slow embedding."""
+
+    def __init__(self, load_delay=0.1, embed_delay=0.05):
+        self.load_delay = load_delay
+        self.embed_delay = embed_delay
+        self.loaded_at = None
+        self.embedded = []
+        self.threads = set()
+        self.chunks = []
+
+    @property
+    def model(self):
+        if self.loaded_at is None:
+            time.sleep(self.load_delay)
+            self.loaded_at = time.perf_counter()
+        return object()
+
+    def load_transcript(self, text_file):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.embed_delay)
+        self.embedded.append((text_file, time.perf_counter()))
+        self.chunks = [text_file]
+
+
+class TestIngestPipeline:
+    """Test cases for IngestPipeline class."""
+
+    def test_model_load_overlaps_extraction(self):
+        """Test that the model loads while the first download is in flight."""
+        extractor = FakeAsyncExtractor(delay=0.1)
+        searcher = FakeSearcher(load_delay=0.1, embed_delay=0.0)
+
+        start = time.perf_counter()
+        IngestPipeline(extractor, searcher).run([("https://x/watch?v=a", None)])
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.18  # sequential would be ~0.2s
+
+    def test_stages_overlap_and_order_is_kept(self):
+        """Test that later downloads finish before earlier embeds complete."""
+        extractor = FakeAsyncExtractor(delay=0.05)
+        searcher = FakeSearcher(load_delay=0.0, embed_delay=0.1)
+        jobs = [(f"https://x/watch?v=v{i}", None) for i in range(4)]
+
+        statuses = IngestPipeline(extractor, searcher, concurrency=1).run(jobs)
+
+        assert [s['text_file'] for s in statuses] == [f"v{i}.txt" for i in range(4)]
+        first_embed_done = searcher.embedded[0][1]
+        assert extractor.finished["v1"] < first_embed_done
+        assert len(searcher.threads) == 1  # single encode thread
+
+    def test_failures_are_reported_per_job(self):
+        """Test that one failed download does not stop the others."""
+        extractor = FakeAsyncExtractor(delay=0.0, failures={"bad"})
+        searcher = FakeSearcher(load_delay=0.0, embed_delay=0.0)
+        jobs = [(f"https://x/watch?v={v}", None) for v in ("ok1", "bad", "ok2")]
+
+        statuses = IngestPipeline(extractor, searcher).run(jobs)
+
+        assert 'error' in statuses[1]
+        assert [s.get('text_file') for s in statuses[::2]] == ["ok1.txt", "ok2.txt"]
+
+    def test_ingestor_records_only_embedded_videos(self, tmp_path):
+        """Test that embedded ingestion records successes in the manifest."""
+        manifest = IngestManifest(tmp_path / "m.jsonl")
+        ingestor = Ingestor(FakeAsyncExtractor(delay=0.0, failures={"b"}), manifest, retries=0)
+
+        summary = ingestor.run_embedded(["a", "b", "c"], FakeSearcher(0.0, 0.0))
+
+        assert summary['completed'] == ["a", "c"]
+        assert [video_id for video_id, _ in summary['failed']] == ["b"]
+        assert "a" in manifest and "b" not in manifest
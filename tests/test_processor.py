@@ -1,7 +1,7 @@
 """Tests for text processing functionality."""
 
 import pytest
-from src.core.processor import TextProcessor
+from src.core.processor import CaptionMerger, TextProcessor
 
 
 class TestTextProcessor:
@@ -80,4 +80,137 @@ It continues here.
         
         # Should split into multiple chunks
         assert len(result) >= 2
-        assert result[0]['speaker'] == 'Speaker'
\ No newline at end of file
+        assert result[0]['speaker'] == 'Speaker'
+
+CAPTIONS = "**Transcript extracted from YouTube video**\n\n" + "\n".join(
+    f"and then we talked about item{i} for a while without any punctuation" for i in range(200)
+)
+
+
+class TestTokenChunker:
+    """Test cases for TextProcessor.chunk_by_tokens."""
+    
+    def test_unpunctuated_captions_stay_under_budget(self):
+        """Test that caption text without blank lines or periods is split by tokens."""
+        chunks = TextProcessor.chunk_by_tokens(CAPTIONS, max_tokens=60, overlap_tokens=10)
+        
+        assert len(chunks) > 10
+        assert all(chunk['tokens'] <= 60 for chunk in chunks)
+        # New text of consecutive chunks covers the transcript exactly once
+        words = " ".join(chunk['original'] for chunk in chunks).split()
+        assert words == " ".join(CAPTIONS.split("\n")[2:]).split()
+    
+    def test_overlap_repeats_previous_tail(self):
+        """Test that each chunk starts with the end of the one before it."""
+        chunks = TextProcessor.chunk_by_tokens(CAPTIONS, max_tokens=60, overlap_tokens=10)
+        
+        for previous, chunk in zip(chunks, chunks[1:]):
+            overlap = chunk['content'][:len(chunk['content']) - len(chunk['original'])].strip()
+            assert overlap and previous['content'].endswith(overlap)
+    
+    def test_exact_token_counts_are_never_exceeded(self):
+        """Test that a tokenizer's counts bound every chunk, even for over-long words."""
+        content = "short words here " * 20 + "x" * 120 + " tail words"
+        char_tokens = lambda words: [len(w) for w in words]
+        
+        chunks = TextProcessor.chunk_by_tokens(content, max_tokens=50, token_lengths=char_tokens)
+        
+        assert all(sum(char_tokens(c['content'].split())) <= 50 for c in chunks)
+    
+    def test_generic_speaker_detection(self):
+        """Test that bold, plain-label and caption speaker markers start new turns."""
+        content = (
+            "**Host:** Welcome back to the show everyone, good to see you.\n"
+            "Jane Doe: Thanks for having me here today, it is a pleasure.\n"
+            ">> and this is a different voice chiming in from the audience\n"
+        )
+        
+        chunks = TextProcessor.chunk_by_tokens(content)
+        
+        assert [c['speaker'] for c in chunks] == ['Host', 'Jane Doe', 'Speaker']
+        assert chunks[1]['original'].startswith("**Jane Doe:** Thanks")
+    
+    def test_colon_prefixes_in_prose_are_not_turns(self):
+        """Test that headings and notes ending in a colon do not split plain prose."""
+        content = (
+            "The talk opens with some background on the project and its goals.\n"
+            "Note: the numbers quoted here come from the second benchmark run.\n"
+            "Chapter One: how the team got started with the compiler rewrite.\n"
+            "DHH: and this all-caps label is still a speaker turn on its own.\n"
+        )
+        
+        chunks = TextProcessor.chunk_by_tokens(content)
+        
+        assert [c['speaker'] for c in chunks] == ['Speaker', 'DHH']
+        assert "Note: the numbers" in chunks[0]['content']
+        assert "Chapter One: how" in chunks[0]['content']
+    
+    def test_recurring_plain_labels_are_turns(self):
+        """Test that a dialogue labeled with plain mixed-case names is split by speaker."""
+        content = (
+            "Jane Doe: Thanks for having me here today, it is a pleasure.\n"
+            "Host: Let us start with how you got into compilers at all.\n"
+            "Jane Doe: Mostly by accident, through a university course.\n"
+            "Host: And what kept you there after the course had ended?\n"
+        )
+        
+        chunks = TextProcessor.chunk_by_tokens(content)
+        
+        assert [c['speaker'] for c in chunks] == ['Jane Doe', 'Host', 'Jane Doe', 'Host']
+    
+    def test_chunks_carry_line_times(self):
+        """Test that chunk time ranges come from their first and last lines."""
+        line_times = {i + 2: (i * 3.0, i * 3.0 + 3.0) for i in range(200)}
+        
+        chunks = TextProcessor.chunk_by_tokens(CAPTIONS, line_times, max_tokens=60, overlap_tokens=0)
+        
+        assert chunks[0]['start'] == 0.0
+        assert all(c['start'] < c['end'] for c in chunks)
+        assert all(a['end'] <= b['start'] + 3.0 for a, b in zip(chunks, chunks[1:]))
+
+
+class TestCaptionDedupe:
+    """Test cases for rolling-caption merging and near-duplicate suppression."""
+    
+    def test_rolling_repeats_are_merged(self):
+        """Test that repeated lines and repeated line starts are dropped."""
+        merger = CaptionMerger()
+        lines = [
+            "so today we are going to",
+            "so today we are going to",
+            "we are going to talk about compilers",
+            "talk about compilers",
+            "and why they matter",
+            "yeah",
+            "yeah",
+        ]
+        
+        merged = [merger.merge(line) for line in lines]
+        
+        assert merged == ["so today we are going to", "", "talk about compilers", "",
+                          "and why they matter", "yeah", ""]
+        assert " ".join(m for m in merged if m).split() == (
+            "so today we are going to talk about compilers and why they matter yeah".split()
+        )
+        assert merger.words_removed == 14
+        assert "14 of 28" in merger.report()
+    
+    def test_single_repeated_word_is_kept(self):
+        """Test that a one-word overlap is not mistaken for a rolling repeat."""
+        merger = CaptionMerger()
+        
+        assert merger.merge("I think that") == "I think that"
+        assert merger.merge("that is right") == "that is right"
+    
+    def test_near_duplicate_chunks_are_suppressed(self):
+        """Test that a chunk whose shingles were already indexed is dropped and counted."""
+        paragraph = "The compiler lowers every expression into a small register machine first."
+        content = "\n\n".join([paragraph, "Something else entirely is discussed here today.", paragraph])
+        stats = {}
+        
+        kept = TextProcessor.chunk_by_tokens(content, near_duplicate=0.8, stats=stats)
+        
+        assert [c['content'] for c in kept] == [paragraph, "Something else entirely is discussed here today."]
+        assert stats['chunks_suppressed'] == 1
+        assert len(TextProcessor.chunk_by_tokens(content)) == 3
+
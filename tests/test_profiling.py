@@ -0,0 +1,67 @@
+"""Tests for stage timing instrumentation."""
+
+import pstats
+import time
+
+import pytest
+
+from src.core.searcher import SemanticSearcher
+from src.utils import profiling
+from tests.test_searcher import StubEncoder, TRANSCRIPT
+
+
+@pytest.fixture(autouse=True)
+def profiling_off():
+    yield
+    profiling.disable()
+
+
+class TestProfiler:
+    """Test cases for span instrumentation."""
+
+    def test_nested_spans_aggregate_by_path(self):
+        """Test that spans nest by path and repeated spans accumulate."""
+        @profiling.traced("inner")
+        def work():
+            time.sleep(0.001)
+
+        profiling.enable()
+        with profiling.span("outer"):
+            work()
+            work()
+        report = profiling.disable()
+
+        spans = {s['name']: s for s in report['spans']}
+        assert list(spans) == ["outer", "outer/inner"]
+        assert spans["outer/inner"]['count'] == 2
+        assert spans["outer"]['wall_ms'] >= spans["outer/inner"]['wall_ms'] > 0
+
+    def test_disabled_spans_are_free(self):
+        """Test that spans are a shared no-op when profiling is off."""
+        assert profiling.span("a") is profiling.span("b")
+        assert profiling.disable() is None
+
+        @profiling.traced("noop")
+        def noop():
+            return 1
+
+        start = time.perf_counter()
+        for _ in range(100_000):
+            noop()
+        assert time.perf_counter() - start < 0.5
+
+    def test_searcher_stages_are_reported(self, tmp_path):
+        """Test that a search run reports chunking, cache and scoring stages."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+
+        profiling.enable(str(tmp_path / "run.pstats"))
+        searcher = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder())
+        searcher.load_transcript(str(path))
+        searcher.search("topic1", 3)
+        report = profiling.disable()
+
+        names = {s['name'].rsplit('/', 1)[-1] for s in report['spans']}
+        assert {"processor.chunk_by_tokens", "cache.save", "searcher.encode_queries",
+                "searcher.score"} <= names
+        assert pstats.Stats(str(tmp_path / "run.pstats")).total_calls > 0
@@ -0,0 +1,192 @@
+"""Tests for the semantic search engine."""
+
+import zlib
+
+import numpy as np
+import pytest
+from src.core.searcher import SemanticSearcher
+
+
+class StubEncoder:
+    """Deterministic bag-of-words encoder standing in for SentenceTransformer."""
+
+    def __init__(self, dim=64):
+        self.dim = dim
+        self.calls = []
+
+    def encode(self, texts, show_progress_bar=False, **kwargs):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+        return vectors
+
+
+TRANSCRIPT = "**Transcript extracted from YouTube video**\n\n" + "\n\n".join(
+    f"Paragraph {i} is about topic{i % 5} and some filler words for length."
+    for i in range(30)
+)
+
+
+@pytest.fixture
+def searcher(tmp_path):
+    path = tmp_path / "talk.txt"
+    path.write_text(TRANSCRIPT)
+    searcher = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder())
+    searcher.load_transcript(str(path))
+    return searcher
+
+
+class TestSemanticSearcher:
+    """Test cases for SemanticSearcher class."""
+
+    def test_embeddings_are_normalized(self, searcher):
+        """Test that stored embeddings are unit length."""
+        norms = np.linalg.norm(searcher.embeddings, axis=1)
+        assert np.allclose(norms, 1.0, atol=1e-5)
+
+    def test_search_matches_exact_cosine(self, searcher):
+        """Test that top-k equals a full sort of cosine similarities."""
+        query = searcher.model.encode(["topic3 filler"])[0]
+        raw = np.asarray(searcher.embeddings)
+        cosine = raw @ query / (np.linalg.norm(raw, axis=1) * np.linalg.norm(query))
+        expected = np.sort(cosine)[::-1][:5]
+
+        results = searcher.search("topic3 filler", 5)
+
+        assert [r['similarity'] for r in results] == pytest.approx(expected, abs=1e-5)
+        assert all('topic3' in r['full_content'] for r in results)
+
+    def test_search_many_uses_one_encode_call(self, searcher):
+        """Test that batched queries are encoded together and match single search."""
+        queries = ["topic1", "topic2 words", "paragraph"]
+        searcher.model.calls.clear()
+
+        batched = searcher.search_many(queries, 4)
+
+        assert len(searcher.model.calls) == 1
+        for query, results in zip(queries, batched):
+            single = searcher.search(query, 4)
+            assert [r['id'] for r in results] == [r['id'] for r in single]
+
+    def test_edit_reencodes_only_changed_chunks(self, tmp_path, searcher):
+        """Test that editing one paragraph re-encodes just that chunk."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT.replace("Paragraph 7 is", "Paragraph seven is"))
+
+        edited = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=StubEncoder())
+        edited.load_transcript(str(path))
+
+        encoded = [text for call in edited.model.calls for text in call]
+        assert len(encoded) == 1
+        assert "Paragraph seven" in encoded[0]
+
+    def test_query_cache_skips_model(self, tmp_path):
+        """Test that repeated queries are served without encoding or scoring."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        searcher = SemanticSearcher(
+            cache_dir=str(tmp_path / "cache"), model=StubEncoder(), query_cache_size=100
+        )
+        searcher.load_transcript(str(path))
+
+        first = searcher.search(" topic2  words", 3)
+        searcher.model.calls.clear()
+        searcher.embeddings = np.zeros_like(searcher.embeddings)
+        second = searcher.search("topic2 words", 3)
+
+        assert searcher.model.calls == []
+        assert [r['id'] for r in second] == [r['id'] for r in first]
+
+    def test_query_cache_keeps_case(self, tmp_path):
+        """Test that queries differing only in case are not served each other's vectors."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        searcher = SemanticSearcher(
+            cache_dir=str(tmp_path / "cache"), model=StubEncoder(), query_cache_size=100
+        )
+        searcher.load_transcript(str(path))
+
+        searcher.search("US policy", 3)
+        searcher.model.calls.clear()
+        searcher.search("us policy", 3)
+
+        assert searcher.model.calls == [["us policy"]]
+
+    def test_query_cache_invalidated_by_new_embeddings(self, tmp_path):
+        """Test that cached results are not reused once the transcript changes."""
+        path = tmp_path / "talk.txt"
+        path.write_text(TRANSCRIPT)
+        searcher = SemanticSearcher(
+            cache_dir=str(tmp_path / "cache"), model=StubEncoder(), query_cache_size=100
+        )
+        searcher.load_transcript(str(path))
+        searcher.search("topic2", 3)
+
+        path.write_text(TRANSCRIPT + "\n\nA brand new paragraph about topic2 topic2 topic2.")
+        searcher.load_transcript(str(path))
+        searcher.model.calls.clear()
+        results = searcher.search("topic2", 3)
+
+        assert searcher.model.calls == []  # query vector still cached
+        assert "brand new" in results[0]['full_content']
+
+
+class TestExpandTranscript:
+    """Test cases for model-free context expansion."""
+
+    def test_matches_full_load(self, searcher, tmp_path):
+        """Test that reading a window from the store equals expanding the loaded chunks."""
+        fresh = SemanticSearcher(cache_dir=str(tmp_path / "cache"))
+
+        for result_id in (0, 5, len(searcher.chunks) - 1):
+            expected = searcher.get_expanded_context(result_id, 2)
+            assert fresh.expand_transcript(str(tmp_path / "talk.txt"), result_id, 2) == expected
+        assert fresh._model is None
+        assert not fresh.chunks
+        assert "not found" in fresh.expand_transcript(str(tmp_path / "talk.txt"), 10_000, 2)
+
+
+class TestBatchQueries:
+    """Test cases for query-file batch search."""
+
+    def test_batch_matches_search_many_with_one_encode(self, searcher):
+        """Test that every block is scored from a single up-front encode call."""
+        queries = [f"topic{i % 5} words" for i in range(7)]
+        expected = searcher.search_many(queries, 3)
+        searcher.model.calls.clear()
+
+        batched = list(searcher.search_batch(queries, 3, block=3))
+
+        assert len(searcher.model.calls) == 1
+        assert [index for index, _ in batched] == list(range(7))
+        for (_, results), single in zip(batched, expected):
+            assert [r['id'] for r in results] == [r['id'] for r in single]
+
+    def test_cli_streams_jsonl_to_stdout(self, searcher, tmp_path, monkeypatch, capsys):
+        """Test that search --queries writes only JSONL records to stdout."""
+        import argparse
+        import json
+        from src.cli import main
+
+        queries = tmp_path / "queries.txt"
+        queries.write_text("topic1\n\ntopic4 filler\n")
+        monkeypatch.setattr(main, "create_searcher", lambda: searcher)
+        args = argparse.Namespace(
+            queries=str(queries), output=None, transcript=str(tmp_path / "talk.txt"),
+            all=False, corpus=None, expand=None, results=2, mode="dense", ann=False, nprobe=None
+        )
+
+        main.search_command(args)
+
+        captured = capsys.readouterr()
+        records = [json.loads(line) for line in captured.out.splitlines()]
+        assert [r['query'] for r in records] == ["topic1", "topic4 filler"]
+        assert [r['query_index'] for r in records] == [0, 1]
+        top = records[1]['results'][0]
+        assert top['rank'] == 1
+        assert top['transcript_id'] == searcher.transcript_name
+        assert top['transcript'] == "talk"
+        assert "topic4" in searcher.chunks[top['chunk_id']]['content']
+        assert "✅" in captured.err
@@ -0,0 +1,183 @@
+"""Tests for the resident search service."""
+
+import threading
+
+import pytest
+
+from src.core.searcher import SemanticSearcher
+from src.core.service import SearchService
+from tests.test_searcher import StubEncoder, TRANSCRIPT
+
+
+@pytest.fixture
+def transcripts(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"talk{i}.txt"
+        path.write_text(TRANSCRIPT.replace("Paragraph", f"Talk{i} paragraph"))
+        paths.append(str(path))
+    return paths
+
+
+def make_service(tmp_path, **kwargs):
+    encoder = StubEncoder()
+    base = SemanticSearcher(cache_dir=str(tmp_path / "cache"), model=encoder)
+    return SearchService(base, **kwargs), encoder
+
+
+class TestMicroBatching:
+    """Test cases for coalescing concurrent searches."""
+
+    def test_concurrent_queries_share_one_encode(self, tmp_path, transcripts):
+        """Test that searches arriving together are encoded in one model call."""
+        service, encoder = make_service(tmp_path, batch_window_ms=200)
+        for path in transcripts:
+            service.transcript(path)
+        encoder.calls.clear()
+
+        requests = [
+            {'query': f"topic{i % 5} filler", 'transcript': transcripts[i % 3], 'num_results': 3}
+            for i in range(6)
+        ]
+        results = [None] * len(requests)
+
+        def run(i):
+            results[i] = service.search(requests[i])
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        service.close()
+
+        assert len(encoder.calls) == 1
+        assert sorted(encoder.calls[0]) == sorted({r['query'] for r in requests})
+        for request, batched in zip(requests, results):
+            direct = service.transcript(request['transcript']).search(request['query'], 3)
+            assert [r['id'] for r in batched] == [r['id'] for r in direct]
+
+    def test_errors_reach_the_caller(self, tmp_path, transcripts):
+        """Test that a failing search raises in its own request thread."""
+        service, _ = make_service(tmp_path, batch_window_ms=1)
+
+        with pytest.raises(ValueError):
+            service.search({'query': "x", 'transcript': transcripts[0], 'mode': "fuzzy"})
+        service.close()
+
+
+class TestResidentIndexes:
+    """Test cases for the memory-bounded set of resident searchers."""
+
+    def test_least_recently_used_unloaded_over_budget(self, tmp_path, transcripts):
+        """Test that only as many transcripts as fit the budget stay resident."""
+        service, _ = make_service(tmp_path, batch_window_ms=0)
+        service.transcript(transcripts[0])
+        one = service.resident_bytes()
+        service.memory_budget = int(one * 2.5)
+
+        service.transcript(transcripts[1])
+        service.transcript(transcripts[0])
+        service.transcript(transcripts[2])
+
+        assert service.stats()['resident'] == [
+            f"transcript:{transcripts[0]}", f"transcript:{transcripts[2]}"
+        ]
+
+    def test_cold_load_does_not_block_resident(self, tmp_path, transcripts):
+        """Test that a transcript being embedded holds up neither resident ones nor a second load."""
+        service, encoder = make_service(tmp_path, batch_window_ms=0)
+        service.transcript(transcripts[0])
+        release = threading.Event()
+        encode = encoder.encode
+
+        def slow_encode(texts, **kwargs):
+            if any("Talk1" in text for text in texts):
+                release.wait(5)
+            return encode(texts, **kwargs)
+
+        encoder.encode = slow_encode
+        encoder.calls.clear()
+        loads = [threading.Thread(target=service.transcript, args=(transcripts[1],)) for _ in range(2)]
+        for thread in loads:
+            thread.start()
+
+        resident = threading.Thread(target=service.transcript, args=(transcripts[0],))
+        resident.start()
+        resident.join(2)
+        assert not resident.is_alive()
+
+        release.set()
+        for thread in loads:
+            thread.join()
+        assert sum(any("Talk1" in text for text in call) for call in encoder.calls) == 1
+        assert f"transcript:{transcripts[1]}" in service.stats()['resident']
+
+
+class TestServerConnection:
+    """Test cases for finding and talking to a running server."""
+
+    @pytest.fixture
+    def server(self, tmp_path, monkeypatch):
+        from src.cli import main
+        from src.core.service import create_server
+
+        service, _ = make_service(tmp_path, batch_window_ms=0)
+        server = create_server(service, "127.0.0.1", 0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        # Point the CLI's configuration at this server and its settings
+        search = main.default_config.search
+        monkeypatch.setattr(search, 'use_server', True)
+        monkeypatch.setattr(search, 'server_port', server.server_address[1])
+        monkeypatch.setattr(search, 'cache_dir', str(tmp_path / "cache"))
+        yield server
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    def args(self):
+        import argparse
+        return argparse.Namespace(no_server=False)
+
+    def test_round_trip(self, server, transcripts, monkeypatch):
+        """Test that a matching server is used and answers like an in-process search."""
+        from src.cli import main
+
+        # Checking the server must not build (and open the caches of) a searcher
+        monkeypatch.setattr(main, 'SemanticSearcher', None)
+        client = main.connect_server(self.args())
+
+        assert client is not None
+        results = client.search("topic2 filler", transcripts[0], num_results=3)
+        direct = server.RequestHandlerClass.service.transcript(transcripts[0]).search("topic2 filler", 3)
+        assert [r['id'] for r in results] == [r['id'] for r in direct]
+        assert "topic2" in results[0]['full_content']
+
+    @pytest.mark.parametrize("field, value", [
+        ('cache_dir', "other-cache"),
+        ('embedding_dtype', "float16"),
+        ('chunk_tokens', 128),
+        ('ann_nlist', 16),
+    ])
+    def test_mismatched_server_is_skipped(self, server, tmp_path, monkeypatch, capsys, field, value):
+        """Test that a server with different cache, dtype, chunking or index settings is not used."""
+        from src.cli import main
+
+        if field == 'cache_dir':
+            value = str(tmp_path / value)
+        monkeypatch.setattr(main.default_config.search, field, value)
+
+        assert main.connect_server(self.args()) is None
+        assert "configured differently" in capsys.readouterr().out
+
+    def test_unreachable_server_falls_back(self, server, monkeypatch):
+        """Test that nothing listening on the port means in-process search."""
+        from src.cli import main
+
+        port = server.server_address[1]
+        server.shutdown()
+        server.server_close()
+        monkeypatch.setattr(main.default_config.search, 'server_port', port)
+
+        assert main.connect_server(self.args()) is None
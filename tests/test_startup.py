@@ -0,0 +1,97 @@
+"""Tests that CLI startup stays free of the heavy ML stack."""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ("torch", "sentence_transformers", "sklearn", "transformers")
+
+# Import-time budget for the CLI module, measured in a fresh interpreter
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def run_python(code: str, cwd: Path = PROJECT_ROOT) -> str:
+    """Run a snippet in a fresh interpreter with the project on sys.path."""
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=cwd,
+        env={"PYTHONPATH": str(PROJECT_ROOT)},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout
+
+
+class TestStartup:
+    """Test cases for lazy imports."""
+
+    def test_cli_import_is_light(self):
+        """Test that importing the CLI loads no ML modules and fits the budget."""
+        output = run_python(f"""
+            import sys, time
+            start = time.perf_counter()
+            import src.cli.main
+            elapsed = time.perf_counter() - start
+            loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+            print(elapsed, loaded)
+        """)
+
+        elapsed, loaded = output.split(" ", 1)
+        assert loaded.strip() == "[]"
+        assert float(elapsed) < IMPORT_BUDGET_SECONDS
+
+    def test_parser_skips_benchmark_harness(self):
+        """Test that building the CLI parser does not import the benchmark harness."""
+        output = run_python("""
+            import sys
+            import src.cli.main
+            sys.argv = ["yt-aprtr", "--help"]
+            try:
+                src.cli.main.main()
+            except SystemExit:
+                pass
+            print("benchmarks.run" in sys.modules)
+        """)
+
+        assert "bench" in output  # the subcommand is still registered
+        assert output.splitlines()[-1] == "False"
+
+    def test_cached_expand_skips_model(self, tmp_path):
+        """Test that expanding a cached transcript never loads the model."""
+        transcript = tmp_path / "talk.txt"
+        transcript.write_text(
+            "First paragraph about something long enough.\n\n"
+            "Second paragraph about something long enough.\n\n"
+            "Third paragraph about something long enough."
+        )
+
+        cache_dir = str(tmp_path / "cache")
+
+        # Build the cache with a stand-in encoder
+        run_python(f"""
+            import numpy as np
+            from src.core.searcher import SemanticSearcher
+
+            class Encoder:
+                def encode(self, texts, **kwargs):
+                    return np.ones((len(texts), 4), dtype=np.float32)
+
+            SemanticSearcher(cache_dir={cache_dir!r}, model=Encoder()).load_transcript({str(transcript)!r})
+        """, cwd=tmp_path)
+
+        output = run_python(f"""
+            import sys
+            from src.core.searcher import SemanticSearcher
+
+            searcher = SemanticSearcher(cache_dir={cache_dir!r})
+            searcher.load_transcript({str(transcript)!r})
+            print(searcher.get_expanded_context(1, 1).count("MAIN RESULT"))
+            print([m for m in {HEAVY_MODULES!r} if m in sys.modules])
+        """, cwd=tmp_path)
+
+        assert output.splitlines()[-2:] == ["1", "[]"]